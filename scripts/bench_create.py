@@ -0,0 +1,144 @@
+"""
+批量创建基准：在同一个 Work Unit 下连续创建 N 个子对象（默认 10k）
+模拟 Wwise：主线程串行处理请求，object.get 的耗时与返回对象数成正比（序列化开销），
+object.create / object.set 的耗时与创建数成正比。
+
+对比三种方式：
+  - legacy：每次创建前扫描父节点全部子对象 + create + 按 id 回查 path（旧实现）
+  - create：create_object 工具当前实现（依赖 onNameConflict，path 由父路径 + 返回名称拼出）
+  - plan：  apply_mutations / MutationPlan，按批量大小合并为少量 object.set
+
+legacy 的兄弟扫描随子对象数线性增长，整体为 O(N²)，10k 时耗时以分钟计，可用 --modes 跳过。
+
+用法：
+    python scripts/bench_create.py
+    python scripts/bench_create.py --modes create,plan
+    python scripts/bench_create.py --children 10000 --per-object-us 20
+"""
+
+import argparse
+import asyncio
+import itertools
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wwise_mcp.core import adapter as adapter_module  # noqa: E402
+from wwise_mcp.core.adapter import WwiseAdapter  # noqa: E402
+from wwise_mcp.core.connection import WwiseConnection  # noqa: E402
+from wwise_mcp.core.plan import MutationPlan  # noqa: E402
+from wwise_mcp.tools.action import create_object  # noqa: E402
+
+PARENT = "\\Actor-Mixer Hierarchy\\Default Work Unit"
+
+
+class FakeWwise:
+    def __init__(self, base_us: float, per_object_us: float):
+        self._lock = threading.Lock()
+        self._base = base_us / 1e6
+        self._per_object = per_object_us / 1e6
+        self._ids = itertools.count()
+        self.children: dict[str, str] = {}   # name → id
+        self.calls: dict[str, int] = {}
+
+    def is_connected(self) -> bool:
+        return True
+
+    def _cost(self, n: int) -> None:
+        time.sleep(self._base + self._per_object * n)
+
+    def _create(self, name: str) -> dict:
+        final, suffix = name, 0
+        while final in self.children:
+            suffix += 1
+            final = f"{name}_{suffix:02d}"
+        obj_id = f"{{{next(self._ids):08d}}}"
+        self.children[final] = obj_id
+        return {"id": obj_id, "name": final}
+
+    def call(self, uri, payload):
+        with self._lock:
+            self.calls[uri] = self.calls.get(uri, 0) + 1
+            if uri == "ak.wwise.core.object.get":
+                src = payload["from"]
+                if payload.get("transform"):
+                    rows = [{"name": n, "path": f"{PARENT}\\{n}"} for n in self.children]
+                elif "id" in src:
+                    by_id = {v: k for k, v in self.children.items()}
+                    rows = [{"id": i, "name": by_id[i], "path": f"{PARENT}\\{by_id[i]}", "type": "Sound"}
+                            for i in src["id"] if i in by_id]
+                else:
+                    rows = []
+                self._cost(len(rows))
+                return {"return": rows}
+            if uri == "ak.wwise.core.object.create":
+                self._cost(1)
+                return self._create(payload["name"])
+            if uri == "ak.wwise.core.object.set":
+                out = []
+                for entry in payload["objects"]:
+                    created = [self._create(c["name"]) for c in entry.get("children", [])]
+                    out.append({"id": "parent", "children": created})
+                self._cost(sum(len(o["children"]) for o in out))
+                return {"objects": out}
+            raise ValueError(uri)
+
+
+async def legacy_create(adapter: WwiseAdapter, name: str) -> dict:
+    """旧实现：兄弟节点扫描 + create + 按 id 回查"""
+    await adapter.get_objects(
+        from_spec={"path": [PARENT]},
+        return_fields=["name", "path"],
+        transform=[{"select": ["children"]}],
+    )
+    result = await adapter.call("ak.wwise.core.object.create",
+                                {"name": name, "type": "Sound SFX", "parent": PARENT, "onNameConflict": "rename"})
+    await adapter.get_objects(from_spec={"id": [result["id"]]}, return_fields=["name", "path", "type"])
+    return result
+
+
+async def run(mode: str, args) -> dict:
+    fake = FakeWwise(args.base_us, args.per_object_us)
+    conn = WwiseConnection()
+    conn._client = fake
+    adapter_module._connection = conn
+    adapter = WwiseAdapter(conn)
+    names = [f"SFX_{i:05d}" for i in range(args.children)]
+
+    started = time.perf_counter()
+    if mode == "legacy":
+        for name in names:
+            await legacy_create(adapter, name)
+    elif mode == "create":
+        for name in names:
+            result = await create_object(name, "Sound SFX", PARENT)
+            assert result["success"], result
+    else:
+        plan = MutationPlan()
+        for name in names:
+            plan.create(PARENT, "Sound SFX", name)
+        result = await plan.execute(adapter)
+        assert len(result.created) == len(names)
+    elapsed = time.perf_counter() - started
+    return {"elapsed": elapsed, "calls": dict(fake.calls), "created": len(fake.children)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量创建基准")
+    parser.add_argument("--children", type=int, default=10000)
+    parser.add_argument("--base-us", type=float, default=200.0, help="单次 WAAPI 调用固定开销")
+    parser.add_argument("--per-object-us", type=float, default=5.0, help="每个返回/创建对象的开销")
+    parser.add_argument("--modes", default="legacy,create,plan")
+    args = parser.parse_args()
+
+    for mode in args.modes.split(","):
+        r = asyncio.run(run(mode, args))
+        calls = " ".join(f"{uri.rsplit('.', 2)[-2]}.{uri.rsplit('.', 1)[-1]}={n}" for uri, n in sorted(r["calls"].items()))
+        print(f"{mode:7s} {r['elapsed']:8.2f}s  {r['created'] / r['elapsed']:9.0f} obj/s  {calls}")
+
+
+if __name__ == "__main__":
+    main()
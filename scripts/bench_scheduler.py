@@ -0,0 +1,108 @@
+"""
+WAAPI 优先级调度基准
+用模拟的 Wwise（单线程串行处理请求，可配置处理耗时）对比两种调度下
+交互式请求在后台批量负载中的延迟：
+
+  - fifo：     旧行为，所有调用直接进入线程池，先到先服务
+  - priority： WaapiScheduler（interactive > normal > bulk，分级并发上限 + 老化）
+
+用法：
+    python scripts/bench_scheduler.py
+    python scripts/bench_scheduler.py --bulk-workers 16 --bulk-ms 120 --interactive 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wwise_mcp.core import connection as connection_module  # noqa: E402
+from wwise_mcp.core.connection import WwiseConnection  # noqa: E402
+from wwise_mcp.core.scheduler import BULK, INTERACTIVE, WaapiScheduler, current_priority  # noqa: E402
+
+
+class FakeWwise:
+    """模拟 WaapiClient：Wwise 主线程串行处理请求"""
+
+    def __init__(self, bulk_ms: float, interactive_ms: float):
+        self._lock = threading.Lock()
+        self._bulk = bulk_ms / 1000.0
+        self._interactive = interactive_ms / 1000.0
+
+    def is_connected(self) -> bool:
+        return True
+
+    def call(self, uri, payload):
+        cost = self._interactive if uri == "ak.wwise.ui.getSelectedObjects" else self._bulk
+        with self._lock:
+            time.sleep(cost)
+        return {"return": []}
+
+
+def _p(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * len(values))) - 1)] * 1000
+
+
+async def run(mode: str, args) -> list[float]:
+    if mode == "fifo":
+        sched = WaapiScheduler(max_concurrency=1024, class_limits={p: 1024 for p in ("interactive", "normal", "bulk")})
+    else:
+        sched = WaapiScheduler()
+    connection_module.scheduler = sched
+
+    conn = WwiseConnection()
+    conn._client = FakeWwise(args.bulk_ms, args.interactive_ms)
+    stop = asyncio.Event()
+
+    async def bulk_worker():
+        current_priority.set(BULK)
+        while not stop.is_set():
+            await conn.call("ak.wwise.core.object.get", {"from": {"ofType": ["Sound"]}})
+
+    async def interactive_client() -> list[float]:
+        current_priority.set(INTERACTIVE)
+        latencies = []
+        await asyncio.sleep(0.2)  # 等待批量负载建立
+        for _ in range(args.interactive):
+            started = time.perf_counter()
+            await conn.call("ak.wwise.ui.getSelectedObjects", {})
+            latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(args.gap_ms / 1000.0)
+        return latencies
+
+    workers = [asyncio.create_task(bulk_worker()) for _ in range(args.bulk_workers)]
+    latencies = await interactive_client()
+    stop.set()
+    await asyncio.gather(*workers)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WAAPI 优先级调度基准")
+    parser.add_argument("--bulk-workers", type=int, default=8)
+    parser.add_argument("--bulk-ms", type=float, default=60.0, help="单次批量调用的 Wwise 处理耗时")
+    parser.add_argument("--interactive-ms", type=float, default=5.0)
+    parser.add_argument("--interactive", type=int, default=40, help="交互式请求次数")
+    parser.add_argument("--gap-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    # 保证 fifo 模式下线程池不是瓶颈
+    loop = asyncio.new_event_loop()
+    from concurrent.futures import ThreadPoolExecutor
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=args.bulk_workers + 8))
+
+    for mode in ("fifo", "priority"):
+        lat = loop.run_until_complete(run(mode, args))
+        print(f"{mode:9s} interactive n={len(lat)}  p50={_p(lat, 50):7.1f}ms  "
+              f"p99={_p(lat, 99):7.1f}ms  mean={statistics.mean(lat) * 1000:7.1f}ms")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+MCP Server 冷启动基准
+以 stdio 模式启动 `python -m wwise_mcp.server`，测量：
+  - time-to-initialize：进程启动 → 收到 initialize 响应
+  - time-to-tools/list：进程启动 → 收到 tools/list 响应
+并检查启动阶段未导入 waapi / 工具模块 / numpy，以及导入不需要 numpy 的工具模块时未连带加载 numpy。
+超出预算时以非零状态码退出，可直接接入 CI。
+
+用法：
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --runs 10 --init-budget 1.0 --list-budget 1.5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# 启动阶段不应被导入的模块（首次工具调用时才加载）
+DEFERRED_MODULES = [
+    "waapi",
+    "wwise_mcp.tools.query",
+    "wwise_mcp.tools.action",
+    "wwise_mcp.tools.verify",
+    "wwise_mcp.tools.fallback",
+    "wwise_mcp.tools.media",
+    "wwise_mcp.core.media_index",
+    "wwise_mcp.rag.context_collector",
+    "wwise_mcp.rag.doc_index",
+    "numpy",
+    "wwise_mcp.store",
+    "wwise_mcp.media.loudness",
+]
+
+# 只在 query_properties / analyze_loudness 等工具首次调用时才允许加载（可选依赖 numpy）
+NUMPY_MODULES = ["numpy", "wwise_mcp.store", "wwise_mcp.media.loudness"]
+TOOL_MODULES = ["wwise_mcp.tools.query", "wwise_mcp.tools.action", "wwise_mcp.tools.verify", "wwise_mcp.tools.media"]
+
+
+def _rpc(proc: subprocess.Popen, msg: dict) -> None:
+    proc.stdin.write((json.dumps(msg) + "\n").encode("utf-8"))
+    proc.stdin.flush()
+
+
+def _read_response(proc: subprocess.Popen, msg_id: int) -> dict:
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError("server 在响应前退出")
+        try:
+            msg = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if msg.get("id") == msg_id:
+            return msg
+
+
+def run_once() -> tuple[float, float, int]:
+    """启动一次 server，返回 (t_initialize, t_tools_list, tool_count)"""
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "wwise_mcp.server"],
+        cwd=ROOT,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _rpc(proc, {
+            "jsonrpc": "2.0", "id": 1, "method": "initialize",
+            "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "bench_startup", "version": "0"},
+            },
+        })
+        _read_response(proc, 1)
+        t_init = time.perf_counter() - started
+
+        _rpc(proc, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        _rpc(proc, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        resp = _read_response(proc, 2)
+        t_list = time.perf_counter() - started
+        tool_count = len(resp.get("result", {}).get("tools", []))
+        return t_init, t_list, tool_count
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def _loaded_after(imports: list[str], modules: list[str]) -> list[str]:
+    """在新进程中导入 imports，返回 modules 中已被加载的模块"""
+    code = (
+        f"import sys, json, importlib; [importlib.import_module(m) for m in {imports!r}]; "
+        f"print(json.dumps([m for m in {modules!r} if m in sys.modules]))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, check=True
+    ).stdout
+    return json.loads(out.decode("utf-8").strip().splitlines()[-1])
+
+
+def check_deferred_imports() -> list[str]:
+    """返回 import wwise_mcp.server 后已被加载的"应延迟"模块"""
+    return _loaded_after(["wwise_mcp.server"], DEFERRED_MODULES)
+
+
+def check_numpy_imports() -> list[str]:
+    """返回导入全部工具模块（未调用任何需要 numpy 的工具）后已被加载的 numpy 相关模块"""
+    return _loaded_after(TOOL_MODULES, NUMPY_MODULES)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WwiseMCP 冷启动基准")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--init-budget", type=float, default=1.5, help="initialize 预算（秒，中位数）")
+    parser.add_argument("--list-budget", type=float, default=2.0, help="tools/list 预算（秒，中位数）")
+    args = parser.parse_args()
+
+    eager = check_deferred_imports()
+    if eager:
+        print(f"[FAIL] 启动阶段被提前导入的模块：{eager}")
+    eager_numpy = check_numpy_imports()
+    if eager_numpy:
+        print(f"[FAIL] 导入工具模块时被提前导入的模块：{eager_numpy}")
+
+    inits, lists = [], []
+    tool_count = 0
+    for _ in range(args.runs):
+        t_init, t_list, tool_count = run_once()
+        inits.append(t_init)
+        lists.append(t_list)
+
+    med_init = statistics.median(inits)
+    med_list = statistics.median(lists)
+    print(f"time-to-initialize  median={med_init * 1000:.0f}ms  min={min(inits) * 1000:.0f}ms")
+    print(f"time-to-tools/list  median={med_list * 1000:.0f}ms  min={min(lists) * 1000:.0f}ms  tools={tool_count}")
+
+    ok = not eager and not eager_numpy and med_init <= args.init_budget and med_list <= args.list_budget
+    print("[OK] 在预算内" if ok else "[FAIL] 超出预算")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
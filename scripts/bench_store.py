@@ -0,0 +1,109 @@
+"""
+对象存储内存基准：WAAPI 结果 dict 列表 vs ObjectStore（tracemalloc 统计）
+生成与真实项目形状相近的层级：Work Unit → 容器 → Sound → AudioFileSource，
+每个对象带 id / name / type / path 四个字段（与 search_objects 等工具的返回一致）。
+
+  - dicts：list[dict]，字符串各自独立分配（与 json 解码结果一致）
+  - store：ObjectStore.load 并建好 GUID 索引后保留的内存（加载过程中的峰值单独列出）
+
+用法：
+    python scripts/bench_store.py
+    python scripts/bench_store.py --sizes 100000,1000000
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wwise_mcp.store import ObjectStore  # noqa: E402
+
+ROOT = "\\Actor-Mixer Hierarchy"
+SOUNDS_PER_CONTAINER = 20
+CONTAINERS_PER_WU = 100
+
+
+def generate_rows(n: int):
+    """按层级顺序产出 n 个对象行"""
+    count = 0
+    wu = 0
+    while True:
+        wu_path = f"{ROOT}\\WU_{wu:03d}"
+        rows = [("WorkUnit", f"WU_{wu:03d}", wu_path)]
+        for c in range(CONTAINERS_PER_WU):
+            c_name = f"RSC_Footsteps_{wu:03d}_{c:03d}"
+            c_path = f"{wu_path}\\{c_name}"
+            rows.append(("RandomSequenceContainer", c_name, c_path))
+            for s in range(SOUNDS_PER_CONTAINER):
+                s_name = f"SFX_Footstep_Concrete_{wu:03d}_{c:03d}_{s:02d}"
+                s_path = f"{c_path}\\{s_name}"
+                rows.append(("Sound", s_name, s_path))
+                rows.append(("AudioFileSource", s_name, f"{s_path}\\{s_name}"))
+        for obj_type, name, path in rows:
+            yield {
+                # 确定性 GUID：两次生成结果一致，便于校验查找
+                "id": "{" + str(uuid.UUID(int=(count + 1) * 0x9E3779B97F4A7C15F39CC0605CEDC835 % (1 << 128))).upper() + "}",
+                "name": name,
+                "type": obj_type,
+                "path": path,
+            }
+            count += 1
+            if count >= n:
+                return
+        wu += 1
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current, peak, elapsed
+
+
+def run(n: int) -> None:
+    rows, dict_bytes, _, _ = measure(lambda: list(generate_rows(n)))
+    sample = rows[n // 2]
+    del rows
+
+    def build_store():
+        store = ObjectStore()
+        store.load(generate_rows(n))
+        store.handle(sample["id"])   # 建立 GUID 索引，计入内存
+        return store
+
+    store, store_bytes, store_peak, load_s = measure(build_store)
+
+    # 校验：GUID 查找与 path 还原
+    start = time.perf_counter()
+    handle = store.handle(sample["id"])
+    lookup_us = (time.perf_counter() - start) * 1e6
+    assert handle is not None and store.row(handle) == sample, "ObjectStore 还原结果与原始行不一致"
+
+    print(
+        f"{n:>9,} objects | dicts {dict_bytes / 1e6:8.1f} MB ({dict_bytes / n:5.0f} B/obj)"
+        f" | store {store_bytes / 1e6:7.1f} MB ({store_bytes / n:4.0f} B/obj, load peak {store_peak / 1e6:.1f} MB,"
+        f" load {load_s:.2f}s, lookup {lookup_us:.0f}us)"
+        f" | {dict_bytes / max(store_bytes, 1):4.1f}x smaller"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sizes", default="100000,1000000", help="对象数，逗号分隔")
+    args = parser.parse_args()
+    for n in (int(s) for s in args.sizes.split(",")):
+        run(n)
+
+
+if __name__ == "__main__":
+    main()
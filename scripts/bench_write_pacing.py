@@ -0,0 +1,132 @@
+"""
+写入节流（AIMD）基准
+模拟 Wwise：主线程串行处理请求，单次 object.set 耗时 = (base + per_object × 对象数) × 负载曲线(t)。
+对比：
+  - unpaced：固定最大批量 + 固定 8 路并发（全速写入）
+  - paced：  WritePacer 按响应延迟调节批量与在途数
+
+输出吞吐（对象/秒）、写请求端到端延迟 p95，以及单个请求占用 Wwise 主线程的
+最长/p95 时长（WAAPI 请求在主线程上执行，期间 UI 无法响应，可近似视为 UI 卡顿）。
+
+用法：
+    python scripts/bench_write_pacing.py
+    python scripts/bench_write_pacing.py --curve ramp --objects 50000
+"""
+
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wwise_mcp.core import connection as connection_module  # noqa: E402
+from wwise_mcp.core.connection import WwiseConnection  # noqa: E402
+from wwise_mcp.core.pacing import WritePacer  # noqa: E402
+from wwise_mcp.core.scheduler import WaapiScheduler  # noqa: E402
+
+CURVES = {
+    "flat": lambda x: 1.0,
+    # 运行中段 Wwise 忙于其他工作（如设计师在播放/编辑），延迟翻 3 倍
+    "spike": lambda x: 3.0 if 0.3 <= x <= 0.6 else 1.0,
+    # 项目越写越大，延迟线性升高到 4 倍
+    "ramp": lambda x: 1.0 + 3.0 * x,
+}
+
+
+class FakeWwise:
+    def __init__(self, base_ms: float, per_object_ms: float, curve, expected_s: float):
+        self._lock = threading.Lock()
+        self._base = base_ms / 1000.0
+        self._per_object = per_object_ms / 1000.0
+        self._curve = curve
+        self._expected = expected_s
+        self._t0 = time.monotonic()
+        self.holds: list[float] = []
+
+    def is_connected(self) -> bool:
+        return True
+
+    def call(self, uri, payload):
+        n = len(payload.get("objects", [])) or 1
+        with self._lock:
+            start = time.monotonic()
+            x = min(1.0, (start - self._t0) / self._expected)
+            time.sleep((self._base + self._per_object * n) * self._curve(x))
+            self.holds.append(time.monotonic() - start)
+        return {"objects": []}
+
+
+async def run(mode: str, args) -> dict:
+    if mode == "paced":
+        pacer = WritePacer(target_latency=args.target_ms / 1000.0, max_inflight=8,
+                           min_batch=10, max_batch=args.max_batch)
+        workers = 8
+    else:
+        pacer = WritePacer(target_latency=3600.0, max_inflight=8,
+                           min_batch=args.max_batch, max_batch=args.max_batch)
+        pacer.inflight_limit = 8.0
+        workers = 8
+    connection_module.pacer = pacer
+    connection_module.scheduler = WaapiScheduler(max_concurrency=16,
+                                                 class_limits={"interactive": 16, "normal": 16, "bulk": 16})
+
+    fake = FakeWwise(args.base_ms, args.per_object_ms, CURVES[args.curve], args.expected_s)
+    conn = WwiseConnection()
+    conn._client = fake
+
+    items = [{"object": f"{{obj-{i}}}", "@Volume": -3} for i in range(args.objects)]
+    cursor = 0
+    latencies: list[float] = []
+
+    async def worker():
+        nonlocal cursor
+        while cursor < len(items):
+            n = max(1, pacer.batch_size)
+            chunk = items[cursor:cursor + n]
+            cursor += n
+            started = time.perf_counter()
+            await conn.call("ak.wwise.core.object.set", {"objects": chunk})
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    holds = sorted(fake.holds)
+    return {
+        "throughput": args.objects / elapsed,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "hold_p95_ms": holds[int(len(holds) * 0.95) - 1] * 1000,
+        "hold_max_ms": holds[-1] * 1000,
+        "calls": len(latencies),
+        "final": pacer.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AIMD 写入节流基准")
+    parser.add_argument("--objects", type=int, default=20000)
+    parser.add_argument("--curve", choices=sorted(CURVES), default="spike")
+    parser.add_argument("--base-ms", type=float, default=5.0)
+    parser.add_argument("--per-object-ms", type=float, default=0.2)
+    parser.add_argument("--target-ms", type=float, default=100.0)
+    parser.add_argument("--max-batch", type=int, default=500)
+    parser.add_argument("--expected-s", type=float, default=5.0, help="负载曲线横轴对应的时长")
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=32))
+    for mode in ("unpaced", "paced"):
+        r = loop.run_until_complete(run(mode, args))
+        print(f"{mode:8s} {r['throughput']:8.0f} obj/s  p95={r['p95_ms']:7.1f}ms  "
+              f"ui_hold p95={r['hold_p95_ms']:6.1f}ms max={r['hold_max_ms']:6.1f}ms  calls={r['calls']}  "
+              f"batch={r['final']['batch_size']} inflight={r['final']['inflight_limit']}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ WwiseMCP Server 配置
 """
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import Dict, List
 
 
 @dataclass
@@ -15,6 +15,78 @@ class WwiseSettings:
     reconnect_interval: float = 3.0 # 断线重连间隔（秒）
     max_reconnect: int = 5          # 最大重连次数
 
+    # WAAPI 调用调度（interactive > normal > bulk）
+    waapi_max_concurrency: int = 4      # 同时在途的 WAAPI 调用上限
+    waapi_class_limits: Dict[str, int] = field(default_factory=lambda: {
+        "interactive": 4,
+        "normal": 3,
+        "bulk": 2,
+    })
+    waapi_aging_interval: float = 0.5   # 排队每满该秒数，有效优先级提升一级（防饿死）
+
+    # 写入节流（AIMD，避免批量修改卡住 Wwise UI）
+    write_target_latency: float = 0.25  # 写请求目标响应延迟（秒）
+    write_max_inflight: int = 4         # 在途写请求上限
+    write_min_batch: int = 10           # object.set 等分块写入的最小/最大单批对象数
+    write_max_batch: int = 500
+
+    # 调用指标（wwise://metrics 资源）
+    metrics_window: int = 1024          # 每个 URI/工具保留的最近延迟样本数（环形缓冲区）
+    metrics_payload_sizes: bool = True  # 是否统计请求/响应字节数（需序列化一次 payload）
+    metrics_log_interval: float = 0.0   # 周期性指标日志间隔（秒），0 表示关闭
+
+    # Span 追踪（Chrome trace-event JSON）
+    trace_enabled: bool = False
+    trace_max_events: int = 200_000     # 内存中最多保留的 trace 事件数
+    trace_output: str = ""              # 进程退出时写出的 trace 文件路径，空表示不写
+
+    # 按工具采样 Profiler（--profile）
+    profile_dir: str = ""               # collapsed stacks 输出目录，空表示不启用
+    profile_interval: float = 0.005     # 采样间隔（秒）
+    profile_flush_interval: float = 30.0  # 定期写盘间隔（秒）
+
+    # object.get 返回字段 ↔ 类型兼容表（自学习，持久化），空字符串表示仅保存在内存
+    accessor_table_path: str = "~/.wwise_mcp/accessor_table.json"
+
+    # 分块读取（按 id 列表批量 object.get）
+    read_chunk_size: int = 500          # 单次 object.get 的 id 数上限，分块并发执行
+
+    # 查询规划器（ofType vs descendants 代价估算）
+    planner_stats_ttl: float = 600.0            # 基数统计有效期（秒）
+    planner_default_type_count: int = 2000      # 未观测过的类型的全项目数量估计
+
+    # 大范围后代流式读取（按 Work Unit / 子树分块）
+    stream_chunk_rows: int = 5000       # 估算子树超过该对象数时继续按子节点拆分；规划器据此决定是否流式执行
+    stream_concurrency: int = 4         # 同时在途的子树块数（决定峰值内存）
+
+    # 列表查询结果快照（游标分页）
+    snapshot_ttl: float = 300.0         # 快照有效期（秒），项目变更时提前失效
+    snapshot_max_entries: int = 32      # 最多缓存的快照数（LRU）
+
+    # 读工具响应预算（超出时返回聚合 + 游标），0 表示不限制
+    response_max_tokens: int = 8000     # 约按 JSON 字节数 / 4 估算
+
+    # Transport 池（preview_event）
+    transport_idle_ttl: float = 120.0   # 未播放的 transport 空闲超过该秒数后销毁
+    transport_pool_size: int = 16       # 池中 transport 上限，超出时销毁最久未用的
+
+    # 媒体文件（WAV 头解析 / 音频导入）
+    media_workers: int = 8              # 本地并行解析文件头的线程数
+    import_batch_size: int = 500        # 每次 ak.wwise.core.audio.import 提交的文件数上限
+    media_hash_cache_path: str = "~/.wwise_mcp/media_hashes.json"  # (path, size, mtime) → 内容哈希
+
+    # 响度分析（需要 numpy）
+    loudness_workers: int = 0           # 进程池大小，0 表示 CPU 核数
+    loudness_block_frames: int = 262144  # 每次解码的帧数（决定单文件峰值内存）
+    loudness_cache_path: str = "~/.wwise_mcp/loudness.json"       # 内容哈希 → 分析结果
+
+    # Event → 媒体闭包索引
+    media_index_max_dirty: int = 2000   # 积压的变更对象超过该数量时整体重建，而不是增量更新
+
+    # 后台 Job
+    job_max_concurrency: int = 2        # 同时运行的 Job 上限，超出排队
+    job_history: int = 50               # 保留的已结束 Job 数量
+
     # execute_waapi 黑名单：禁止 Agent 直接调用的危险操作
     blacklisted_uris: List[str] = field(default_factory=lambda: [
         "ak.wwise.core.project.open",
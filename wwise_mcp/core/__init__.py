@@ -1,5 +1,8 @@
 from .adapter import WwiseAdapter, get_connection, init_connection
 from .connection import WwiseConnection
+from .metrics import WwiseMetrics, metrics
+from .plan import MutationPlan
+from .tracing import Tracer, tracer
 from .exceptions import (
     WwiseMCPError,
     WwiseConnectionError,
@@ -8,6 +11,7 @@ from .exceptions import (
     WwiseInvalidPropertyError,
     WwiseForbiddenOperationError,
     WwiseTimeoutError,
+    WwiseCursorError,
 )
 
 __all__ = [
@@ -15,6 +19,11 @@ __all__ = [
     "get_connection",
     "init_connection",
     "WwiseConnection",
+    "WwiseMetrics",
+    "metrics",
+    "MutationPlan",
+    "Tracer",
+    "tracer",
     "WwiseMCPError",
     "WwiseConnectionError",
     "WwiseAPIError",
@@ -22,4 +31,5 @@ __all__ = [
     "WwiseInvalidPropertyError",
     "WwiseForbiddenOperationError",
     "WwiseTimeoutError",
+    "WwiseCursorError",
 ]
@@ -0,0 +1,164 @@
+"""
+object.get 返回字段 ↔ 对象类型 兼容表（自学习 + 持久化）
+Volume、OutputBus 等类型专属字段一旦请求到不支持它的类型（Event、Bus 等），
+WAAPI 会以 "Unknown accessor" 拒绝整个调用。WwiseAdapter.get_objects 据此表：
+
+  - 请求的类型专属字段已知对某些类型无效时，直接按类型拆分查询，不再先失败一次
+  - 遇到 accessor 错误时对字段集合二分定位无效字段，并记录到表中
+  - 每次成功的按类型查询记录有效字段
+
+表保存在 settings.accessor_table_path（JSON），按 Wwise 版本区分。
+事件循环中通过 flush() 保存：在循环线程上生成快照，文件写入放到线程池，不阻塞其他工具。
+"""
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import threading
+from typing import Iterable
+
+from ..config import settings
+from .metrics import metrics
+
+logger = logging.getLogger("wwise_mcp.accessors")
+
+# 所有对象类型都支持的通用字段，不参与拆分
+UNIVERSAL_FIELDS = frozenset({
+    "id", "name", "type", "path", "shortId", "notes", "childrenCount",
+    "parent", "owner", "classId", "category", "workunit", "isPlayable",
+    "filePath", "pluginName",
+})
+
+
+def is_accessor_error(message: str) -> bool:
+    """WAAPI 错误是否为返回字段不被支持（Unknown accessor 或无详细信息的失败）"""
+    text = message.lower()
+    return "accessor" in text or "返回 none" in text
+
+
+class AccessorTable:
+    def __init__(self, path: str | None = None):
+        self.path = os.path.expanduser(path if path is not None else settings.accessor_table_path)
+        self.version = "default"
+        self._valid: dict[str, set[str]] = {}
+        self._invalid: dict[str, set[str]] = {}
+        self._tables: dict = {}
+        self._dirty = False
+        self._generation = 0            # 每次生成快照自增，避免较旧的快照覆盖较新的写入
+        self._written = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    # ------------------------------------------------------------------
+    # 持久化
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._tables = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("读取 accessor 表失败（%s），将重新学习", e)
+            self._tables = {}
+        self._select(self.version)
+
+    def _select(self, version: str) -> None:
+        table = self._tables.get(version, {})
+        self._valid = {t: set(v) for t, v in table.get("valid", {}).items()}
+        self._invalid = {t: set(v) for t, v in table.get("invalid", {}).items()}
+
+    def set_version(self, version: str) -> None:
+        """切换到指定 Wwise 版本的表（不同版本的 accessor 可能不同）"""
+        if version and version != self.version:
+            self.save()
+            self.version = version
+            self._select(version)
+
+    def _snapshot(self) -> tuple[int, dict]:
+        """在调用方线程上生成待写入的数据（表可能同时被事件循环修改，不能在线程池中遍历）"""
+        self._tables[self.version] = {
+            "valid": {t: sorted(v) for t, v in self._valid.items()},
+            "invalid": {t: sorted(v) for t, v in self._invalid.items()},
+        }
+        self._dirty = False
+        self._generation += 1
+        return self._generation, dict(self._tables)   # 各版本的表只整体替换，浅拷贝即可
+
+    def _write(self, generation: int, tables: dict) -> None:
+        with self._lock:
+            if generation <= self._written:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp = f"{self.path}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(tables, f, ensure_ascii=False, indent=1, sort_keys=True)
+                os.replace(tmp, self.path)
+                self._written = generation
+            except OSError as e:
+                self._dirty = True
+                logger.warning("保存 accessor 表失败：%s", e)
+
+    def save(self) -> None:
+        """同步保存（切换版本、退出时使用）"""
+        if self._dirty and self.path:
+            self._write(*self._snapshot())
+
+    async def flush(self) -> None:
+        """事件循环中保存：文件写入在线程池中执行"""
+        if self._dirty and self.path:
+            await asyncio.to_thread(self._write, *self._snapshot())
+
+    # ------------------------------------------------------------------
+    # 查询 / 学习
+    # ------------------------------------------------------------------
+
+    def specific(self, fields: Iterable[str]) -> list[str]:
+        """类型专属字段（需要按类型校验的字段）"""
+        return [f for f in fields if f not in UNIVERSAL_FIELDS]
+
+    def has_conflicts(self, fields: Iterable[str]) -> bool:
+        """请求字段中是否有已知对某种类型无效的字段（混合类型查询大概率失败）"""
+        wanted = set(self.specific(fields))
+        return any(wanted & bad for bad in self._invalid.values())
+
+    def filter(self, obj_type: str, fields: Iterable[str]) -> list[str]:
+        """去掉已知对该类型无效的字段"""
+        bad = self._invalid.get(obj_type, ())
+        return [f for f in fields if f not in bad]
+
+    def invalid_for(self, obj_type: str) -> set[str]:
+        return set(self._invalid.get(obj_type, ()))
+
+    def mark_valid(self, obj_type: str, fields: Iterable[str]) -> None:
+        fields = set(self.specific(fields))
+        known = self._valid.setdefault(obj_type, set())
+        if not fields <= known:
+            known |= fields
+            self._dirty = True
+
+    def mark_invalid(self, obj_type: str, field: str) -> None:
+        bad = self._invalid.setdefault(obj_type, set())
+        if field not in bad:
+            bad.add(field)
+            self._valid.get(obj_type, set()).discard(field)
+            self._dirty = True
+            logger.info("accessor 表：%s 不支持字段 %s", obj_type, field)
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "types": len(set(self._valid) | set(self._invalid)),
+            "valid_pairs": sum(len(v) for v in self._valid.values()),
+            "invalid_pairs": sum(len(v) for v in self._invalid.values()),
+        }
+
+
+# 全局单例
+accessor_table = AccessorTable()
+atexit.register(accessor_table.save)
+metrics.register_gauge("accessor_table", accessor_table.stats)
@@ -3,16 +3,25 @@ WwiseAdapter：Layer 1 — WAAPI Host Adapter
 封装所有 WAAPI 调用，对上层工具暴露简洁接口。
 """
 
+import asyncio
 import logging
-from typing import Any, Optional
+from collections import deque
+from typing import Any, AsyncIterator, Optional
 
+from ..config import settings
+from .accessors import UNIVERSAL_FIELDS, accessor_table, is_accessor_error
 from .connection import WwiseConnection
+from .planner import LogicalQuery, QueryPlan, planner
 from .exceptions import WwiseAPIError, WwiseConnectionError
+from .tracing import traced
 
 logger = logging.getLogger("wwise_mcp.adapter")
 
 _connection: Optional[WwiseConnection] = None
 
+# iter_descendants 最多按子节点向下拆分的层数
+_MAX_SPLIT_DEPTH = 4
+
 
 def get_connection() -> WwiseConnection:
     """获取全局 WAAPI 连接实例"""
@@ -28,6 +37,15 @@ def init_connection() -> WwiseConnection:
     return _connection
 
 
+def ref_id(value) -> Optional[str]:
+    """引用字段（{id, name} 或 GUID 字符串）→ id；空引用（全零 GUID）或非 GUID 值为 None"""
+    if isinstance(value, dict):
+        value = value.get("id")
+    if not isinstance(value, str) or not value.startswith("{") or value.strip("{}").replace("0", "").replace("-", "") == "":
+        return None
+    return value
+
+
 class WwiseAdapter:
     """
     WAAPI 调用封装。
@@ -42,10 +60,16 @@ class WwiseAdapter:
     def __init__(self, connection: Optional[WwiseConnection] = None):
         self._conn = connection or get_connection()
 
+    @property
+    def connection(self) -> WwiseConnection:
+        """底层连接（会话级资源据 connection.generation 判断是否失效，通过 connection.subscribe 订阅通知）"""
+        return self._conn
+
     # ------------------------------------------------------------------
     # 核心调用接口
     # ------------------------------------------------------------------
 
+    @traced("adapter")
     async def call(self, uri: str, args: dict = {}, opts: dict = {}) -> dict:
         """
         执行 WAAPI 调用。
@@ -65,23 +89,36 @@ class WwiseAdapter:
     # 便利方法：常用 WAAPI 调用的高级封装
     # ------------------------------------------------------------------
 
+    @traced("adapter")
     async def get_info(self) -> dict:
         """获取 Wwise 项目基础信息"""
-        return await self.call("ak.wwise.core.getInfo")
+        info = await self.call("ak.wwise.core.getInfo")
+        version = ((info or {}).get("version") or {}).get("displayName")
+        if version:
+            accessor_table.set_version(version)
+        return info
 
+    @traced("adapter")
     async def get_objects(
         self,
         from_spec: dict,
         return_fields: list[str] | None = None,
         transform: list | None = None,
+        obj_type: str | None = None,
     ) -> list[dict]:
         """
         通用对象查询。
 
+        类型专属字段（Volume、OutputBus 等）对不支持的类型会让整个调用以 "Unknown accessor" 失败。
+        已知存在冲突（见 accessors.accessor_table）或单次调用出现 accessor 错误时，
+        自动改为先取通用字段、再按类型分组请求各自支持的字段并按 id 合并；
+        不被支持的字段在结果中缺省。
+
         Args:
             from_spec:     WAAPI from 选择器，如 {"path": ["\\Actor-Mixer Hierarchy"]} 或 {"ofType": ["Sound"]}
             return_fields: 返回字段列表，不带 @ 前缀，如 ["name", "type", "path", "id"]
             transform:     WAAPI transform 管线（排序、过滤等）
+            obj_type:      已知结果全部属于该类型时传入（如按类型分组后的 id 列表），跳过混合类型拆分
         """
         if return_fields is None:
             return_fields = ["name", "type", "path", "id"]
@@ -90,13 +127,189 @@ class WwiseAdapter:
         if transform:
             args["transform"] = transform
 
-        result = await self.call(
-            "ak.wwise.core.object.get",
-            args,
-            {"return": return_fields},
-        )
+        # 单一类型查询：直接去掉已知对该类型无效的字段
+        of_type = from_spec.get("ofType") if isinstance(from_spec, dict) else None
+        if of_type and len(of_type) == 1:
+            obj_type = of_type[0]
+        if obj_type:
+            return_fields = accessor_table.filter(obj_type, return_fields)
+
+        if not accessor_table.specific(return_fields):
+            return await self._object_get(args, return_fields)
+
+        if obj_type or not accessor_table.has_conflicts(return_fields):
+            try:
+                rows = await self._object_get(args, return_fields)
+            except WwiseAPIError as e:
+                if not is_accessor_error(e.message):
+                    raise
+                logger.info("object.get 出现 accessor 错误，改为按类型拆分查询：%s", e.message)
+            else:
+                if "type" in return_fields:
+                    for obj_type in {row.get("type") for row in rows if row.get("type")}:
+                        accessor_table.mark_valid(obj_type, return_fields)
+                return rows
+
+        try:
+            return await self._get_objects_by_type(args, return_fields)
+        finally:
+            await accessor_table.flush()
+
+    @traced("adapter")
+    async def query(
+        self,
+        types: list[str] | None = None,
+        scope: str | None = None,
+        fields: list[str] | None = None,
+        name_contains: str | None = None,
+        where: Any = None,
+    ) -> tuple[list[dict], QueryPlan]:
+        """
+        逻辑查询：由查询规划器在 ofType / descendants 写法之间按估算代价选择，返回 (结果, 执行计划)。
+
+        Args:
+            types:         对象类型列表（None 表示不限，此时必须提供 scope）
+            scope:         范围路径，只返回其后代；None 表示全项目
+            fields:        返回字段，默认 ["name", "type", "path", "id"]
+            name_contains: 名称子串过滤（不区分大小写）
+            where:         其他客户端谓词，row -> bool
+        """
+        query = LogicalQuery(types=types, scope=scope, name_contains=name_contains, where=where)
+        if fields is not None:
+            query.fields = fields
+        return await planner.execute(self, query)
+
+    async def iter_descendants(
+        self,
+        scope: str,
+        return_fields: list[str] | None = None,
+        max_concurrency: int | None = None,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        流式读取 scope 的全部后代（不含自身），逐块 yield 对象列表（块间顺序不保证）。
+
+        单次 descendants 查询会让 Wwise 一次性序列化整棵子树。这里按子节点（通常即 Work Unit）
+        逐级拆分：先取直接子节点及 childrenCount，估算子树规模（childrenCount × 规划器扇出系数）
+        超过 settings.stream_chunk_rows 的继续展开，其余子树各用一次 descendants 查询读取。
+        同时在途的块数不超过 max_concurrency（默认 settings.stream_concurrency），
+        峰值内存约为这么多个块；第一块到达即可开始处理。
+
+        用法：
+            async for batch in adapter.iter_descendants("\\Actor-Mixer Hierarchy"):
+                ...
+        """
+        if return_fields is None:
+            return_fields = ["name", "type", "path", "id"]
+        extra = [f for f in ("path", "childrenCount") if f not in return_fields]
+        limit = max(1, max_concurrency or settings.stream_concurrency)
+        target = max(1, settings.stream_chunk_rows)
+        pending: deque[tuple[str, list[str], int]] = deque([("children", [scope], 0)])
+
+        async def fetch(select: str, paths: list[str], depth: int) -> list[dict]:
+            if select == "descendants":
+                return await self.get_objects({"path": paths}, return_fields, [{"select": ["descendants"]}])
+            rows = await self.get_objects({"path": paths}, return_fields + extra, [{"select": ["children"]}])
+            # 大子树继续展开；小子树按估算规模打包，一次 descendants 查询读取多个兄弟子树
+            group: list[str] = []
+            group_rows = 0.0
+            for row in rows:
+                count = row.get("childrenCount") or 0
+                if not count:
+                    continue
+                estimate = count * planner.fanout
+                if depth < _MAX_SPLIT_DEPTH and estimate > target:
+                    pending.append(("children", [row["path"]], depth + 1))
+                    continue
+                if group and group_rows + estimate > target:
+                    pending.append(("descendants", group, depth + 1))
+                    group, group_rows = [], 0.0
+                group.append(row["path"])
+                group_rows += estimate
+            if group:
+                pending.append(("descendants", group, depth + 1))
+            for row in rows:
+                for key in extra:
+                    row.pop(key, None)
+            return rows
+
+        running: set[asyncio.Task] = set()
+        try:
+            while pending or running:
+                while pending and len(running) < limit:
+                    running.add(asyncio.ensure_future(fetch(*pending.popleft())))
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    rows = task.result()
+                    if rows:
+                        yield rows
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def _object_get(self, args: dict, return_fields: list[str]) -> list[dict]:
+        result = await self.call("ak.wwise.core.object.get", args, {"return": return_fields})
         return result.get("return", [])
 
+    async def _get_objects_by_type(self, args: dict, return_fields: list[str]) -> list[dict]:
+        """先取通用字段得到 id / type，再按类型请求专属字段并合并（保持原查询顺序）"""
+        base = [f for f in return_fields if f in UNIVERSAL_FIELDS]
+        base += [f for f in ("id", "type") if f not in base]
+        rows = await self._object_get(args, base)
+
+        by_type: dict[str, list[str]] = {}
+        for row in rows:
+            if row.get("id"):
+                by_type.setdefault(row.get("type", ""), []).append(row["id"])
+
+        specific = accessor_table.specific(return_fields)
+        extras = await asyncio.gather(*(
+            self._get_typed_fields(obj_type, ids, specific) for obj_type, ids in by_type.items()
+        ))
+        merged: dict[str, dict] = {}
+        for extra in extras:
+            merged.update(extra)
+
+        drop = {"id", "type"} - set(return_fields)
+        for row in rows:
+            row.update(merged.get(row.get("id"), {}))
+            for key in drop:
+                row.pop(key, None)
+        return rows
+
+    async def _get_typed_fields(self, obj_type: str, ids: list[str], fields: list[str]) -> dict[str, dict]:
+        """按 id 分块请求同一类型对象的专属字段；accessor 错误时对字段集合二分，定位并记录无效字段"""
+
+        async def fetch(chunk: list[str], wanted: list[str]) -> dict[str, dict]:
+            try:
+                rows = await self._object_get({"from": {"id": chunk}}, ["id", *wanted])
+            except WwiseAPIError as e:
+                if not is_accessor_error(e.message):
+                    raise
+                if len(wanted) == 1:
+                    accessor_table.mark_invalid(obj_type, wanted[0])
+                    return {}
+                mid = len(wanted) // 2
+                left = await fetch(chunk, wanted[:mid])
+                right = await fetch(chunk, wanted[mid:])
+                for obj_id, row in right.items():
+                    left.setdefault(obj_id, {}).update(row)
+                return left
+            accessor_table.mark_valid(obj_type, wanted)
+            return {row["id"]: row for row in rows if row.get("id")}
+
+        result: dict[str, dict] = {}
+        size = max(1, settings.read_chunk_size)
+        for start in range(0, len(ids), size):
+            # 每块重新过滤：前一块二分学到的无效字段不再请求
+            wanted = accessor_table.filter(obj_type, fields)
+            if not wanted:
+                break
+            for obj_id, row in (await fetch(ids[start:start + size], wanted)).items():
+                row.pop("id", None)
+                result[obj_id] = row
+        return result
+
+    @traced("adapter")
     async def create_object(
         self,
         name: str,
@@ -118,10 +331,13 @@ class WwiseAdapter:
         if notes:
             args["notes"] = notes
         result = await self.call("ak.wwise.core.object.create", args)
-        # object.create 不支持 options.return，不返回 path；
-        # 用返回的 id 额外查一次以获取 path（FIXES_3 已记录此限制）
+        # object.create 不支持 options.return，只返回 {id, name}（name 为冲突重命名后的最终名称）。
+        # 父节点以路径给出时直接拼出 path，省去一次 object.get；父节点为 GUID 时才按 id 回查
         obj_id = result.get("id") if result else None
-        if obj_id:
+        if obj_id and parent_path.startswith("\\"):
+            final_name = result.get("name") or name
+            result = {**result, "name": final_name, "path": parent_path.rstrip("\\") + "\\" + final_name}
+        elif obj_id:
             try:
                 objs = await self.get_objects(
                     from_spec={"id": [obj_id]},
@@ -133,6 +349,7 @@ class WwiseAdapter:
                 pass
         return result
 
+    @traced("adapter")
     async def set_property(
         self, object_path: str, prop: str, value: Any, platform: str | None = None
     ) -> dict:
@@ -146,6 +363,7 @@ class WwiseAdapter:
             args["platform"] = platform
         return await self.call("ak.wwise.core.object.setProperty", args)
 
+    @traced("adapter")
     async def set_reference(
         self, object_path: str, reference: str, value_path: str, platform: str | None = None
     ) -> dict:
@@ -159,6 +377,7 @@ class WwiseAdapter:
             args["platform"] = platform
         return await self.call("ak.wwise.core.object.setReference", args)
 
+    @traced("adapter")
     async def delete_object(self, object_path: str) -> dict:
         """删除对象"""
         return await self.call(
@@ -166,6 +385,7 @@ class WwiseAdapter:
             {"object": object_path},
         )
 
+    @traced("adapter")
     async def move_object(self, object_path: str, new_parent_path: str) -> dict:
         """移动对象到新父节点"""
         return await self.call(
@@ -177,6 +397,7 @@ class WwiseAdapter:
             },
         )
 
+    @traced("adapter")
     async def get_selected_objects(self) -> list[dict]:
         """获取 Wwise 编辑器中当前选中的对象"""
         result = await self.call(
@@ -190,6 +411,7 @@ class WwiseAdapter:
     # object.set — 批量操作（RTPC / Effect / 复杂创建）
     # ------------------------------------------------------------------
 
+    @traced("adapter")
     async def object_set(
         self,
         objects: list[dict],
@@ -214,3 +436,32 @@ class WwiseAdapter:
             "listMode": list_mode,
         }
         return await self.call("ak.wwise.core.object.set", args)
+
+    @traced("adapter")
+    async def import_audio(
+        self,
+        imports: list[dict],
+        import_operation: str = "useExisting",
+        language: str = "SFX",
+    ) -> list[dict]:
+        """
+        调用 ak.wwise.core.audio.import 批量导入音频文件。
+
+        Args:
+            imports:          [{"audioFile": 本地路径, "objectPath": 目标对象路径, "originalsSubFolder": ...}]
+            import_operation: 'useExisting'（默认）| 'createNew' | 'replaceExisting'
+            language:         导入语言，音效为 'SFX'
+        Returns:
+            新建/更新的对象列表 [{id, name, path}]
+        """
+        args: dict[str, Any] = {
+            "importOperation": import_operation,
+            "default": {"importLanguage": language},
+            "imports": imports,
+        }
+        result = await self.call(
+            "ak.wwise.core.audio.import",
+            args,
+            {"return": ["id", "name", "path"]},
+        )
+        return (result or {}).get("objects", [])
@@ -0,0 +1,193 @@
+"""
+读工具响应整形：字段投影 + 响应预算
+查询结果直接进入 LLM 上下文，大项目下一次 get_bus_topology / execute_waapi 就可能返回数百 KB。
+
+  - 字段投影：fields 指定时，结果中的主列表（data 中最长的对象列表）每行只保留这些字段
+  - 响应预算：max_tokens / max_bytes（默认 settings.response_max_tokens），
+    token 数按 JSON 字节数 / 4 近似估算
+  - 超出预算：主列表替换为聚合信息（总数、按 type 计数、按父路径计数 Top N），
+    完整行存为结果快照，返回游标与建议页大小，由 get_page 工具分页读取
+  - 列式表（data["columns"] 为等长列表的字典，如 get_property_matrix）：fields 投影列，
+    超出预算时所有列一起截取到预算内的前若干行，其余行存为快照，get_page 同样以列式返回
+"""
+
+import json
+from collections import Counter
+from typing import Any, Optional
+
+from ..config import settings
+from .snapshot import snapshots
+
+BYTES_PER_TOKEN = 4
+_TOP_PARENTS = 20
+
+COLUMNS_KEY = "columns"
+COLUMNAR_SUFFIX = ":columns"      # 列式表剩余行快照的工具名后缀，get_page 据此按列返回
+_COLUMNS_RESERVE = 512            # 截取后追加的 budget 说明与游标所占字节
+
+
+def _json_size(obj: Any) -> int:
+    return len(json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str).encode())
+
+
+def _find_rows(data: Any) -> tuple[Optional[dict], Optional[str], Optional[list]]:
+    """在 data（及其下一层字典）中找出最长的对象列表，返回 (所在字典, 键, 列表)"""
+    best: tuple[Optional[dict], Optional[str], Optional[list]] = (None, None, None)
+    if not isinstance(data, dict):
+        return best
+    containers = [data] + [v for v in data.values() if isinstance(v, dict)]
+    for container in containers:
+        for key, value in container.items():
+            if (
+                isinstance(value, list) and value and isinstance(value[0], dict)
+                and (best[2] is None or len(value) > len(best[2]))
+            ):
+                best = (container, key, value)
+    return best
+
+
+def _find_columns(data: Any) -> Optional[dict]:
+    """data["columns"] 为非空、等长列表组成的字典时返回它"""
+    columns = data.get(COLUMNS_KEY) if isinstance(data, dict) else None
+    if not isinstance(columns, dict) or not columns:
+        return None
+    lengths = {len(v) if isinstance(v, list) else -1 for v in columns.values()}
+    return columns if len(lengths) == 1 and lengths != {-1} else None
+
+
+def columns_to_rows(columns: dict, start: int = 0) -> list[dict]:
+    names = list(columns)
+    return [dict(zip(names, values)) for values in zip(*(columns[n][start:] for n in names))]
+
+
+def rows_to_columns(rows: list[dict]) -> dict[str, list]:
+    names = list(rows[0]) if rows else []
+    return {n: [row.get(n) for row in rows] for n in names}
+
+
+def project_columns(columns: dict, fields: list[str]) -> dict:
+    """保留 fields 中的列；"<prop>@source" 之类的派生列随 prop 一起保留"""
+    wanted = set(fields)
+    return {k: v for k, v in columns.items() if k in wanted or k.split("@", 1)[0] in wanted}
+
+
+def project(rows: list, fields: list[str]) -> list:
+    return [{k: row[k] for k in fields if k in row} if isinstance(row, dict) else row for row in rows]
+
+
+def aggregate(rows: list) -> dict:
+    """行集合的聚合摘要：总数、按 type 计数、按父路径计数（Top N）、出现过的字段"""
+    by_type: Counter = Counter()
+    by_parent: Counter = Counter()
+    fields: set = set()
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        fields.update(row)
+        if "type" in row:
+            by_type[str(row["type"])] += 1
+        path = row.get("path")
+        if isinstance(path, str) and "\\" in path:
+            by_parent[path.rsplit("\\", 1)[0] or "\\"] += 1
+    summary: dict[str, Any] = {"count": len(rows), "fields": sorted(fields)}
+    if by_type:
+        summary["by_type"] = dict(by_type.most_common())
+    if by_parent:
+        summary["by_parent"] = dict(by_parent.most_common(_TOP_PARENTS))
+        summary["parents_total"] = len(by_parent)
+    return summary
+
+
+def budget_bytes(max_tokens: int | None = None, max_bytes: int | None = None) -> int:
+    """有效字节预算（0 表示不限制）"""
+    if max_bytes:
+        return max_bytes
+    tokens = max_tokens if max_tokens is not None else settings.response_max_tokens
+    return max(0, tokens) * BYTES_PER_TOKEN
+
+
+def shape_response(
+    result: dict,
+    tool: str,
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+) -> dict:
+    """对工具返回的 {"success", "data", "error"} 做字段投影与预算控制（原地修改并返回）"""
+    if not isinstance(result, dict) or not result.get("success"):
+        return result
+
+    data = result.get("data")
+    if isinstance(data, list):
+        data = result["data"] = {"items": data}
+    if _find_columns(data) is not None:
+        return _shape_columns(result, data, tool, fields, max_tokens, max_bytes)
+    container, key, rows = _find_rows(data)
+
+    if rows is not None and fields:
+        rows = container[key] = project(rows, fields)
+
+    limit = budget_bytes(max_tokens, max_bytes)
+    if not limit or rows is None:
+        return result
+    size = _json_size(result)
+    if size <= limit:
+        return result
+
+    # 超出预算：主列表替换为聚合 + 游标
+    rows_bytes = _json_size(rows)
+    overhead = size - rows_bytes
+    avg_row = max(1, rows_bytes // len(rows))
+    page_size = max(1, (limit - overhead) // avg_row) if limit > overhead else 1
+    container[key] = []
+    container[f"{key}_aggregate"] = aggregate(rows)
+    container[f"{key}_cursor"] = snapshots.store(f"budget:{tool}", rows)
+    container["budget"] = {
+        "limit_bytes": limit,
+        "response_bytes": size,
+        "approx_tokens": size // BYTES_PER_TOKEN,
+        "suggested_page_size": page_size,
+        "note": f"结果超出响应预算，'{key}' 已替换为聚合信息；"
+                f"用 get_page(cursor, max_results={page_size}) 分页读取原始行，或传入 fields 减少字段",
+    }
+    return result
+
+
+def _shape_columns(
+    result: dict,
+    data: dict,
+    tool: str,
+    fields: list[str] | None,
+    max_tokens: int | None,
+    max_bytes: int | None,
+) -> dict:
+    """列式表：投影列；超出预算时所有列一起截取前 N 行，其余行存为快照"""
+    columns = data[COLUMNS_KEY]
+    if fields:
+        columns = data[COLUMNS_KEY] = project_columns(columns, fields)
+    limit = budget_bytes(max_tokens, max_bytes)
+    total = len(next(iter(columns.values()), []))
+    if not limit or not total:
+        return result
+    size = _json_size(result)
+    if size <= limit:
+        return result
+
+    columns_bytes = _json_size(columns)
+    overhead = size - columns_bytes + _COLUMNS_RESERVE
+    avg_row = max(1, columns_bytes // total)
+    page_size = max(1, (limit - overhead) // avg_row) if limit > overhead else 1
+    rest = columns_to_rows(columns, page_size)
+    data[COLUMNS_KEY] = {name: values[:page_size] for name, values in columns.items()}
+    data[f"{COLUMNS_KEY}_cursor"] = snapshots.store(f"budget:{tool}{COLUMNAR_SUFFIX}", rest)
+    data["budget"] = {
+        "limit_bytes": limit,
+        "response_bytes": size,
+        "approx_tokens": size // BYTES_PER_TOKEN,
+        "returned_rows": page_size,
+        "remaining_rows": len(rest),
+        "suggested_page_size": page_size,
+        "note": f"结果超出响应预算，只返回前 {page_size} 行；"
+                f"用 get_page(cursor, max_results={page_size}) 按列读取其余行，或传入 fields 减少列",
+    }
+    return result
@@ -1,21 +1,51 @@
 """
 WAAPI 连接管理 — 基于官方 waapi-client 库
 WaapiClient 内部封装了完整的 WAMP 协议，无需手写协议细节。
+waapi-client（及其 autobahn 依赖）在首次建立连接时才导入，不拖慢 server 启动。
 """
 
 import asyncio
+import json
 import logging
-from typing import Optional
-
-from waapi import WaapiClient
-from waapi.wamp.interface import CannotConnectToWaapiException
+import time
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Optional
 
 from ..config import settings
 from .exceptions import WwiseConnectionError, WwiseAPIError
+from .metrics import metrics
+from .pacing import WRITE_URIS, pacer
+from .scheduler import scheduler
+from .snapshot import snapshots
+from .tracing import tracer
+
+if TYPE_CHECKING:
+    from waapi import WaapiClient
 
 logger = logging.getLogger("wwise_mcp.connection")
 
 
+def _json_size(obj) -> int:
+    """payload 序列化后的字节数近似值（用于指标统计）"""
+    try:
+        return len(json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str))
+    except Exception:
+        return 0
+
+
+def _record_thread_hop(span, submitted_ns: int, thread_start_ns: int, thread_end_ns: int) -> None:
+    """
+    把一次 to_thread 调用拆成两段子事件：
+      thread_wait — 提交到线程池到工作线程开始执行（线程池排队）
+      wwise       — 工作线程内阻塞等待 Wwise 返回
+    """
+    wait_ns = thread_start_ns - submitted_ns
+    wwise_ns = thread_end_ns - thread_start_ns
+    tracer.add_complete("thread_wait", "waapi", submitted_ns, wait_ns, span.track)
+    tracer.add_complete("wwise", "waapi", thread_start_ns, wwise_ns, span.track)
+    span.set(thread_wait_ms=round(wait_ns / 1e6, 3), wwise_ms=round(wwise_ns / 1e6, 3))
+
+
 class WwiseConnection:
     """
     对 WaapiClient 的薄封装，提供 async 接口供 WwiseAdapter 使用。
@@ -23,7 +53,8 @@ class WwiseConnection:
     """
 
     def __init__(self):
-        self._client: Optional[WaapiClient] = None
+        self._client: Optional["WaapiClient"] = None
+        self.generation = 0   # 每次（重新）建立连接自增；会话级资源（transport、订阅）据此判断是否失效
 
     async def ensure_connected(self) -> None:
         """确保连接可用，未连接时主动建立连接。"""
@@ -32,10 +63,16 @@ class WwiseConnection:
         await self._connect()
 
     async def _connect(self) -> None:
+        from waapi import WaapiClient
+        from waapi.wamp.interface import CannotConnectToWaapiException
+
         try:
+            # allow_exception=True：调用失败时抛出带 WAAPI 错误信息的异常，而不是返回 None，
+            # 上层据此区分 "Unknown accessor" 等错误
             self._client = await asyncio.to_thread(
-                lambda: WaapiClient(settings.waapi_url)
+                lambda: WaapiClient(settings.waapi_url, allow_exception=True)
             )
+            self.generation += 1
             logger.info("WAAPI 连接成功：%s", settings.waapi_url)
         except CannotConnectToWaapiException as e:
             raise WwiseConnectionError(str(e))
@@ -50,26 +87,93 @@ class WwiseConnection:
         if not self._client or not self._client.is_connected():
             await self.ensure_connected()
 
-        for attempt in range(2):  # 最多尝试 2 次（1 次重试）
-            try:
-                result = await asyncio.to_thread(
-                    lambda: self._client.call(uri, payload)
-                )
-                if result is None:
-                    raise WwiseAPIError(
-                        f"WAAPI 调用 '{uri}' 返回 None（参数可能有误，请检查 Wwise 日志）"
-                    )
-                return result
-            except WwiseAPIError:
-                raise
-            except asyncio.TimeoutError:
-                if attempt == 0:
-                    logger.warning("WAAPI 调用 '%s' 超时，正在重试…", uri)
-                    continue
-                from .exceptions import WwiseTimeoutError
-                raise WwiseTimeoutError()
-            except Exception as e:
-                raise WwiseAPIError(f"WAAPI 调用 '{uri}' 异常：{e}")
+        with tracer.span(f"waapi {uri}", "waapi") as span:
+            return await self._call(uri, payload, span)
+
+    async def _call(self, uri: str, payload: dict, span) -> dict:
+        measure_sizes = settings.metrics_payload_sizes
+        request_bytes = _json_size(payload) if measure_sizes else 0
+        response_bytes = 0
+        wwise_elapsed = 0.0
+        retries = 0
+        error = False
+        started = time.perf_counter()
+        trace = tracer.enabled
+        is_write = uri in WRITE_URIS
+
+        def _do_call():
+            # 在工作线程中顺带计算响应大小，避免大响应序列化阻塞事件循环
+            nonlocal response_bytes, wwise_elapsed
+            thread_start = time.perf_counter_ns()
+            res = self._client.call(uri, payload)
+            thread_end = time.perf_counter_ns()
+            wwise_elapsed = (thread_end - thread_start) / 1e9
+            if trace:
+                _record_thread_hop(span, submitted, thread_start, thread_end)
+            if measure_sizes and res is not None:
+                response_bytes = _json_size(res)
+            return res
+
+        try:
+            for attempt in range(2):  # 最多尝试 2 次（1 次重试）
+                try:
+                    queued = time.perf_counter_ns() if trace else 0
+                    # 写请求先经 AIMD 节流再申请调度槽位，排队中的写不占用调度器并发
+                    async with (pacer.slot() if is_write else nullcontext()):
+                        async with scheduler.slot():
+                            submitted = time.perf_counter_ns() if trace else 0
+                            if trace:
+                                tracer.add_complete("scheduler_wait", "waapi", queued,
+                                                    submitted - queued, span.track)
+                            result = await asyncio.to_thread(_do_call)
+                        if is_write:
+                            pacer.observe(wwise_elapsed)
+                            snapshots.invalidate(uri)
+                    if result is None:
+                        raise WwiseAPIError(
+                            f"WAAPI 调用 '{uri}' 返回 None（参数可能有误，请检查 Wwise 日志）"
+                        )
+                    return result
+                except WwiseAPIError:
+                    raise
+                except asyncio.TimeoutError:
+                    if attempt == 0:
+                        logger.warning("WAAPI 调用 '%s' 超时，正在重试…", uri)
+                        retries += 1
+                        continue
+                    from .exceptions import WwiseTimeoutError
+                    raise WwiseTimeoutError()
+                except Exception as e:
+                    raise WwiseAPIError(f"WAAPI 调用 '{uri}' 异常：{e}")
+        except BaseException:
+            error = True
+            raise
+        finally:
+            metrics.record_call(
+                uri,
+                time.perf_counter() - started,
+                request_bytes=request_bytes,
+                response_bytes=response_bytes,
+                retries=retries,
+                error=error,
+            )
+            span.set(request_bytes=request_bytes, response_bytes=response_bytes, retries=retries)
+
+    async def subscribe(self, topic: str, callback, options: dict | None = None):
+        """
+        订阅 WAAPI 主题，返回 waapi-client 的 EventHandler（可调用 unsubscribe()）。
+        callback 在 waapi-client 的事件线程中以关键字参数调用，需自行切回事件循环。
+        """
+        await self.ensure_connected()
+        try:
+            handler = await asyncio.to_thread(
+                self._client.subscribe, topic, callback, **(options or {})
+            )
+        except Exception as e:
+            raise WwiseAPIError(f"订阅 '{topic}' 失败：{e}")
+        if handler is None:
+            raise WwiseAPIError(f"订阅 '{topic}' 失败")
+        return handler
 
     async def close(self) -> None:
         """断开连接，释放资源。"""
@@ -0,0 +1,184 @@
+"""
+无用内容分析：在一次批量读取的引用图上做线性时间可达性分析
+verify_structure 只能发现没有 Action 的 Event 和 Target 为空的 Action。这里按类别找出可以裁剪的内容：
+
+  - unreachable：任何 Event 的 Action 都到达不了的 Sound / 容器（只报告死子树的根，附子树对象数）
+  - unused_game_parameter：没有被任何 RTPC 绑定（ControlInput）的 Game Parameter
+  - unused_bus：没有对象路由进来（OutputBus / Aux Send）、子 Bus 也都无用的 Bus / Aux Bus（顶层主 Bus 除外）
+  - unused_effect：没有被任何 Effect 插槽引用的 Effect ShareSet
+  - unused_attenuation：没有被任何对象引用的 Attenuation ShareSet
+
+对象上受 Override 开关控制的引用（OutputBus / Aux Send / Attenuation）只有在开关打开或对象位于层级顶层时才算数，
+未覆盖时该值不生效（与 inheritance 的规则一致）。
+
+引用图由 collect_references 用少量 ofType 查询一次读完（不做逐对象查询），
+analyze 对每类做一次前向标记 + 一次沿父链的回溯，均为 O(对象数 + 引用数)。
+只能看到项目内的引用：游戏代码直接 PostEvent 之外的用法（如运行时设置的 Game-Defined Aux Send）不在其中。
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from .adapter import ref_id
+from .inheritance import OVERRIDE_FLAG
+from .media_index import GRAPH_TYPES
+
+if TYPE_CHECKING:
+    from .adapter import WwiseAdapter
+
+CATEGORIES = (
+    "unreachable",
+    "unused_game_parameter",
+    "unused_bus",
+    "unused_effect",
+    "unused_attenuation",
+)
+
+_AUX_SENDS = ["UserAuxSend0", "UserAuxSend1", "UserAuxSend2", "UserAuxSend3", "ReflectionsAuxSend"]
+_BUS_TYPES = ["Bus", "AuxBus"]
+_BASE = ["id", "name", "type", "path"]
+
+# 类别 → 需要读取的对象组
+_REQUIRES = {
+    "unreachable": ("nodes", "actions"),
+    "unused_game_parameter": ("game_parameters", "rtpcs"),
+    "unused_bus": ("nodes", "buses"),
+    "unused_effect": ("effects", "effect_slots"),
+    "unused_attenuation": ("nodes", "attenuations"),
+}
+
+# 对象组 → (类型, 字段)
+_GROUPS = {
+    "nodes": (GRAPH_TYPES, [
+        *_BASE, "parent", "OutputBus", *_AUX_SENDS, "Attenuation",
+        "OverrideOutput", "OverrideUserAuxSends", "OverrideEarlyReflections", "OverridePositioning",
+    ]),
+    "actions": (["Action"], ["id", "type", "Target"]),
+    "buses": (_BUS_TYPES, [*_BASE, "parent", *_AUX_SENDS]),
+    "game_parameters": (["GameParameter"], _BASE),
+    "rtpcs": (["RTPC"], ["id", "type", "ControlInput"]),
+    "effects": (["Effect"], _BASE),
+    "effect_slots": (["EffectSlot"], ["id", "type", "Effect"]),
+    "attenuations": (["Attenuation"], _BASE),
+}
+
+
+async def collect_references(adapter: "WwiseAdapter", categories: Iterable[str] = CATEGORIES) -> dict[str, list[dict]]:
+    """并发读取分析所需的对象组（每组一个逻辑查询），返回 组名 → 对象列表"""
+    groups = sorted({g for c in categories for g in _REQUIRES[c]})
+    results = await asyncio.gather(*(
+        adapter.query(types=_GROUPS[g][0], fields=_GROUPS[g][1]) for g in groups
+    ))
+    return {g: rows for g, (rows, _) in zip(groups, results)}
+
+
+def _row(category: str, obj: dict, **extra) -> dict:
+    return {"category": category, **{k: obj.get(k) for k in _BASE}, **extra}
+
+
+def _referenced(rows: list[dict], fields: Iterable[str]) -> set[str]:
+    refs = set()
+    for row in rows:
+        for field in fields:
+            ref = ref_id(row.get(field))
+            if ref:
+                refs.add(ref)
+    return refs
+
+
+def _effective_refs(nodes: list[dict], fields: Iterable[str]) -> set[str]:
+    """
+    只统计实际生效的引用：受 Override 开关控制的字段，仅在对象打开开关
+    或位于层级顶层（父节点不在 nodes 中，即 Work Unit / Folder）时才使用自身的值
+    """
+    ids = {n["id"] for n in nodes}
+    refs = set()
+    for node in nodes:
+        top = ref_id(node.get("parent")) not in ids
+        for field in fields:
+            flag = OVERRIDE_FLAG.get(field)
+            if flag and not top and not node.get(flag):
+                continue
+            ref = ref_id(node.get(field))
+            if ref:
+                refs.add(ref)
+    return refs
+
+
+def _unreachable(nodes: list[dict], actions: list[dict]) -> list[dict]:
+    by_id = {n["id"]: n for n in nodes}
+    parent: dict[str, Optional[str]] = {}
+    children: dict[str, list[str]] = {}
+    for node in nodes:
+        p = ref_id(node.get("parent"))
+        parent[node["id"]] = p if p in by_id else None
+        if p in by_id:
+            children.setdefault(p, []).append(node["id"])
+
+    # 前向：Action Target 及其全部后代可达
+    live: set[str] = set()
+    stack = [t for t in _referenced(actions, ["Target"]) if t in by_id]
+    while stack:
+        node = stack.pop()
+        if node not in live:
+            live.add(node)
+            stack.extend(children.get(node, ()))
+    # 回溯：可达对象的祖先容器同样有用（每个祖先只访问一次）
+    for node in list(live):
+        p = parent[node]
+        while p is not None and p not in live:
+            live.add(p)
+            p = parent[p]
+
+    result = []
+    for node in nodes:
+        obj_id = node["id"]
+        if obj_id in live or (parent[obj_id] is not None and parent[obj_id] not in live):
+            continue
+        # 死子树的根：统计子树对象数
+        size, stack = 0, [obj_id]
+        while stack:
+            size += 1
+            stack.extend(children.get(stack.pop(), ()))
+        result.append(_row("unreachable", node, subtree_objects=size))
+    return result
+
+
+def _unused_buses(nodes: list[dict], buses: list[dict]) -> list[dict]:
+    by_id = {b["id"]: b for b in buses}
+    parent = {b["id"]: ref_id(b.get("parent")) for b in buses}
+    fed = _effective_refs(nodes, ["OutputBus", *_AUX_SENDS]) | _referenced(buses, _AUX_SENDS)
+
+    # 有输入的 Bus 及其上游（父 Bus）都有用
+    live: set[str] = set()
+    for bus_id in fed:
+        while bus_id in by_id and bus_id not in live:
+            live.add(bus_id)
+            bus_id = parent[bus_id]
+    return [
+        _row("unused_bus", bus) for bus in buses
+        if bus["id"] not in live and parent[bus["id"]] in by_id
+    ]
+
+
+def analyze(references: dict[str, list[dict]], categories: Iterable[str] = CATEGORIES) -> list[dict]:
+    """对各类别做可达性分析，返回无用对象行（含 category）"""
+    result: list[dict] = []
+    for category in categories:
+        if category == "unreachable":
+            result += _unreachable(references["nodes"], references["actions"])
+        elif category == "unused_game_parameter":
+            bound = _referenced(references["rtpcs"], ["ControlInput"])
+            result += [_row(category, gp) for gp in references["game_parameters"] if gp["id"] not in bound]
+        elif category == "unused_bus":
+            result += _unused_buses(references["nodes"], references["buses"])
+        elif category == "unused_effect":
+            used = _referenced(references["effect_slots"], ["Effect"])
+            result += [
+                _row(category, fx) for fx in references["effects"]
+                if fx.get("path", "").startswith("\\Effects\\") and fx["id"] not in used
+            ]
+        elif category == "unused_attenuation":
+            used = _effective_refs(references["nodes"], ["Attenuation"])
+            result += [_row(category, att) for att in references["attenuations"] if att["id"] not in used]
+    return result
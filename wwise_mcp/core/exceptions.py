@@ -83,3 +83,13 @@ class WwiseTimeoutError(WwiseMCPError):
             code="timeout",
             suggestion="请确认 Wwise 正在运行且响应正常，可尝试增加 timeout 配置值",
         )
+
+
+class WwiseCursorError(WwiseMCPError):
+    """分页游标无效或对应的结果快照已过期"""
+    def __init__(self, message: str = "分页游标无效或已过期"):
+        super().__init__(
+            message=message,
+            code="invalid_cursor",
+            suggestion="项目已变更或快照已过期，请不带 cursor 重新调用以获取新的结果快照",
+        )
@@ -0,0 +1,182 @@
+"""
+属性继承：沿对象层级计算有效值
+Wwise 中很多属性由祖先继承，只有打开对应 Override 开关的对象才使用自己的值：
+
+  - 覆盖型：OutputBus 受 OverrideOutput 控制、定位受 OverridePositioning 控制、
+    声部限制受 IgnoreParentMaxSoundInstance 控制等。有效值取自最近一个打开开关的对象（含自身）；
+    层级顶层对象（父节点为 Work Unit / Folder）总是使用自己的值
+  - 叠加型：Volume / Pitch / Lowpass 等，有效值为自身与所有可继承祖先之和
+  - 其余属性不继承，有效值即自身值
+
+InheritanceResolver 基于 ObjectStore 的 parent 链计算，每个对象的结果按需计算并记忆化，
+同一次查询中共享的祖先只计算一次。
+resolve_effective 负责从 Wwise 读取目标对象及其全部祖先的相关属性。
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+from ..config import settings
+
+if TYPE_CHECKING:
+    from ..store import ObjectStore
+    from .adapter import WwiseAdapter
+
+# Override 开关 → 受其控制的属性
+OVERRIDE_GROUPS: dict[str, tuple[str, ...]] = {
+    "OverrideOutput": ("OutputBus", "OutputBusVolume", "OutputBusLowpass", "OutputBusHighpass"),
+    "OverridePositioning": (
+        "3DSpatialization", "SpeakerPanning", "ListenerRelativeRouting",
+        "EnableAttenuation", "Attenuation", "3DPosition",
+    ),
+    "OverrideConversion": ("Conversion",),
+    "OverrideGameAuxSends": ("UseGameAuxSends", "GameAuxSendVolume"),
+    "OverrideUserAuxSends": (
+        "UserAuxSend0", "UserAuxSend1", "UserAuxSend2", "UserAuxSend3",
+        "UserAuxSendVolume0", "UserAuxSendVolume1", "UserAuxSendVolume2", "UserAuxSendVolume3",
+    ),
+    "OverrideEarlyReflections": ("ReflectionsAuxSend", "ReflectionsVolume"),
+    "OverridePriority": ("Priority", "PriorityDistanceFactor", "PriorityDistanceOffset"),
+    "OverrideVirtualVoice": ("BelowThresholdBehavior", "VirtualVoiceQueueBehavior"),
+    "IgnoreParentMaxSoundInstance": ("UseMaxSoundPerInstance", "MaxSoundPerInstance", "OverLimitBehavior"),
+}
+OVERRIDE_FLAG = {prop: flag for flag, props in OVERRIDE_GROUPS.items() for prop in props}
+
+# 叠加型属性 → 取值范围（None 表示不限制）
+ADDITIVE: dict[str, Optional[tuple[float, float]]] = {
+    "Volume": None,
+    "Pitch": None,
+    "MakeUpGain": None,
+    "Lowpass": (0, 100),
+    "Highpass": (0, 100),
+}
+
+# 父节点为这些类型（或未加载的占位节点）时不再向上继承
+_BOUNDARY_TYPES = {"", "WorkUnit", "Folder", "PhysicalFolder", "Project"}
+
+
+def required_fields(properties: Iterable[str]) -> list[str]:
+    """计算这些属性的有效值需要读取的字段（属性本身 + Override 开关）"""
+    fields: list[str] = []
+    for prop in properties:
+        for name in (OVERRIDE_FLAG.get(prop), prop):
+            if name and name not in fields:
+                fields.append(name)
+    return fields
+
+
+class InheritanceResolver:
+    """
+    用法：
+        resolver = InheritanceResolver(objects)
+        resolver.set_values(handle, {"OutputBus": ..., "OverrideOutput": True})
+        value, source = resolver.effective(handle, "OutputBus")
+    """
+
+    def __init__(self, objects: "ObjectStore"):
+        self.objects = objects
+        self._own: dict[int, dict[str, Any]] = {}
+        self._cache: dict[str, dict[int, tuple[Any, int]]] = {}   # prop → handle → (值, 来源 handle)
+
+    def set_values(self, handle: int, values: dict[str, Any]) -> None:
+        self._own.setdefault(handle, {}).update(values)
+
+    def _inherits(self, handle: int) -> bool:
+        """handle 是否从父节点继承（父节点存在且不是 Work Unit / Folder 等边界）"""
+        parent = self.objects.parent(handle)
+        return parent >= 0 and self.objects.type(parent) not in _BOUNDARY_TYPES
+
+    def effective(self, handle: int, prop: str) -> tuple[Any, Optional[int]]:
+        """(有效值, 来源 handle)；叠加型属性的来源为 None"""
+        cache = self._cache.setdefault(prop, {})
+        if handle in cache:
+            return cache[handle]
+
+        # 自下而上找到第一个已缓存或不再继承的祖先，再自上而下依次计算（不递归）
+        chain = [handle]
+        while chain[-1] not in cache and self._inherits(chain[-1]):
+            chain.append(self.objects.parent(chain[-1]))
+        inherited = None
+        if chain[-1] in cache:
+            inherited = cache[chain.pop()]
+
+        for h in reversed(chain):
+            inherited = cache[h] = self._combine(h, prop, inherited)
+        return inherited
+
+    def _combine(self, handle: int, prop: str, inherited: Optional[tuple[Any, Optional[int]]]) -> tuple[Any, Optional[int]]:
+        own = self._own.get(handle, {})
+        value = own.get(prop)
+        if prop in ADDITIVE:
+            total = (value or 0) + (inherited[0] if inherited else 0)
+            bounds = ADDITIVE[prop]
+            if bounds:
+                total = min(max(total, bounds[0]), bounds[1])
+            return total, None
+        flag = OVERRIDE_FLAG.get(prop)
+        if flag is None or inherited is None or own.get(flag):
+            return value, handle
+        return inherited
+
+
+_BASE_FIELDS = ["id", "name", "type", "path"]
+
+
+async def _fetch_values(adapter: "WwiseAdapter", rows: list[dict], fields: list[str]) -> dict[str, dict]:
+    """按类型分组、按 id 分块读取 fields（Work Unit / Folder 等边界类型跳过），返回 id → 值"""
+    by_type: dict[str, list[str]] = {}
+    for row in rows:
+        if row.get("id") and row.get("type") not in _BOUNDARY_TYPES:
+            by_type.setdefault(row["type"], []).append(row["id"])
+    size = max(1, settings.read_chunk_size)
+    batches = await asyncio.gather(*(
+        adapter.get_objects(from_spec={"id": ids[i:i + size]}, return_fields=["id", *fields], obj_type=obj_type)
+        for obj_type, ids in by_type.items()
+        for i in range(0, len(ids), size)
+    ))
+    return {row["id"]: row for batch in batches for row in batch if row.get("id")}
+
+
+async def resolve_effective(
+    adapter: "WwiseAdapter",
+    targets: list[dict],
+    properties: list[str],
+) -> tuple["ObjectStore", InheritanceResolver, list[int]]:
+    """
+    读取目标对象（需含 id / type / path）及其全部祖先的相关属性，返回
+    (ObjectStore, 已填充的 InheritanceResolver, 目标对象的 handle 列表)。
+    祖先按路径去重后分块读取，10k 个目标通常只多出几百个祖先。
+    """
+    from ..store import ObjectStore   # store 包会加载 numpy，延迟到首次使用
+
+    fields = required_fields(properties)
+    target_paths = {row["path"] for row in targets if row.get("path")}
+    ancestor_paths: set[str] = set()
+    for path in target_paths:
+        parent = path.rpartition("\\")[0]
+        while parent and parent not in ancestor_paths:
+            ancestor_paths.add(parent)
+            parent = parent.rpartition("\\")[0]
+    ancestor_paths -= target_paths
+
+    paths = sorted(ancestor_paths)
+    size = max(1, settings.read_chunk_size)
+    batches = await asyncio.gather(*(
+        adapter.get_objects(from_spec={"path": paths[i:i + size]}, return_fields=_BASE_FIELDS)
+        for i in range(0, len(paths), size)
+    ))
+    ancestors = [row for batch in batches for row in batch]
+
+    unique = {row["id"]: row for row in ancestors + targets if row.get("id")}
+    rows = sorted(unique.values(), key=lambda row: row.get("path", ""))
+    values = await _fetch_values(adapter, rows, fields)
+
+    objects = ObjectStore()
+    objects.load(rows)
+    resolver = InheritanceResolver(objects)
+    for obj_id, row in values.items():
+        handle = objects.handle(obj_id)
+        if handle is not None:
+            resolver.set_values(handle, {f: row[f] for f in fields if f in row})
+    handles = [objects.handle(row["id"]) for row in targets]
+    return objects, resolver, handles
@@ -0,0 +1,231 @@
+"""
+后台任务（Job）管理
+长耗时工具（全项目 verify_structure、批量修改、大范围搜索）以 Job 形式在后台运行：
+启动后立即返回 job_id，进度/部分结果可增量读取，支持取消。
+
+- 并发上限：settings.job_max_concurrency，超出的 Job 排队（status=queued），
+  避免一个重型审计占满 WAAPI 通道、饿死交互式查询
+- 取消：Task.cancel() 在下一个 await 点（包括进行中的 WAAPI 调用）抛出 CancelledError；
+  工具内部循环通过 checkpoint() 主动检查取消并上报进度
+- 工具代码不感知 Job：不在 Job 中运行时 checkpoint()/report() 为空操作
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional
+
+from ..config import settings
+
+logger = logging.getLogger("wwise_mcp.jobs")
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+_FINISHED = {JOB_DONE, JOB_FAILED, JOB_CANCELLED}
+
+
+class Job:
+    """单个后台任务的状态、进度与结果"""
+
+    def __init__(self, kind: str, params: dict | None = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.params = params or {}
+        self.status = JOB_QUEUED
+        self.progress: float = 0
+        self.total: Optional[float] = None
+        self.message: str = ""
+        self.partial: list = []       # 增量结果，按 offset 读取
+        self.result: Any = None        # 最终结果（工具返回值）
+        self.error: Optional[str | dict] = None   # 异常信息，或工具返回的 error 字典
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.cancel_requested = False
+        self._task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+        self.version = 0               # 每次进度/状态变化自增，供等待方判断是否有新进度
+
+    @property
+    def done(self) -> bool:
+        return self.status in _FINISHED
+
+    def _touch(self) -> None:
+        self.version += 1
+        self._changed.set()
+
+    async def wait_changed(self, timeout: float) -> bool:
+        """等待下一次进度/状态变化，超时返回 False"""
+        self._changed.clear()
+        if self.done:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def to_dict(self, offset: int = 0, limit: int = 100) -> dict:
+        end = offset + limit
+        data = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "total": self.total,
+            "message": self.message,
+            "elapsed_s": round((self.finished or time.time()) - (self.started or self.created), 3),
+            "partial": {
+                "offset": offset,
+                "items": self.partial[offset:end],
+                "next_offset": min(end, len(self.partial)),
+                "available": len(self.partial),
+            },
+        }
+        if self.done:
+            data["result"] = self.result
+            data["error"] = self.error
+        return data
+
+
+# 当前运行中的 Job（工具代码通过 checkpoint/report 访问）
+current_job: ContextVar[Optional[Job]] = ContextVar("wwise_mcp_current_job", default=None)
+
+
+class JobCancelledError(asyncio.CancelledError):
+    """Job 被请求取消（checkpoint 检测到）"""
+
+
+def report(
+    done: float | None = None,
+    total: float | None = None,
+    message: str | None = None,
+    partial: list | None = None,
+) -> None:
+    """上报进度 / 追加部分结果（不在 Job 中运行时为空操作）"""
+    job = current_job.get()
+    if job is None:
+        return
+    if done is not None:
+        job.progress = done
+    if total is not None:
+        job.total = total
+    if message is not None:
+        job.message = message
+    if partial:
+        job.partial.extend(partial)
+    job._touch()
+
+
+async def checkpoint(
+    done: float | None = None,
+    total: float | None = None,
+    message: str | None = None,
+    partial: list | None = None,
+) -> None:
+    """
+    长循环中的检查点：上报进度，若 Job 已被请求取消则抛出 JobCancelledError，
+    并让出事件循环，使交互式请求不会被 CPU 密集循环长时间阻塞。
+    """
+    job = current_job.get()
+    if job is None:
+        return
+    if job.cancel_requested:
+        raise JobCancelledError()
+    report(done, total, message, partial)
+    await asyncio.sleep(0)
+
+
+class JobManager:
+    """
+    用法：
+        job = job_manager.start("verify_structure", lambda: verify_structure(scope))
+        job_manager.get(job.id).to_dict()
+        job_manager.cancel(job.id)
+    """
+
+    def __init__(self, max_concurrency: int | None = None, history: int | None = None):
+        self._max_concurrency = max_concurrency or settings.job_max_concurrency
+        self._history = history or settings.job_history
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._jobs: dict[str, Job] = {}
+
+    def _sem(self) -> asyncio.Semaphore:
+        # 延迟创建，确保绑定到运行中的事件循环
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._semaphore
+
+    def start(
+        self,
+        kind: str,
+        factory: Callable[[], Awaitable[Any]],
+        params: dict | None = None,
+    ) -> Job:
+        """创建并调度一个 Job，立即返回（需在事件循环中调用）"""
+        self._prune()
+        job = Job(kind, params)
+        self._jobs[job.id] = job
+        job._task = asyncio.get_running_loop().create_task(self._run(job, factory))
+        return job
+
+    async def _run(self, job: Job, factory: Callable[[], Awaitable[Any]]) -> None:
+        current_job.set(job)
+        try:
+            async with self._sem():
+                if job.cancel_requested:
+                    raise JobCancelledError()
+                job.status = JOB_RUNNING
+                job.started = time.time()
+                job._touch()
+                job.result = await factory()
+                # 工具自行捕获异常并返回 {"success": False, "error": ...}，同样视为失败
+                if isinstance(job.result, dict) and job.result.get("success") is False:
+                    job.status = JOB_FAILED
+                    job.error = job.result.get("error")
+                else:
+                    job.status = JOB_DONE
+        except asyncio.CancelledError:
+            job.status = JOB_CANCELLED
+        except Exception as e:
+            logger.exception("Job %s (%s) 失败", job.id, job.kind)
+            job.status = JOB_FAILED
+            job.error = str(e)
+        finally:
+            job.finished = time.time()
+            job._touch()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> list[Job]:
+        return sorted(self._jobs.values(), key=lambda j: j.created, reverse=True)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """请求取消：置位标志（供 checkpoint 检测）并取消底层 Task"""
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return job
+        job.cancel_requested = True
+        if job._task is not None:
+            job._task.cancel()
+        return job
+
+    def _prune(self) -> None:
+        """只保留最近 settings.job_history 个已结束的 Job"""
+        finished = [j for j in self._jobs.values() if j.done]
+        if len(finished) <= self._history:
+            return
+        finished.sort(key=lambda j: j.finished or 0)
+        for job in finished[: len(finished) - self._history]:
+            self._jobs.pop(job.id, None)
+
+
+# 全局单例
+job_manager = JobManager()
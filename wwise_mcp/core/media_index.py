@@ -0,0 +1,438 @@
+"""
+Event → 媒体闭包索引
+回答"这个 Event 能播放哪些音频文件"原本需要对每个 Action Target 逐个读取后代，事件之间不复用。
+MediaIndex 把项目的播放图一次性读入内存：
+
+    Event ─children→ Action(Play) ─Target→ 容器 / Sound ─children→ … → AudioFileSource
+
+  - 节点闭包（可达的 AudioFileSource 集合）按需计算并记忆化，被多个 Event 共享的容器只展开一次
+  - 反向表 source → Event、文件路径 → source，"哪些 Event 用到这个 wav" 为 O(结果数)
+  - 增量更新：订阅对象增删、移动、改名与 Target 引用变化通知，记录涉及的对象 id；
+    下次查询时只重新读取这些对象及其子节点，让其祖先与引用它们的 Event 的闭包失效后重算。
+    项目加载 / 关闭、连接重建或积压的变更过多（settings.media_index_max_dirty）时整体重建
+
+只有 Play 类型的 Action 计入闭包（Stop / Pause 等同样引用 Target，但不播放媒体）。
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from ..config import settings
+from .adapter import ref_id
+from .exceptions import WwiseMCPError
+from .metrics import metrics
+from .snapshot import PROJECT_CHANGE_TOPICS
+
+if TYPE_CHECKING:
+    from .adapter import WwiseAdapter
+    from .connection import WwiseConnection
+
+logger = logging.getLogger("wwise_mcp.media_index")
+
+# 可能出现在 Action Target 之下的层级对象类型
+GRAPH_TYPES = [
+    "ActorMixer", "RandomSequenceContainer", "SwitchContainer", "BlendContainer", "BlendTrack", "Sound",
+    "MusicSwitchContainer", "MusicPlaylistContainer", "MusicSegment", "MusicTrack",
+]
+SOURCE_TYPE = "AudioFileSource"
+# AudioFileSource 的原始文件路径
+MEDIA_FILE_FIELD = "originalFilePath"
+PLAY_ACTION = 1
+
+_RESET_TOPICS = {"ak.wwise.core.project.loaded", "ak.wwise.core.project.preClosed"}
+_RENAME_TOPIC = "ak.wwise.core.object.nameChanged"
+_TARGET_TOPIC = "ak.wwise.core.object.propertyChanged"
+
+
+def normalize_file(path: str) -> str:
+    """文件路径规范化（不区分大小写，统一为 \\ 分隔；与运行平台无关，WAAPI 返回 Windows 路径），用作反查键"""
+    return path.replace("/", "\\").lower()
+
+
+def _file_name(key: str) -> str:
+    return key.rpartition("\\")[2]
+
+
+class MediaIndex:
+    """
+    用法：
+        await media_index.ensure(adapter)
+        media_index.event_media(event_id)          # → frozenset[source id]
+        media_index.events_using_file("X.wav")     # → set[event id]
+    """
+
+    def __init__(self):
+        self._types: dict[str, str] = {}
+        self._parent: dict[str, str] = {}
+        self._children: dict[str, set[str]] = {}
+        self._targets: dict[str, str] = {}              # Play Action → Target
+        self._referrers: dict[str, set[str]] = {}       # Target → Play Action
+        self._paths: dict[str, str] = {}                # Event / AudioFileSource 的路径
+        self._files: dict[str, str] = {}                # source → 原始文件
+        self._by_file: dict[str, set[str]] = {}         # 规范化文件路径 → source
+        self._by_name: dict[str, set[str]] = {}         # 规范化文件名 → source
+        self._event_paths: dict[str, str] = {}          # Event 路径 → id
+        self._closure: dict[str, frozenset[str]] = {}   # 节点 → 可达 source（记忆化）
+        self._event_media: dict[str, frozenset[str]] = {}
+        self._users: dict[str, set[str]] = {}           # source → Event
+
+        self._built = False
+        self._dirty: set[str] = set()
+        self._renamed = False
+        self._stale = True
+        self._generation = -1
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = asyncio.Lock()
+        self._builds = 0
+        self._refreshes = 0
+        self._expanded = 0
+
+    # ------------------------------------------------------------------
+    # 变更跟踪
+    # ------------------------------------------------------------------
+
+    async def _watch(self, conn: "WwiseConnection") -> None:
+        self._generation = conn.generation
+        self._loop = asyncio.get_running_loop()
+        subscriptions = [(topic, None) for topic in PROJECT_CHANGE_TOPICS]
+        subscriptions.append((_TARGET_TOPIC, {"property": "Target"}))
+        for topic, options in subscriptions:
+            try:
+                await conn.subscribe(topic, self._handler(topic), options)
+            except WwiseMCPError as e:
+                logger.warning("订阅 %s 失败，媒体索引只在重连 / 项目重新加载时重建：%s", topic, e)
+
+    def _handler(self, topic: str):
+        def on_change(*args, **kwargs) -> None:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._on_change, topic, kwargs)
+        return on_change
+
+    def _on_change(self, topic: str, payload: dict) -> None:
+        if topic in _RESET_TOPICS:
+            self._stale = True
+            return
+        self._renamed |= topic == _RENAME_TOPIC
+        for value in payload.values():
+            obj_id = ref_id(value)
+            if obj_id:
+                self._dirty.add(obj_id)
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    async def ensure(self, adapter: "WwiseAdapter") -> None:
+        """保证索引反映项目当前状态：首次 / 失效时整体构建，否则增量应用积压的变更"""
+        async with self._lock:
+            if adapter.connection.generation != self._generation:
+                await self._watch(adapter.connection)
+                self._stale = True
+            if self._stale or len(self._dirty) > settings.media_index_max_dirty:
+                self._dirty.clear()
+                self._stale = self._renamed = False
+                await self._build(adapter)
+            elif self._dirty:
+                dirty, self._dirty = self._dirty, set()
+                renamed, self._renamed = self._renamed, False
+                await self._refresh(adapter, dirty)
+                if renamed:
+                    await self._reload_paths(adapter)
+
+    # ------------------------------------------------------------------
+    # 构建
+    # ------------------------------------------------------------------
+
+    def _clear(self) -> None:
+        for table in (self._types, self._parent, self._children, self._targets, self._referrers,
+                      self._paths, self._files, self._by_file, self._by_name, self._event_paths,
+                      self._closure, self._event_media, self._users):
+            table.clear()
+
+    async def _build(self, adapter: "WwiseAdapter") -> None:
+        (events, _), (actions, _), (nodes, _), (sources, _) = await asyncio.gather(
+            adapter.query(types=["Event"], fields=["id", "type", "path"]),
+            adapter.query(types=["Action"], fields=["id", "type", "parent", "ActionType", "Target"]),
+            adapter.query(types=GRAPH_TYPES, fields=["id", "type", "parent"]),
+            adapter.query(types=[SOURCE_TYPE], fields=["id", "type", "parent", "path", MEDIA_FILE_FIELD]),
+        )
+        self._clear()
+        for row in events + actions + nodes + sources:
+            self._apply(row)
+        for event_id in list(self._event_paths.values()):
+            self._update_event(event_id)
+        self._built = True
+        self._builds += 1
+        logger.info("媒体索引构建完成：%d 个 Event，%d 个 AudioFileSource，%d 个节点展开",
+                    len(self._event_paths), len(self._files), self._expanded)
+
+    def _apply(self, row: dict) -> None:
+        """写入单个对象（新增或更新）"""
+        obj_id, obj_type = row["id"], row.get("type", "")
+        self._types[obj_id] = obj_type
+        parent = ref_id(row.get("parent"))
+        old_parent = self._parent.get(obj_id)
+        if old_parent != parent:
+            if old_parent:
+                self._children.get(old_parent, set()).discard(obj_id)
+            if parent:
+                self._parent[obj_id] = parent
+                self._children.setdefault(parent, set()).add(obj_id)
+            else:
+                self._parent.pop(obj_id, None)
+
+        if obj_type == "Event":
+            old_path = self._paths.get(obj_id)
+            if old_path and self._event_paths.get(old_path) == obj_id:
+                del self._event_paths[old_path]
+            self._paths[obj_id] = row["path"]
+            self._event_paths[row["path"]] = obj_id
+        elif obj_type == "Action":
+            self._unlink_target(obj_id)
+            target = ref_id(row.get("Target"))
+            if target and row.get("ActionType", PLAY_ACTION) == PLAY_ACTION:
+                self._targets[obj_id] = target
+                self._referrers.setdefault(target, set()).add(obj_id)
+        elif obj_type == SOURCE_TYPE:
+            self._paths[obj_id] = row.get("path", "")
+            self._unlink_file(obj_id)
+            media = row.get(MEDIA_FILE_FIELD)
+            if media:
+                self._files[obj_id] = media
+                key = normalize_file(media)
+                self._by_file.setdefault(key, set()).add(obj_id)
+                self._by_name.setdefault(_file_name(key), set()).add(obj_id)
+
+    def _unlink_target(self, action_id: str) -> None:
+        target = self._targets.pop(action_id, None)
+        if target:
+            self._referrers.get(target, set()).discard(action_id)
+
+    def _unlink_file(self, source_id: str) -> None:
+        media = self._files.pop(source_id, None)
+        if media:
+            key = normalize_file(media)
+            self._by_file.get(key, set()).discard(source_id)
+            self._by_name.get(_file_name(key), set()).discard(source_id)
+
+    def _remove(self, obj_id: str) -> None:
+        """删除对象及其整个子树（preDeleted 只通知子树根）"""
+        parent = self._parent.get(obj_id)
+        if parent:
+            self._children.get(parent, set()).discard(obj_id)
+        stack = [obj_id]
+        while stack:
+            node = stack.pop()
+            stack.extend(self._children.pop(node, ()))
+            self._parent.pop(node, None)
+            self._unlink_target(node)
+            self._unlink_file(node)
+            self._types.pop(node, None)
+            self._closure.pop(node, None)
+            path = self._paths.pop(node, None)
+            if path and self._event_paths.get(path) == node:
+                del self._event_paths[path]
+
+    # ------------------------------------------------------------------
+    # 增量更新
+    # ------------------------------------------------------------------
+
+    async def _refresh(self, adapter: "WwiseAdapter", dirty: set[str]) -> None:
+        ids = sorted(dirty)
+        size = max(1, settings.read_chunk_size)
+        chunks = [ids[i:i + size] for i in range(0, len(ids), size)]
+        base = ["id", "type", "parent", "path"]
+        batches = await asyncio.gather(*(
+            adapter.get_objects(from_spec={"id": chunk}, return_fields=base) for chunk in chunks
+        ), *(
+            adapter.get_objects(from_spec={"id": chunk}, return_fields=base, transform=[{"select": ["children"]}])
+            for chunk in chunks
+        ))
+        rows = {row["id"]: row for batch in batches for row in batch if row.get("id")}
+        tracked = {"Event", "Action", SOURCE_TYPE, *GRAPH_TYPES}
+        rows = {k: v for k, v in rows.items() if v.get("type") in tracked}
+
+        # 类型专属字段（Target / 文件路径）按类型补读
+        by_type: dict[str, list[str]] = {}
+        for row in rows.values():
+            by_type.setdefault(row["type"], []).append(row["id"])
+        extra = {"Action": ["ActionType", "Target"], SOURCE_TYPE: [MEDIA_FILE_FIELD]}
+        batches = await asyncio.gather(*(
+            adapter.get_objects(from_spec={"id": by_type[t][i:i + size]}, return_fields=["id", *fields], obj_type=t)
+            for t, fields in extra.items() if t in by_type
+            for i in range(0, len(by_type[t]), size)
+        ))
+        for batch in batches:
+            for row in batch:
+                rows[row["id"]].update(row)
+
+        # 受影响的节点：变更前后的父节点链都要失效
+        touched = set(dirty) | set(rows)
+        touched |= {self._parent[i] for i in touched if i in self._parent}
+        removed = [i for i in dirty if i in self._types and i not in rows]
+        for obj_id in removed:
+            self._remove(obj_id)
+        for row in rows.values():
+            self._apply(row)
+        touched |= {self._parent[i] for i in rows if i in self._parent}
+
+        # 子节点列表以重新读取的结果为准（childRemoved 后父节点仍在 dirty 中）
+        for obj_id in dirty:
+            if obj_id in rows:
+                current = {c for c, row in rows.items() if ref_id(row.get("parent")) == obj_id}
+                for child in self._children.get(obj_id, set()) - current:
+                    if child not in rows:
+                        self._remove(child)
+
+        events = self._invalidate(touched)
+        for event_id in events:
+            if event_id in self._types:
+                self._update_event(event_id)
+            else:
+                self._drop_event(event_id)
+        self._refreshes += 1
+
+    async def _reload_paths(self, adapter: "WwiseAdapter") -> None:
+        """改名会改变其下所有 Event / source 的路径，重新读取路径（只取通用字段）"""
+        (events, _), (sources, _) = await asyncio.gather(
+            adapter.query(types=["Event"], fields=["id", "path"]),
+            adapter.query(types=[SOURCE_TYPE], fields=["id", "path"]),
+        )
+        self._event_paths.clear()
+        for row in events + sources:
+            if row.get("id") in self._types:
+                self._paths[row["id"]] = row["path"]
+        for row in events:
+            if row.get("id") in self._types:
+                self._event_paths[row["path"]] = row["id"]
+
+    def _invalidate(self, nodes: Iterable[str]) -> set[str]:
+        """让节点及其祖先的闭包失效，返回需要重算的 Event"""
+        events: set[str] = set()
+        stack = list(nodes)
+        seen: set[str] = set()
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            self._closure.pop(node, None)
+            if node in self._event_media:
+                events.add(node)
+            if self._types.get(node) == "Event":
+                events.add(node)
+            parent = self._parent.get(node)
+            if parent:
+                stack.append(parent)
+            for action in self._referrers.get(node, ()):
+                stack.append(action)
+        return events
+
+    # ------------------------------------------------------------------
+    # 闭包
+    # ------------------------------------------------------------------
+
+    def _node_closure(self, node: str) -> frozenset[str]:
+        """节点可达的 AudioFileSource（后序遍历，不递归；结果记忆化）"""
+        memo = self._closure
+        if node in memo:
+            return memo[node]
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if current in memo:
+                continue
+            children = self._children.get(current, ())
+            if expanded:
+                own = (current,) if self._types.get(current) == SOURCE_TYPE else ()
+                memo[current] = frozenset(own).union(*(memo[c] for c in children))
+                self._expanded += 1
+            else:
+                stack.append((current, True))
+                stack.extend((c, False) for c in children if c not in memo)
+        return memo[node]
+
+    def _update_event(self, event_id: str) -> None:
+        media = frozenset().union(*(
+            self._node_closure(self._targets[action])
+            for action in self._children.get(event_id, ()) if action in self._targets
+        ))
+        old = self._event_media.get(event_id, frozenset())
+        for source in old - media:
+            self._users.get(source, set()).discard(event_id)
+        for source in media - old:
+            self._users.setdefault(source, set()).add(event_id)
+        self._event_media[event_id] = media
+
+    def _drop_event(self, event_id: str) -> None:
+        for source in self._event_media.pop(event_id, frozenset()):
+            self._users.get(source, set()).discard(event_id)
+
+    # ------------------------------------------------------------------
+    # 查询（均为 O(结果数)）
+    # ------------------------------------------------------------------
+
+    def event_id(self, event: str) -> Optional[str]:
+        """Event 路径或 id → id"""
+        if event.startswith("{"):
+            return event if self._types.get(event) == "Event" else None
+        return self._event_paths.get(event)
+
+    def events(self) -> list[str]:
+        return list(self._event_media)
+
+    def sources(self) -> list[str]:
+        return [obj_id for obj_id, obj_type in self._types.items() if obj_type == SOURCE_TYPE]
+
+    def type(self, obj_id: str) -> Optional[str]:
+        return self._types.get(obj_id)
+
+    def parent(self, obj_id: str) -> Optional[str]:
+        return self._parent.get(obj_id)
+
+    def event_media(self, event_id: str) -> frozenset[str]:
+        return self._event_media.get(event_id, frozenset())
+
+    def node_media(self, node_id: str) -> frozenset[str]:
+        """任意层级对象可达的 AudioFileSource"""
+        return self._node_closure(node_id) if node_id in self._types else frozenset()
+
+    def events_using(self, source_id: str) -> set[str]:
+        return set(self._users.get(source_id, ()))
+
+    def sources_for_file(self, path: str, exact: bool = False) -> set[str]:
+        """文件（完整路径，或 exact=False 时也可只给文件名）→ 引用它的 AudioFileSource"""
+        key = normalize_file(path)
+        if key in self._by_file or exact:
+            return set(self._by_file.get(key, ()))
+        return set(self._by_name.get(_file_name(key), ()))
+
+    def events_using_file(self, path: str) -> set[str]:
+        events: set[str] = set()
+        for source in self.sources_for_file(path):
+            events |= self._users.get(source, set())
+        return events
+
+    def path(self, obj_id: str) -> Optional[str]:
+        return self._paths.get(obj_id)
+
+    def file(self, source_id: str) -> Optional[str]:
+        return self._files.get(source_id)
+
+    def stats(self) -> dict:
+        return {
+            "built": self._built,
+            "events": len(self._event_paths),
+            "nodes": len(self._types),
+            "sources": len(self._files),
+            "memoized": len(self._closure),
+            "pending_changes": len(self._dirty),
+            "builds": self._builds,
+            "refreshes": self._refreshes,
+            "expanded": self._expanded,
+        }
+
+
+# 全局单例
+media_index = MediaIndex()
+metrics.register_gauge("media_index", media_index.stats)
@@ -0,0 +1,201 @@
+"""
+WAAPI 调用指标采集
+按 URI 与按工具两个维度记录调用次数、延迟分布（p50/p95/p99）、请求/响应字节数、重试与错误。
+采样数据保存在固定长度的环形缓冲区（deque maxlen）中，记录开销为 O(1)，
+百分位只在读取快照时计算。
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+from ..config import settings
+
+logger = logging.getLogger("wwise_mcp.metrics")
+
+# 当前正在执行的 MCP 工具名，由 server.py 的工具装饰器设置；
+# asyncio.to_thread 会复制 context，因此工作线程中同样可读
+current_tool: ContextVar[Optional[str]] = ContextVar("wwise_mcp_current_tool", default=None)
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """最近秩法百分位（输入需已排序）"""
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+class _Series:
+    """单个维度（某个 URI 或某个工具）的累计计数 + 延迟/字节环形缓冲区"""
+
+    __slots__ = (
+        "count", "errors", "retries",
+        "request_bytes", "response_bytes",
+        "latencies", "request_sizes", "response_sizes",
+    )
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.latencies: deque = deque(maxlen=window)
+        self.request_sizes: deque = deque(maxlen=window)
+        self.response_sizes: deque = deque(maxlen=window)
+
+    def record(
+        self,
+        latency: float,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+        retries: int = 0,
+        error: bool = False,
+    ) -> None:
+        self.count += 1
+        self.retries += retries
+        if error:
+            self.errors += 1
+        self.latencies.append(latency)
+        if request_bytes:
+            self.request_bytes += request_bytes
+            self.request_sizes.append(request_bytes)
+        if response_bytes:
+            self.response_bytes += response_bytes
+            self.response_sizes.append(response_bytes)
+
+    def snapshot(self) -> dict:
+        lat = sorted(self.latencies)
+        resp = sorted(self.response_sizes)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "latency_ms": {
+                "p50": round(_percentile(lat, 50) * 1000, 2),
+                "p95": round(_percentile(lat, 95) * 1000, 2),
+                "p99": round(_percentile(lat, 99) * 1000, 2),
+                "max": round(lat[-1] * 1000, 2) if lat else 0.0,
+                "samples": len(lat),
+            },
+            "request_bytes_total": self.request_bytes,
+            "response_bytes_total": self.response_bytes,
+            "response_bytes_p95": _percentile(resp, 95),
+        }
+
+
+class WwiseMetrics:
+    """
+    全局指标注册表。
+
+    - record_call():  WwiseConnection.call 每次 WAAPI 调用结束时记录（按 URI + 按当前工具）
+    - record_tool():  server.py 工具装饰器在每次工具调用结束时记录（端到端耗时）
+    - snapshot():     供 wwise://metrics 资源读取
+    """
+
+    def __init__(self, window: int | None = None):
+        self._window = window or settings.metrics_window
+        self._started = time.time()
+        self._by_uri: dict[str, _Series] = {}
+        self._by_tool: dict[str, _Series] = {}
+        self._tool_calls: dict[str, _Series] = {}   # 每个工具触发的 WAAPI 调用汇总
+        self._gauges: dict[str, Callable[[], Any]] = {}
+        self._log_task: Optional[asyncio.Task] = None
+
+    def register_gauge(self, name: str, fn: Callable[[], Any]) -> None:
+        """登记一个即时状态源（调度器队列、写入速率等），snapshot 时调用 fn() 取值"""
+        self._gauges[name] = fn
+
+    def _series(self, table: dict[str, _Series], key: str) -> _Series:
+        series = table.get(key)
+        if series is None:
+            series = table[key] = _Series(self._window)
+        return series
+
+    def record_call(
+        self,
+        uri: str,
+        latency: float,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+        retries: int = 0,
+        error: bool = False,
+    ) -> None:
+        self._series(self._by_uri, uri).record(
+            latency, request_bytes, response_bytes, retries, error
+        )
+        tool = current_tool.get()
+        if tool:
+            self._series(self._tool_calls, tool).record(
+                latency, request_bytes, response_bytes, retries, error
+            )
+
+    def record_tool(self, tool: str, latency: float, error: bool = False) -> None:
+        self._series(self._by_tool, tool).record(latency, error=error)
+
+    def reset(self) -> None:
+        self._by_uri.clear()
+        self._by_tool.clear()
+        self._tool_calls.clear()
+        self._started = time.time()
+
+    def snapshot(self) -> dict:
+        tools: dict[str, Any] = {}
+        for name, series in self._by_tool.items():
+            entry = series.snapshot()
+            waapi = self._tool_calls.get(name)
+            if waapi is not None:
+                entry["waapi"] = {
+                    "calls": waapi.count,
+                    "errors": waapi.errors,
+                    "retries": waapi.retries,
+                    "request_bytes_total": waapi.request_bytes,
+                    "response_bytes_total": waapi.response_bytes,
+                }
+            tools[name] = entry
+        return {
+            "uptime_s": round(time.time() - self._started, 1),
+            "window": self._window,
+            "uris": {uri: s.snapshot() for uri, s in self._by_uri.items()},
+            "tools": tools,
+            "gauges": {name: fn() for name, fn in self._gauges.items()},
+        }
+
+    def summary_line(self) -> str:
+        """单行摘要：总调用数 + 按累计耗时排序的 Top 3 URI"""
+        total = sum(s.count for s in self._by_uri.values())
+        errors = sum(s.errors for s in self._by_uri.values())
+        top = sorted(
+            self._by_uri.items(),
+            key=lambda kv: sum(kv[1].latencies),
+            reverse=True,
+        )[:3]
+        parts = [
+            f"{uri} n={s.count} p95={_percentile(sorted(s.latencies), 95) * 1000:.1f}ms"
+            for uri, s in top
+        ]
+        return f"WAAPI calls={total} errors={errors} | " + "; ".join(parts)
+
+    # ------------------------------------------------------------------
+    # 周期性日志（settings.metrics_log_interval > 0 时启用）
+    # ------------------------------------------------------------------
+
+    def start_periodic_log(self, interval: float | None = None) -> None:
+        interval = settings.metrics_log_interval if interval is None else interval
+        if interval <= 0 or (self._log_task and not self._log_task.done()):
+            return
+        self._log_task = asyncio.get_running_loop().create_task(self._log_loop(interval))
+
+    async def _log_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            if self._by_uri:
+                logger.info(self.summary_line())
+
+
+# 全局单例
+metrics = WwiseMetrics()
@@ -0,0 +1,152 @@
+"""
+写入节流（AIMD）
+批量修改（object.set / setProperty 循环等）全速打到 Wwise 时，Authoring UI 会明显卡顿。
+WritePacer 以 Wwise 对写请求的响应延迟作为拥塞信号，像 TCP 拥塞控制一样调节：
+
+  - 在途写请求上限（inflight_limit）
+  - 批量写入的单批对象数（batch_size，供 object.set / audio.import 分块使用）
+
+延迟低于 settings.write_target_latency 时加性增长（每个窗口 +1 在途、+batch_step 批量），
+超过目标时乘性减半；同一个延迟窗口内最多减半一次，避免减速前已发出的请求重复触发。
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Iterator, Sequence
+
+from ..config import settings
+from .metrics import metrics
+
+# 会修改项目数据、需要节流的 WAAPI URI
+WRITE_URIS = frozenset({
+    "ak.wwise.core.object.set",
+    "ak.wwise.core.object.setProperty",
+    "ak.wwise.core.object.setReference",
+    "ak.wwise.core.object.setName",
+    "ak.wwise.core.object.setNotes",
+    "ak.wwise.core.object.create",
+    "ak.wwise.core.object.delete",
+    "ak.wwise.core.object.move",
+    "ak.wwise.core.object.copy",
+    "ak.wwise.core.audio.import",
+})
+
+
+class WritePacer:
+    """
+    用法：
+        async with pacer.slot():
+            started = time.perf_counter()
+            ...                                # 执行一次写调用
+            pacer.observe(time.perf_counter() - started)
+
+        for chunk in pacer.iter_batches(items):  # 批量写入按当前 batch_size 分块
+            ...
+    """
+
+    def __init__(
+        self,
+        target_latency: float | None = None,
+        max_inflight: int | None = None,
+        min_batch: int | None = None,
+        max_batch: int | None = None,
+    ):
+        self.target_latency = target_latency or settings.write_target_latency
+        self.max_inflight = max_inflight or settings.write_max_inflight
+        self.min_batch = min_batch or settings.write_min_batch
+        self.max_batch = max_batch or settings.write_max_batch
+        self.batch_step = max(1, self.min_batch)
+        self.inflight_limit: float = 1.0
+        self.batch: float = float(self.min_batch)
+        self._inflight = 0
+        self._cond: asyncio.Condition | None = None
+        self._last_decrease = 0.0
+        self._ewma: float | None = None
+        self._writes = 0
+        self._decreases = 0
+        self._window_start = time.monotonic()
+        self._window_writes = 0
+        self._rate = 0.0
+
+    @property
+    def batch_size(self) -> int:
+        return int(self.batch)
+
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    # ------------------------------------------------------------------
+    # 在途限制
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(self):
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self._inflight < max(1, int(self.inflight_limit)))
+            self._inflight += 1
+        try:
+            yield
+        finally:
+            async with cond:
+                self._inflight -= 1
+                cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # AIMD 控制
+    # ------------------------------------------------------------------
+
+    def observe(self, latency: float) -> None:
+        """记录一次写请求的 Wwise 响应延迟并调整在途上限与批量大小"""
+        self._writes += 1
+        self._window_writes += 1
+        self._ewma = latency if self._ewma is None else 0.8 * self._ewma + 0.2 * latency
+        now = time.monotonic()
+
+        if latency > self.target_latency:
+            # 乘性减：一个目标延迟窗口内只减一次
+            if now - self._last_decrease >= self.target_latency:
+                self.inflight_limit = max(1.0, self.inflight_limit / 2)
+                self.batch = max(float(self.min_batch), self.batch / 2)
+                self._last_decrease = now
+                self._decreases += 1
+        else:
+            # 加性增：每完成约 inflight_limit 个请求（一个窗口）在途 +1
+            self.inflight_limit = min(float(self.max_inflight),
+                                      self.inflight_limit + 1.0 / self.inflight_limit)
+            self.batch = min(float(self.max_batch),
+                             self.batch + self.batch_step / max(1.0, self.inflight_limit))
+
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self._rate = self._window_writes / elapsed
+            self._window_start = now
+            self._window_writes = 0
+
+    def iter_batches(self, items: Sequence) -> Iterator[Sequence]:
+        """按实时 batch_size 切分 items（每取一块都读取最新批量大小）"""
+        i = 0
+        while i < len(items):
+            n = max(1, self.batch_size)
+            yield items[i:i + n]
+            i += n
+
+    def stats(self) -> dict:
+        return {
+            "target_latency_ms": round(self.target_latency * 1000, 1),
+            "inflight_limit": round(self.inflight_limit, 2),
+            "inflight": self._inflight,
+            "batch_size": self.batch_size,
+            "latency_ewma_ms": round(self._ewma * 1000, 2) if self._ewma is not None else None,
+            "writes_per_s": round(self._rate, 2),
+            "writes": self._writes,
+            "decreases": self._decreases,
+        }
+
+
+# 全局单例
+pacer = WritePacer()
+metrics.register_gauge("write_pacer", pacer.stats)
@@ -0,0 +1,455 @@
+"""
+Mutation Plan：把多步编辑编译为最少的 ak.wwise.core.object.set 调用
+
+工具不再逐条调用 create → 查 path → setProperty → setReference，而是声明一组操作：
+
+    plan = MutationPlan()
+    ev = plan.create("\\Events\\Default Work Unit", "Event", "Play_Boom")
+    act = plan.create(ev, "Action", "Play_Boom_Action", ActionType=1)
+    plan.set_reference(act, "Target", "\\Actor-Mixer Hierarchy\\...\\Boom")
+    result = await plan.execute(adapter)
+
+编译规则：
+  1. 父节点为本计划内新建节点的 create 嵌套到父节点的 "children" 中；整棵树共用根节点的
+     onNameConflict，子节点未指定时继承，显式指定了不同的值则拒绝该计划
+  2. 针对新建节点的 set_property / set_reference / append_list 合并进该节点的 "@..." 字段
+  3. 针对已有对象的操作按 (object, platform) 合并为一个 objects 条目
+  4. 引用值指向本计划内新建节点的 set_reference 依赖新节点的 GUID，放入第二阶段，
+     待第一阶段返回 id 后再执行
+  5. 每个阶段先执行含新建节点的 unit，再执行只修改已有对象的 unit（后者可能针对前者新建的路径）；
+     各自按 (listMode, onNameConflict) 分组，再按 WritePacer 的实时批量大小分块
+  6. 全部执行完后用一次 object.get（按 id）批量解析新建节点的 name/path
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from .pacing import pacer
+
+if TYPE_CHECKING:
+    from .adapter import WwiseAdapter
+
+logger = logging.getLogger("wwise_mcp.plan")
+
+
+@dataclass(frozen=True)
+class Ref:
+    """对本计划内新建节点的引用"""
+    key: str
+
+
+Target = Union[str, Ref]
+
+
+@dataclass
+class CreateNode:
+    ref: Ref
+    parent: Target
+    type: str
+    name: str
+    props: dict = field(default_factory=dict)
+    notes: str = ""
+    on_conflict: Optional[str] = None     # None：继承所在树的根节点（根节点默认 rename）
+
+
+@dataclass
+class SetProperty:
+    target: Target
+    prop: str
+    value: Any
+    platform: Optional[str] = None
+
+
+@dataclass
+class SetReference:
+    target: Target
+    reference: str
+    value: Target
+    platform: Optional[str] = None
+
+
+@dataclass
+class AppendList:
+    target: Target
+    list_name: str
+    entries: list
+    list_mode: str = "append"
+
+
+Operation = Union[CreateNode, SetProperty, SetReference, AppendList]
+
+
+@dataclass
+class PlanResult:
+    created: dict[str, dict]          # ref key → {id, name, path, type}
+    calls: int                        # object.set 调用次数
+    objects: int                      # 提交的 objects 条目总数
+
+    def get(self, ref: Ref) -> dict:
+        return self.created.get(ref.key, {})
+
+
+def _at(name: str) -> str:
+    return name if name.startswith("@") else f"@{name}"
+
+
+class _Unit:
+    """object.set 的最小可分块单元：一个 objects 条目（已有对象 + 若干字段/子节点）"""
+
+    __slots__ = ("object", "platform", "fields", "children", "list_mode", "on_conflict", "size")
+
+    def __init__(self, obj: str, platform: Optional[str], list_mode: str, on_conflict: str):
+        self.object = obj
+        self.platform = platform
+        self.fields: dict[str, Any] = {}
+        self.children: list[dict] = []
+        self.list_mode = list_mode
+        self.on_conflict = on_conflict
+        self.size = 0
+
+    def to_entry(self) -> dict:
+        entry: dict[str, Any] = {"object": self.object}
+        if self.platform:
+            entry["platform"] = self.platform
+        entry.update(self.fields)
+        if self.children:
+            entry["children"] = self.children
+        return entry
+
+
+class MutationPlan:
+    """声明式编辑计划，见模块文档"""
+
+    def __init__(self):
+        self.operations: list[Operation] = []
+        self._creates: dict[str, CreateNode] = {}
+        self._entry_keys: dict[int, str] = {}   # id(编译后的子节点条目) → ref key
+        self._seq = 0
+
+    # ------------------------------------------------------------------
+    # 构建
+    # ------------------------------------------------------------------
+
+    def create(
+        self,
+        parent: Target,
+        obj_type: str,
+        name: str,
+        notes: str = "",
+        on_conflict: str | None = None,
+        ref: str | None = None,
+        **props,
+    ) -> Ref:
+        self._seq += 1
+        node_ref = Ref(ref or f"n{self._seq}")
+        if node_ref.key in self._creates:
+            raise ValueError(f"重复的节点引用：{node_ref.key}")
+        node = CreateNode(node_ref, parent, obj_type, name, props, notes, on_conflict)
+        self._creates[node_ref.key] = node
+        self.operations.append(node)
+        return node_ref
+
+    def set_property(self, target: Target, prop: str, value: Any, platform: str | None = None) -> None:
+        self.operations.append(SetProperty(target, prop, value, platform))
+
+    def set_reference(self, target: Target, reference: str, value: Target, platform: str | None = None) -> None:
+        self.operations.append(SetReference(target, reference, value, platform))
+
+    def append_list(self, target: Target, list_name: str, entries: list, list_mode: str = "append") -> None:
+        self.operations.append(AppendList(target, list_name, entries, list_mode))
+
+    @classmethod
+    def from_operations(cls, operations: list[dict]) -> "MutationPlan":
+        """
+        从 JSON 操作列表构建计划（供 apply_mutations 工具使用）。
+        以 "$" 开头的 parent/target/value 表示引用本计划内 ref 为该名称的新建节点：
+
+            {"op": "create", "ref": "ev", "parent": "\\Events\\Default Work Unit",
+             "type": "Event", "name": "Play_X", "properties": {}, "notes": "", "on_conflict": "rename"}
+            {"op": "set_property",  "target": "$ev", "property": "Volume", "value": -3, "platform": null}
+            {"op": "set_reference", "target": "...", "reference": "OutputBus", "value": "..."}
+            {"op": "append_list",   "target": "...", "list": "RTPC", "entries": [...], "list_mode": "append"}
+        """
+        plan = cls()
+
+        def target(value):
+            if isinstance(value, str) and value.startswith("$"):
+                return Ref(value[1:])
+            return value
+
+        for idx, op in enumerate(operations):
+            kind = op.get("op")
+            try:
+                if kind == "create":
+                    plan.create(
+                        target(op["parent"]), op["type"], op["name"],
+                        notes=op.get("notes", ""),
+                        on_conflict=op.get("on_conflict"),
+                        ref=op.get("ref"),
+                        **(op.get("properties") or {}),
+                    )
+                elif kind == "set_property":
+                    plan.set_property(target(op["target"]), op["property"], op["value"], op.get("platform"))
+                elif kind == "set_reference":
+                    plan.set_reference(target(op["target"]), op["reference"], target(op["value"]), op.get("platform"))
+                elif kind == "append_list":
+                    plan.append_list(target(op["target"]), op["list"], list(op["entries"]),
+                                     op.get("list_mode", "append"))
+                else:
+                    raise ValueError(f"未知操作类型 '{kind}'")
+            except KeyError as e:
+                raise ValueError(f"第 {idx} 个操作缺少字段 {e}") from None
+        plan._check()
+        return plan
+
+    # ------------------------------------------------------------------
+    # 编译
+    # ------------------------------------------------------------------
+
+    def _check(self) -> None:
+        for op in self.operations:
+            targets = [getattr(op, "target", None), getattr(op, "parent", None)]
+            if isinstance(op, SetReference):
+                targets.append(op.value)
+            for t in targets:
+                if isinstance(t, Ref) and t.key not in self._creates:
+                    raise ValueError(f"未定义的节点引用：{t.key}")
+        # 父子环检测；嵌套节点随根节点在同一个 objects 条目中提交，onNameConflict 必须一致
+        for node in self._creates.values():
+            seen = set()
+            root = node
+            while isinstance(root.parent, Ref):
+                if root.parent.key in seen:
+                    raise ValueError(f"节点引用存在环：{root.parent.key}")
+                seen.add(root.parent.key)
+                root = self._creates[root.parent.key]
+            if node is not root and node.on_conflict and node.on_conflict != (root.on_conflict or "rename"):
+                raise ValueError(
+                    f"节点 {node.ref.key} 的 on_conflict '{node.on_conflict}' 与所在树的根节点 "
+                    f"{root.ref.key}（'{root.on_conflict or 'rename'}'）不一致；"
+                    f"同一棵新建树只能使用一种 on_conflict"
+                )
+
+    def compile(self) -> tuple[list[_Unit], list[Operation]]:
+        """
+        返回 (第一阶段 units, 第二阶段待执行操作)。
+        第二阶段操作依赖新建节点的 GUID，在第一阶段执行后再编译。
+        """
+        self._check()
+        node_entries: dict[str, dict] = {}
+        for key, node in self._creates.items():
+            entry: dict[str, Any] = {"type": node.type, "name": node.name}
+            if node.notes:
+                entry["notes"] = node.notes
+            for prop, value in node.props.items():
+                entry[_at(prop)] = value
+            node_entries[key] = entry
+        self._entry_keys = {id(entry): key for key, entry in node_entries.items()}
+
+        units: dict[tuple, _Unit] = {}
+        deferred: list[Operation] = []
+
+        def unit_for(obj: str, platform, list_mode="append", on_conflict="rename") -> _Unit:
+            k = (obj, platform, list_mode, on_conflict)
+            unit = units.get(k)
+            if unit is None:
+                unit = units[k] = _Unit(obj, platform, list_mode, on_conflict)
+            return unit
+
+        for op in self.operations:
+            if isinstance(op, CreateNode):
+                entry = node_entries[op.ref.key]
+                if isinstance(op.parent, Ref):
+                    node_entries[op.parent.key].setdefault("children", []).append(entry)
+                else:
+                    unit = unit_for(op.parent, None, on_conflict=op.on_conflict or "rename")
+                    unit.children.append(entry)
+                continue
+
+            if isinstance(op, SetReference) and isinstance(op.value, Ref):
+                deferred.append(op)
+                continue
+
+            platform = getattr(op, "platform", None)
+            if isinstance(op.target, Ref):
+                if platform:
+                    deferred.append(op)
+                    continue
+                fields = node_entries[op.target.key]
+            else:
+                list_mode = op.list_mode if isinstance(op, AppendList) else "append"
+                fields = unit_for(op.target, platform, list_mode).fields
+
+            if isinstance(op, SetProperty):
+                fields[_at(op.prop)] = op.value
+            elif isinstance(op, SetReference):
+                fields[_at(op.reference)] = op.value
+            elif isinstance(op, AppendList):
+                fields.setdefault(_at(op.list_name), []).extend(op.entries)
+
+        for unit in units.values():
+            unit.size = len(unit.fields) + sum(_count_nodes(c) for c in unit.children)
+        return [u for u in units.values() if u.fields or u.children], deferred
+
+    # ------------------------------------------------------------------
+    # 执行
+    # ------------------------------------------------------------------
+
+    async def execute(self, adapter: "WwiseAdapter") -> PlanResult:
+        units, deferred = self.compile()
+        stats = {"calls": 0, "objects": 0}
+
+        sent = await self._run_units(adapter, units, stats)
+        created_ids = self._collect_ids(sent)
+
+        if deferred:
+            stage2 = MutationPlan()
+            for op in deferred:
+                target = self._resolve_ref(op.target, created_ids, op)
+                if isinstance(op, SetReference):
+                    value = self._resolve_ref(op.value, created_ids, op)
+                    stage2.set_reference(target, op.reference, value, op.platform)
+                elif isinstance(op, SetProperty):
+                    stage2.set_property(target, op.prop, op.value, op.platform)
+            units2, _ = stage2.compile()
+            await self._run_units(adapter, units2, stats)
+
+        created = await self._resolve(adapter, created_ids)
+        return PlanResult(created=created, calls=stats["calls"], objects=stats["objects"])
+
+    def _resolve_ref(self, target: Target, ids: dict[str, str], op: Operation) -> str:
+        if not isinstance(target, Ref):
+            return target
+        resolved = ids.get(target.key) or self._expected_path(target.key)
+        if not resolved:
+            raise ValueError(f"无法解析新建节点 {target.key}：{op}")
+        return resolved
+
+    async def _run_units(self, adapter: "WwiseAdapter", units: list[_Unit], stats: dict) -> list:
+        """
+        先执行含新建节点的 unit，再执行只修改已有对象的 unit（避免修改与同计划中的新建竞争）；
+        每一批按 (listMode, onNameConflict) 分组、按实时批量大小分块，并发执行。
+        返回 [(实际提交的 unit, 对应的响应条目)]。
+        """
+        sent: list[tuple[_Unit, dict]] = []
+
+        async def run_chunk(chunk: list[_Unit], list_mode: str, on_conflict: str):
+            objects = [u.to_entry() for u in chunk]
+            stats["calls"] += 1
+            stats["objects"] += len(objects)
+            result = await adapter.object_set(objects, on_name_conflict=on_conflict, list_mode=list_mode)
+            returned = (result or {}).get("objects") or []
+            for unit, resp in zip(chunk, returned):
+                if isinstance(resp, dict):
+                    sent.append((unit, resp))
+
+        async def worker(chunks, list_mode: str, on_conflict: str):
+            # 多个 worker 共享同一个惰性生成器：每取一块都读取 WritePacer 最新的 batch_size
+            for chunk in chunks:
+                await run_chunk(chunk, list_mode, on_conflict)
+
+        for phase in ([u for u in units if u.children], [u for u in units if not u.children]):
+            groups: dict[tuple, list[_Unit]] = {}
+            for unit in phase:
+                groups.setdefault((unit.list_mode, unit.on_conflict), []).append(unit)
+            tasks = []
+            for (list_mode, on_conflict), group in groups.items():
+                chunks = _chunk_units(group)
+                tasks.extend(worker(chunks, list_mode, on_conflict) for _ in range(pacer.max_inflight))
+            await asyncio.gather(*tasks)
+        return sent
+
+    def _collect_ids(self, sent: list) -> dict[str, str]:
+        """按请求/响应 children 的位置一一对应，取回新建节点的 GUID"""
+        ids: dict[str, str] = {}
+
+        def walk(req_children: list, resp_children: list):
+            for req, resp in zip(req_children, resp_children or []):
+                if not isinstance(resp, dict):
+                    continue
+                key = self._entry_keys.get(id(req))
+                if key and resp.get("id"):
+                    ids[key] = resp["id"]
+                walk(req.get("children", []), resp.get("children", []))
+
+        for unit, resp in sent:
+            walk(unit.children, resp.get("children", []))
+        return ids
+
+    def _expected_path(self, key: str) -> Optional[str]:
+        node = self._creates[key]
+        parent = node.parent
+        if isinstance(parent, Ref):
+            parent_path = self._expected_path(parent.key)
+        else:
+            parent_path = parent if parent.startswith("\\") else None
+        return f"{parent_path}\\{node.name}" if parent_path else None
+
+    async def _resolve(self, adapter: "WwiseAdapter", ids: dict[str, str]) -> dict:
+        """一次 object.get 解析所有新建节点的 name/path（响应中没有 id 时按预期路径查询）"""
+        if not self._creates:
+            return {}
+        created: dict[str, dict] = {}
+        if ids:
+            rows = await adapter.get_objects(
+                from_spec={"id": list(ids.values())},
+                return_fields=["id", "name", "path", "type"],
+            )
+            by_id = {r.get("id"): r for r in rows}
+            for key, obj_id in ids.items():
+                created[key] = by_id.get(obj_id, {"id": obj_id})
+        missing = {k: self._expected_path(k) for k in self._creates if k not in created}
+        missing = {k: p for k, p in missing.items() if p}
+        if missing:
+            rows = await adapter.get_objects(
+                from_spec={"path": list(missing.values())},
+                return_fields=["id", "name", "path", "type"],
+            )
+            by_path = {r.get("path"): r for r in rows}
+            for key, path in missing.items():
+                if path in by_path:
+                    created[key] = by_path[path]
+        return created
+
+
+def _count_nodes(entry: dict) -> int:
+    return 1 + sum(_count_nodes(c) for c in entry.get("children", []))
+
+
+def _chunk_units(units: list[_Unit]):
+    """
+    惰性地按 WritePacer 的实时批量大小分块（以节点/字段数计），每产出一块都重新读取 batch_size。
+    单个 unit 的直接子节点过多时拆成多个同 object 的 unit，保证单次调用规模受控。
+    """
+    chunk: list[_Unit] = []
+    size = 0
+
+    for unit in units:
+        if unit.size <= max(1, pacer.batch_size) or len(unit.children) <= 1:
+            pieces = [unit]
+        else:
+            pieces = _split_unit(unit)
+        for piece in pieces:
+            if chunk and size + piece.size > max(1, pacer.batch_size):
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(piece)
+            size += piece.size
+    if chunk:
+        yield chunk
+
+
+def _split_unit(unit: _Unit):
+    current = _Unit(unit.object, unit.platform, unit.list_mode, unit.on_conflict)
+    current.fields = unit.fields
+    current.size = len(unit.fields)
+    for child in unit.children:
+        n = _count_nodes(child)
+        if current.children and current.size + n > max(1, pacer.batch_size):
+            yield current
+            current = _Unit(unit.object, unit.platform, unit.list_mode, unit.on_conflict)
+        current.children.append(child)
+        current.size += n
+    yield current
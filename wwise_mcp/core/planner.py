@@ -0,0 +1,305 @@
+"""
+代价估算查询规划器（WwiseAdapter.query 使用）
+同一个逻辑查询（类型集合 + 范围 + 字段 + 谓词）在 WAAPI 上有两种主要写法：
+
+  - ofType：按类型全项目查询，再按路径前缀过滤范围
+  - descendants：取范围路径的全部后代，再按类型过滤
+
+哪种便宜取决于基数：全项目 Sound 有 5 万个而范围内只有 300 个对象时应走 descendants，
+反之范围是整个 Actor-Mixer Hierarchy 而只要 Event 时应走 ofType。规划器维护：
+
+  - 每种类型的全项目对象数（执行 ofType 查询时精确记录）
+  - 每个范围路径的后代总数及按类型计数（执行 descendants 查询时精确记录）
+  - 未观测过的范围：一次 children 探测（childrenCount）× 学习到的扇出系数估算
+
+代价 = Σ 每次调用的固定开销 + 返回行数，选择代价最小的写法。
+有类型专属字段或选择性谓词（范围 / 名称过滤）时分两阶段：先取通用字段过滤，
+再只对命中对象按类型分块读取专属字段。统计信息过期（settings.planner_stats_ttl）或
+连接重建后重新学习；估算只影响写法选择，不影响结果正确性。
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from ..config import settings
+from .accessors import UNIVERSAL_FIELDS
+from .metrics import metrics
+
+if TYPE_CHECKING:
+    from .adapter import WwiseAdapter
+
+logger = logging.getLogger("wwise_mcp.planner")
+
+# 一次 WAAPI 调用的固定开销，折算为返回行数
+CALL_COST = 200
+# 扇出系数初值：子节点的 childrenCount 每 1 个对应的后代数
+_DEFAULT_FANOUT = 2.0
+
+
+@dataclass
+class LogicalQuery:
+    """
+    逻辑查询：与具体 WAAPI 写法无关。
+
+    types:         对象类型列表，None 表示不限（此时必须提供 scope）
+    scope:         范围路径，只返回其后代（不含自身），None 表示全项目
+    fields:        返回字段（不带 @ 前缀）
+    name_contains: 名称子串过滤（不区分大小写）
+    where:         其他客户端谓词，row -> bool
+    """
+    types: Optional[list[str]] = None
+    scope: Optional[str] = None
+    fields: list[str] = field(default_factory=lambda: ["name", "type", "path", "id"])
+    name_contains: Optional[str] = None
+    where: Optional[Callable[[dict], bool]] = None
+
+
+@dataclass
+class QueryPlan:
+    strategy: str                   # "ofType" | "descendants"
+    calls: list[dict]               # 第一阶段的 object.get 参数（from / transform）
+    est_rows: int                   # 第一阶段预计返回行数
+    est_cost: float
+    two_phase: bool                 # 是否先取通用字段、再读命中对象的专属字段
+    alternatives: dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "strategy": self.strategy,
+            "calls": len(self.calls),
+            "est_rows": self.est_rows,
+            "est_cost": round(self.est_cost, 1),
+            "two_phase": self.two_phase,
+            "alternatives": {k: round(v, 1) for k, v in self.alternatives.items()},
+        }
+
+
+class _Stat:
+    __slots__ = ("value", "at")
+
+    def __init__(self, value: Any):
+        self.value = value
+        self.at = time.monotonic()
+
+
+class QueryPlanner:
+    def __init__(self, stats_ttl: float | None = None, default_type_count: int | None = None):
+        self.stats_ttl = stats_ttl or settings.planner_stats_ttl
+        self.default_type_count = default_type_count or settings.planner_default_type_count
+        self._type_counts: dict[str, _Stat] = {}     # type -> 全项目数量
+        self._subtrees: dict[str, _Stat] = {}        # scope -> {"*": 后代总数, type: 数量}
+        self._probes: dict[str, _Stat] = {}          # scope -> (子节点数, Σ子节点 childrenCount)
+        self._fanout = _DEFAULT_FANOUT
+        self._generation = -1
+        self._plans: dict[str, int] = {"ofType": 0, "descendants": 0}
+        self._probe_calls = 0
+
+    # ------------------------------------------------------------------
+    # 统计信息
+    # ------------------------------------------------------------------
+
+    def _fresh(self, stat: Optional[_Stat]) -> bool:
+        return stat is not None and time.monotonic() - stat.at <= self.stats_ttl
+
+    def _sync_session(self, adapter: "WwiseAdapter") -> None:
+        generation = adapter.connection.generation
+        if generation != self._generation:
+            self._generation = generation
+            self.reset()
+
+    @property
+    def fanout(self) -> float:
+        """子节点 childrenCount 每 1 个对应的平均后代数（学习值）"""
+        return self._fanout
+
+    def reset(self) -> None:
+        self._type_counts.clear()
+        self._subtrees.clear()
+        self._probes.clear()
+
+    def type_count(self, obj_type: str) -> tuple[int, bool]:
+        """(全项目数量估计, 是否为实测值)"""
+        stat = self._type_counts.get(obj_type)
+        if self._fresh(stat):
+            return stat.value, True
+        return self.default_type_count, False
+
+    async def subtree_size(self, adapter: "WwiseAdapter", scope: str) -> int:
+        """范围后代数估计：优先用实测值，否则做一次 children 探测"""
+        stat = self._subtrees.get(scope)
+        if self._fresh(stat):
+            return stat.value["*"]
+        probe = self._probes.get(scope)
+        if not self._fresh(probe):
+            children = await adapter.get_objects(
+                from_spec={"path": [scope]},
+                return_fields=["childrenCount"],
+                transform=[{"select": ["children"]}],
+            )
+            self._probe_calls += 1
+            probe = self._probes[scope] = _Stat(
+                (len(children), sum(c.get("childrenCount") or 0 for c in children))
+            )
+        n_children, grand = probe.value
+        return int(n_children + grand * self._fanout)
+
+    def _observe_types(self, rows: list[dict], types: list[str]) -> None:
+        counts = dict.fromkeys(types, 0)
+        for row in rows:
+            if row.get("type") in counts:
+                counts[row["type"]] += 1
+        for obj_type, count in counts.items():
+            self._type_counts[obj_type] = _Stat(count)
+
+    def _observe_subtree(self, scope: str, counts: Counter) -> None:
+        total = sum(counts.values())
+        self._subtrees[scope] = _Stat({**counts, "*": total})
+        probe = self._probes.get(scope)
+        if probe is not None and probe.value[1]:
+            n_children, grand = probe.value
+            observed = max(0.0, (total - n_children) / grand)
+            # 指数平滑，避免单个范围把系数带偏
+            self._fanout = 0.7 * self._fanout + 0.3 * observed
+
+    # ------------------------------------------------------------------
+    # 规划
+    # ------------------------------------------------------------------
+
+    async def plan(self, adapter: "WwiseAdapter", query: LogicalQuery) -> QueryPlan:
+        self._sync_session(adapter)
+        if not query.types and not query.scope:
+            raise ValueError("LogicalQuery 必须提供 types 或 scope")
+
+        specific = [f for f in query.fields if f not in UNIVERSAL_FIELDS]
+        selective = bool(query.scope or query.name_contains or query.where)
+        two_phase = bool(specific) and (selective or len(query.types or ()) != 1)
+
+        candidates: dict[str, tuple[float, int, list[dict]]] = {}
+
+        if query.types:
+            per_type = [(t, self.type_count(t)[0]) for t in query.types]
+            rows = sum(n for _, n in per_type)
+            if len(per_type) > 1 and rows > settings.read_chunk_size:
+                # 按类型拆成多次调用并发执行，单个响应更小
+                calls = [{"from": {"ofType": [t]}} for t, _ in per_type]
+            else:
+                calls = [{"from": {"ofType": list(query.types)}}]
+            candidates["ofType"] = (len(calls) * CALL_COST + rows, rows, calls)
+
+        if query.scope:
+            rows = await self.subtree_size(adapter, query.scope)
+            calls = [{"from": {"path": [query.scope]}, "transform": [{"select": ["descendants"]}]}]
+            candidates["descendants"] = (CALL_COST + rows, rows, calls)
+
+        strategy = min(candidates, key=lambda k: candidates[k][0])
+        cost, rows, calls = candidates[strategy]
+        self._plans[strategy] += 1
+        return QueryPlan(
+            strategy=strategy,
+            calls=calls,
+            est_rows=rows,
+            est_cost=cost,
+            two_phase=two_phase,
+            alternatives={k: v[0] for k, v in candidates.items()},
+        )
+
+    # ------------------------------------------------------------------
+    # 执行
+    # ------------------------------------------------------------------
+
+    async def execute(self, adapter: "WwiseAdapter", query: LogicalQuery) -> tuple[list[dict], QueryPlan]:
+        plan = await self.plan(adapter, query)
+
+        first = [f for f in query.fields if f in UNIVERSAL_FIELDS] if plan.two_phase else list(query.fields)
+        internal = [f for f in ("id", "type", "path") if f not in first]
+        first += internal
+
+        if plan.strategy == "descendants" and plan.est_rows > settings.stream_chunk_rows:
+            # 大范围：按子树分块流式读取、逐块过滤，不在内存中保留整棵子树
+            counts: Counter = Counter()
+            rows = []
+            async for batch in adapter.iter_descendants(query.scope, first):
+                counts.update(row.get("type", "") for row in batch)
+                rows += self._filter(batch, query)
+            self._observe_subtree(query.scope, counts)
+        else:
+            batches = await asyncio.gather(*(
+                adapter.get_objects(from_spec=call["from"], return_fields=first, transform=call.get("transform"))
+                for call in plan.calls
+            ))
+            rows = [row for batch in batches for row in batch]
+
+            # 记录实测基数（过滤前）
+            if plan.strategy == "ofType":
+                self._observe_types(rows, query.types)
+            else:
+                self._observe_subtree(query.scope, Counter(row.get("type", "") for row in rows))
+
+            rows = self._filter(rows, query)
+
+        if plan.two_phase and rows:
+            await self._fill_specific(adapter, rows, [f for f in query.fields if f not in first])
+
+        drop = [f for f in internal if f not in query.fields]
+        if drop:
+            for row in rows:
+                for key in drop:
+                    row.pop(key, None)
+        return rows, plan
+
+    @staticmethod
+    def _filter(rows: list[dict], query: LogicalQuery) -> list[dict]:
+        types = set(query.types) if query.types else None
+        prefix = query.scope.rstrip("\\") + "\\" if query.scope else None
+        needle = query.name_contains.lower() if query.name_contains else None
+        result = []
+        for row in rows:
+            if types is not None and row.get("type") not in types:
+                continue
+            if prefix is not None and not row.get("path", "").startswith(prefix):
+                continue
+            if needle is not None and needle not in row.get("name", "").lower():
+                continue
+            if query.where is not None and not query.where(row):
+                continue
+            result.append(row)
+        return result
+
+    @staticmethod
+    async def _fill_specific(adapter: "WwiseAdapter", rows: list[dict], fields: list[str]) -> None:
+        """第二阶段：按类型 + id 分块读取专属字段，合并回 rows"""
+        by_type: dict[str, list[str]] = {}
+        for row in rows:
+            by_type.setdefault(row.get("type", ""), []).append(row["id"])
+
+        size = max(1, settings.read_chunk_size)
+        batches = await asyncio.gather(*(
+            adapter.get_objects(
+                from_spec={"id": ids[i:i + size]}, return_fields=["id", *fields], obj_type=obj_type,
+            )
+            for obj_type, ids in by_type.items()
+            for i in range(0, len(ids), size)
+        ))
+        values = {row["id"]: row for batch in batches for row in batch if row.get("id")}
+        for row in rows:
+            extra = values.get(row["id"])
+            if extra:
+                row.update({k: v for k, v in extra.items() if k != "id"})
+
+    def stats(self) -> dict:
+        return {
+            "type_counts": {t: s.value for t, s in self._type_counts.items() if self._fresh(s)},
+            "subtrees": len(self._subtrees),
+            "fanout": round(self._fanout, 2),
+            "plans": dict(self._plans),
+            "probe_calls": self._probe_calls,
+        }
+
+
+# 全局单例
+planner = QueryPlanner()
+metrics.register_gauge("query_planner", planner.stats)
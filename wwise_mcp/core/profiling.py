@@ -0,0 +1,163 @@
+"""
+按工具聚合的采样 Profiler（--profile 模式）
+
+后台守护线程以固定间隔对事件循环线程做栈采样（sys._current_frames）。
+asyncio 任务执行时，其 await 链上的协程帧都在线程栈中，因此沿栈向上找到
+已注册的工具处理函数帧，即可把该样本归属到对应工具；事件循环空闲时的样本丢弃。
+
+输出为 collapsed stacks 格式（每行 "帧1;帧2;...;帧N 次数"），每个工具一个
+<tool>.folded 文件，可直接喂给 flamegraph.pl / speedscope / inferno。
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType
+from typing import Optional
+
+from ..config import settings
+
+logger = logging.getLogger("wwise_mcp.profiling")
+
+
+def _frame_label(code: CodeType) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class ToolProfiler:
+    """
+    用法：
+        profiler.register(handler.__code__, "search_objects")   # server.py 注册工具
+        profiler.start("/tmp/wwise-profiles")                    # 开始采样
+        profiler.stop()                                          # 停止并写出 .folded 文件
+    """
+
+    def __init__(self):
+        self._tools: dict[CodeType, str] = {}
+        self._stacks: dict[str, Counter] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._target_thread: Optional[int] = None
+        self.output_dir: str = ""
+        self.interval: float = settings.profile_interval
+        self.samples = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def register(self, code: CodeType, tool_name: str) -> None:
+        """登记工具处理函数的 code 对象，采样时据此识别样本归属"""
+        self._tools[code] = tool_name
+
+    # ------------------------------------------------------------------
+    # 启停
+    # ------------------------------------------------------------------
+
+    def start(
+        self,
+        output_dir: str,
+        interval: float | None = None,
+        target_thread: int | None = None,
+    ) -> None:
+        """
+        开始采样。
+
+        Args:
+            output_dir:    .folded 文件输出目录（不存在时自动创建）
+            interval:      采样间隔（秒），默认 settings.profile_interval
+            target_thread: 被采样线程 ident，默认主线程（stdio/sse 模式下事件循环所在线程）
+        """
+        if self.enabled:
+            return
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        if interval:
+            self.interval = interval
+        self._target_thread = target_thread or threading.main_thread().ident
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="wwise-mcp-profiler", daemon=True
+        )
+        self._thread.start()
+        logger.info("Profiler 已启动：间隔 %.1fms，输出目录 %s",
+                    self.interval * 1000, output_dir)
+
+    def stop(self) -> None:
+        """停止采样并写出所有工具的 .folded 文件"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=2.0)
+        self._thread = None
+        self.flush()
+        logger.info("Profiler 已停止，共 %d 个样本", self.samples)
+
+    # ------------------------------------------------------------------
+    # 采样
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        next_flush = time.monotonic() + settings.profile_flush_interval
+        while not self._stop.wait(self.interval):
+            self._sample()
+            if time.monotonic() >= next_flush:
+                self.flush()
+                next_flush = time.monotonic() + settings.profile_flush_interval
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self._target_thread)
+        stack: list[str] = []
+        tool = None
+        while frame is not None:
+            code = frame.f_code
+            stack.append(_frame_label(code))
+            tool = self._tools.get(code)
+            if tool is not None:
+                break
+            frame = frame.f_back
+        if tool is None:
+            return  # 事件循环空闲或在执行非工具代码
+        stack.reverse()
+        with self._lock:
+            self._stacks.setdefault(tool, Counter())[";".join(stack)] += 1
+            self.samples += 1
+
+    # ------------------------------------------------------------------
+    # 输出
+    # ------------------------------------------------------------------
+
+    def flush(self) -> list[str]:
+        """把已累计的样本写成 <output_dir>/<tool>.folded（覆盖写，内容为累计值）"""
+        if not self.output_dir:
+            return []
+        with self._lock:
+            snapshot = {tool: dict(c) for tool, c in self._stacks.items()}
+        written = []
+        for tool, stacks in snapshot.items():
+            path = os.path.join(self.output_dir, f"{tool}.folded")
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in sorted(stacks.items(), key=lambda kv: -kv[1]):
+                    f.write(f"{stack} {count}\n")
+            written.append(path)
+        return written
+
+    def summary(self) -> dict:
+        with self._lock:
+            per_tool = {tool: sum(c.values()) for tool, c in self._stacks.items()}
+        return {
+            "enabled": self.enabled,
+            "output_dir": self.output_dir,
+            "interval_ms": round(self.interval * 1000, 3),
+            "samples": self.samples,
+            "samples_per_tool": per_tool,
+        }
+
+
+# 全局单例
+profiler = ToolProfiler()
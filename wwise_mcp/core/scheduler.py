@@ -0,0 +1,157 @@
+"""
+WAAPI 调用优先级调度器
+所有 WAAPI 调用在进入工作线程前先向调度器申请执行槽位：
+
+  - 三个优先级：interactive（用户正在等待的 UI 类查询）> normal（普通工具）> bulk（后台 Job、审计）
+  - 全局并发上限 settings.waapi_max_concurrency，且每个优先级有独立并发上限
+    （settings.waapi_class_limits），bulk 永远无法占满全部槽位
+  - 老化（aging）：排队每满 settings.waapi_aging_interval 秒，有效优先级提升一级，防止饿死
+
+调用方通过 current_priority（ContextVar）声明优先级：server.py 的工具装饰器按工具声明设置，
+后台 Job 统一设为 bulk。WwiseConnection.call 读取该值，工具代码无需感知。
+"""
+
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from ..config import settings
+from .metrics import metrics
+
+INTERACTIVE = "interactive"
+NORMAL = "normal"
+BULK = "bulk"
+
+PRIORITIES = (INTERACTIVE, NORMAL, BULK)
+_RANK = {p: i for i, p in enumerate(PRIORITIES)}
+
+current_priority: ContextVar[str] = ContextVar("wwise_mcp_priority", default=NORMAL)
+
+
+class _Waiter:
+    __slots__ = ("priority", "rank", "enqueued", "seq", "future")
+
+    def __init__(self, priority: str, seq: int, future: asyncio.Future):
+        self.priority = priority
+        self.rank = _RANK[priority]
+        self.enqueued = time.monotonic()
+        self.seq = seq
+        self.future = future
+
+
+class WaapiScheduler:
+    """
+    用法：
+        async with scheduler.slot(INTERACTIVE):
+            await asyncio.to_thread(client.call, uri, payload)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        class_limits: dict[str, int] | None = None,
+        aging_interval: float | None = None,
+    ):
+        self.max_concurrency = max_concurrency or settings.waapi_max_concurrency
+        self.class_limits = dict(class_limits or settings.waapi_class_limits)
+        self.aging_interval = aging_interval or settings.waapi_aging_interval
+        self._running = {p: 0 for p in PRIORITIES}
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._granted = {p: 0 for p in PRIORITIES}
+        self._wait_total = {p: 0.0 for p in PRIORITIES}
+
+    # ------------------------------------------------------------------
+    # 槽位申请 / 释放
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[str] = None):
+        priority = priority if priority in _RANK else current_priority.get()
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def _can_run(self, priority: str) -> bool:
+        return (
+            sum(self._running.values()) < self.max_concurrency
+            and self._running[priority] < self.class_limits.get(priority, self.max_concurrency)
+        )
+
+    async def acquire(self, priority: str) -> None:
+        if not self._waiters and self._can_run(priority):
+            self._grant(priority, 0.0)
+            return
+        waiter = _Waiter(priority, next(self._seq), asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        # 已有等待者可能只是卡在自身的优先级上限，新来的其他优先级请求可立即运行
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 已分配到槽位但调用方被取消：归还槽位
+                self.release(priority)
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, priority: str) -> None:
+        self._running[priority] -= 1
+        self._dispatch()
+
+    def _grant(self, priority: str, waited: float) -> None:
+        self._running[priority] += 1
+        self._granted[priority] += 1
+        self._wait_total[priority] += waited
+
+    def _effective_rank(self, waiter: _Waiter, now: float) -> float:
+        return waiter.rank - (now - waiter.enqueued) / self.aging_interval
+
+    def _dispatch(self) -> None:
+        """在并发余量内，按有效优先级（含老化）依次唤醒可运行的等待者"""
+        while self._waiters and sum(self._running.values()) < self.max_concurrency:
+            now = time.monotonic()
+            best: Optional[_Waiter] = None
+            best_key = None
+            for waiter in self._waiters:
+                if not self._can_run(waiter.priority):
+                    continue
+                key = (self._effective_rank(waiter, now), waiter.seq)
+                if best_key is None or key < best_key:
+                    best, best_key = waiter, key
+            if best is None:
+                return  # 剩余等待者所在优先级均已达上限
+            self._waiters.remove(best)
+            self._grant(best.priority, now - best.enqueued)
+            best.future.set_result(None)
+
+    # ------------------------------------------------------------------
+    # 状态
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        queued = {p: 0 for p in PRIORITIES}
+        for waiter in self._waiters:
+            queued[waiter.priority] += 1
+        return {
+            "max_concurrency": self.max_concurrency,
+            "class_limits": self.class_limits,
+            "running": dict(self._running),
+            "queued": queued,
+            "granted": dict(self._granted),
+            "avg_queue_wait_ms": {
+                p: round(self._wait_total[p] / self._granted[p] * 1000, 2) if self._granted[p] else 0.0
+                for p in PRIORITIES
+            },
+        }
+
+
+# 全局单例
+scheduler = WaapiScheduler()
+metrics.register_gauge("scheduler", scheduler.stats)
@@ -0,0 +1,238 @@
+"""
+结果快照 + 游标分页
+列表类查询工具（search_objects / get_rtpc_list / get_bus_topology / get_soundbank_info）
+首次调用时从 Wwise 拉取完整结果、排序后缓存为快照，返回第一页与不透明游标；
+后续页直接从内存切片，O(page size)，不再重复下载全量结果。
+超出响应预算的结果（见 budget.py）同样以快照保存，通过 get_page 工具按游标读取。
+
+快照失效：
+  - TTL（settings.snapshot_ttl）
+  - 项目变更：订阅对象增删改名与项目加载/关闭通知，收到即全部失效
+  - 本服务发出的写请求（WwiseConnection 在写成功后调用 invalidate）
+  - 连接重建
+"""
+
+import asyncio
+import base64
+import itertools
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+
+from ..config import settings
+from .exceptions import WwiseCursorError, WwiseMCPError
+from .metrics import metrics
+
+if TYPE_CHECKING:
+    from .adapter import WwiseAdapter
+    from .connection import WwiseConnection
+
+logger = logging.getLogger("wwise_mcp.snapshot")
+
+# 任一通知到达即视为项目已变更
+PROJECT_CHANGE_TOPICS = (
+    "ak.wwise.core.object.created",
+    "ak.wwise.core.object.preDeleted",
+    "ak.wwise.core.object.nameChanged",
+    "ak.wwise.core.object.childAdded",
+    "ak.wwise.core.object.childRemoved",
+    "ak.wwise.core.project.loaded",
+    "ak.wwise.core.project.preClosed",
+)
+
+
+class Snapshot:
+    __slots__ = ("id", "key", "rows", "created")
+
+    def __init__(self, snapshot_id: str, key: tuple, rows: list):
+        self.id = snapshot_id
+        self.key = key
+        self.rows = rows
+        self.created = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created
+
+
+def _encode_cursor(snapshot_id: str, offset: int) -> str:
+    raw = json.dumps([snapshot_id, offset], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        snapshot_id, offset = json.loads(raw)
+        return str(snapshot_id), int(offset)
+    except Exception:
+        raise WwiseCursorError(f"无法解析分页游标：{cursor!r}")
+
+
+class SnapshotCache:
+    """按 (工具名, 参数) 缓存排序后的完整结果，LRU + TTL"""
+
+    def __init__(self, ttl: float | None = None, max_entries: int | None = None):
+        self.ttl = ttl or settings.snapshot_ttl
+        self.max_entries = max_entries or settings.snapshot_max_entries
+        self._by_id: "OrderedDict[str, Snapshot]" = OrderedDict()
+        self._by_key: dict[tuple, str] = {}
+        self._seq = itertools.count(1)
+        self._generation = -1
+        self._subscriptions: list = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._listeners: list[Callable[[], None]] = []
+
+    # ------------------------------------------------------------------
+    # 失效
+    # ------------------------------------------------------------------
+
+    def invalidate(self, reason: str = "") -> None:
+        if self._by_id:
+            logger.debug("结果快照失效（%s），丢弃 %d 个", reason or "manual", len(self._by_id))
+            self._invalidations += 1
+        self._by_id.clear()
+        self._by_key.clear()
+        for listener in self._listeners:
+            listener()
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """项目变更 / 写请求 / 重连导致快照失效时同步调用 callback（其他内存缓存借此一并失效）"""
+        self._listeners.append(callback)
+
+    async def watch(self, conn: "WwiseConnection") -> None:
+        """连接（重新）建立后订阅项目变更通知"""
+        if conn.generation == self._generation:
+            return
+        self.invalidate("reconnect")
+        self._generation = conn.generation
+        self._loop = asyncio.get_running_loop()
+        self._subscriptions = []
+        for topic in PROJECT_CHANGE_TOPICS:
+            try:
+                self._subscriptions.append(await conn.subscribe(topic, self._on_change))
+            except WwiseMCPError as e:
+                # 订阅失败时仅依赖 TTL 与本服务写请求触发的失效
+                logger.warning("订阅 %s 失败：%s", topic, e)
+
+    def _on_change(self, *args, **kwargs) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self.invalidate, "project changed")
+
+    # ------------------------------------------------------------------
+    # 快照存取
+    # ------------------------------------------------------------------
+
+    def _expired(self, snapshot: Snapshot) -> bool:
+        return snapshot.age > self.ttl
+
+    def _get(self, snapshot_id: str) -> Optional[Snapshot]:
+        snapshot = self._by_id.get(snapshot_id)
+        if snapshot is None:
+            return None
+        if self._expired(snapshot):
+            self._drop(snapshot)
+            return None
+        self._by_id.move_to_end(snapshot_id)
+        return snapshot
+
+    def _drop(self, snapshot: Snapshot) -> None:
+        self._by_id.pop(snapshot.id, None)
+        if self._by_key.get(snapshot.key) == snapshot.id:
+            del self._by_key[snapshot.key]
+
+    def _put(self, key: tuple, rows: list) -> Snapshot:
+        snapshot = Snapshot(f"s{next(self._seq)}", key, rows)
+        old = self._by_key.get(key)
+        if old:
+            self._by_id.pop(old, None)
+        self._by_id[snapshot.id] = snapshot
+        self._by_key[key] = snapshot.id
+        while len(self._by_id) > self.max_entries:
+            _, evicted = self._by_id.popitem(last=False)
+            if self._by_key.get(evicted.key) == evicted.id:
+                del self._by_key[evicted.key]
+        return snapshot
+
+    async def paginate(
+        self,
+        adapter: "WwiseAdapter",
+        tool: str,
+        params: dict,
+        fetch: Callable[[], Awaitable[list]],
+        cursor: str | None = None,
+        limit: int = 50,
+        sort_key: Callable[[dict], object] = lambda row: row.get("path", ""),
+    ) -> dict:
+        """
+        返回一页结果：{"items", "total", "offset", "next_cursor", "snapshot_id", "snapshot_age_s"}。
+
+        - 带 cursor：从对应快照切片（游标属于其他工具或快照已失效时抛出 WwiseCursorError）
+        - 不带 cursor：同参数快照仍有效则复用，否则调用 fetch() 拉取全量并排序缓存
+        """
+        limit = max(1, limit)
+        await self.watch(adapter.connection)
+
+        if cursor:
+            page = self.read(cursor, limit)
+            if self._by_id[page["snapshot_id"]].key[0] != tool:
+                raise WwiseCursorError(f"该游标不属于 {tool}")
+            return page
+
+        key = (tool, json.dumps(params, sort_keys=True, default=str))
+        snapshot_id = self._by_key.get(key)
+        snapshot = self._get(snapshot_id) if snapshot_id else None
+        if snapshot is None:
+            self._misses += 1
+            rows = await fetch()
+            rows.sort(key=sort_key)
+            snapshot = self._put(key, rows)
+        else:
+            self._hits += 1
+        return self._page(snapshot, 0, limit)
+
+    def store(self, tool: str, rows: list) -> str:
+        """把已有结果存为新快照（不复用、不排序），返回指向第一行的游标"""
+        snapshot = self._put((tool, f"#{next(self._seq)}"), rows)
+        return _encode_cursor(snapshot.id, 0)
+
+    def read(self, cursor: str, limit: int = 50) -> dict:
+        """按游标读取一页（不校验所属工具）"""
+        snapshot_id, offset = _decode_cursor(cursor)
+        snapshot = self._get(snapshot_id)
+        if snapshot is None:
+            raise WwiseCursorError("分页游标对应的结果快照已过期或项目已变更")
+        self._hits += 1
+        return self._page(snapshot, offset, max(1, limit))
+
+    def _page(self, snapshot: Snapshot, offset: int, limit: int) -> dict:
+        end = offset + limit
+        return {
+            "items": snapshot.rows[offset:end],
+            "total": len(snapshot.rows),
+            "offset": offset,
+            "next_cursor": _encode_cursor(snapshot.id, end) if end < len(snapshot.rows) else None,
+            "snapshot_id": snapshot.id,
+            "snapshot_age_s": round(snapshot.age, 2),
+            "tool": snapshot.key[0],
+        }
+
+    def stats(self) -> dict:
+        return {
+            "snapshots": len(self._by_id),
+            "rows": sum(len(s.rows) for s in self._by_id.values()),
+            "hits": self._hits,
+            "misses": self._misses,
+            "invalidations": self._invalidations,
+            "watching": bool(self._subscriptions),
+        }
+
+
+# 全局单例
+snapshots = SnapshotCache()
+metrics.register_gauge("snapshots", snapshots.stats)
@@ -0,0 +1,187 @@
+"""
+可选的 Span 追踪（工具 → WwiseAdapter → WwiseConnection）
+导出为 Chrome trace-event JSON，可直接拖入 chrome://tracing 或 Perfetto 查看。
+
+关闭时（默认）span() 只做一次布尔判断并返回共享的空上下文管理器，开销可忽略。
+开启时每个 span 记录为一个 "X"（complete）事件，保存在有界 deque 中。
+
+轨道（tid）分配：同一调用链上的嵌套 span 共用一条轨道；若父 span 的轨道上
+已有其他子 span 正在进行（asyncio.gather 等并发场景），则为新 span 分配新轨道，
+避免同一 tid 上出现交叠的非嵌套事件。
+"""
+
+import functools
+import itertools
+import json
+import os
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Optional
+
+from ..config import settings
+
+
+class _NullSpan:
+    """追踪关闭时使用的空 span"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+# 当前所在的 span（用于确定父子关系与轨道）
+_current_span: ContextVar[Optional["_Span"]] = ContextVar("wwise_mcp_current_span", default=None)
+
+
+class _Span:
+    __slots__ = ("_tracer", "name", "cat", "args", "track", "start_ns", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, args: dict):
+        self._tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.track = 0
+        self.start_ns = 0
+        self._token = None
+
+    def set(self, **args) -> None:
+        """在 span 结束前追加参数（显示在 trace viewer 的 Args 面板）"""
+        self.args.update(args)
+
+    def __enter__(self):
+        tracer = self._tracer
+        parent = _current_span.get()
+        if parent is not None and tracer._top(parent.track) is parent:
+            self.track = parent.track
+        else:
+            self.track = next(tracer._track_ids)
+        tracer._push(self)
+        self._token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        _current_span.reset(self._token)
+        self._tracer._pop(self)
+        self._tracer.add_complete(
+            self.name, self.cat, self.start_ns, end_ns - self.start_ns, self.track, self.args
+        )
+        return False
+
+
+class Tracer:
+    """
+    全局追踪器。
+
+    用法：
+        with tracer.span("tool create_event", "tool", event=name):
+            ...
+    """
+
+    def __init__(self, max_events: int | None = None):
+        self.enabled = False
+        self._events: deque = deque(maxlen=max_events or settings.trace_max_events)
+        self._open: dict[int, list] = {}
+        self._track_ids = itertools.count(1)
+        self._origin_ns = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+
+    def clear(self) -> None:
+        self._events.clear()
+
+    def span(self, name: str, cat: str = "", **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def current_track(self) -> int:
+        span = _current_span.get()
+        return span.track if span is not None else 0
+
+    # 轨道栈 -----------------------------------------------------------
+
+    def _top(self, track: int):
+        stack = self._open.get(track)
+        return stack[-1] if stack else None
+
+    def _push(self, span: _Span) -> None:
+        self._open.setdefault(span.track, []).append(span)
+
+    def _pop(self, span: _Span) -> None:
+        stack = self._open.get(span.track)
+        if stack and span in stack:
+            stack.remove(span)
+            if not stack:
+                del self._open[span.track]
+
+    # 事件 -------------------------------------------------------------
+
+    def add_complete(
+        self,
+        name: str,
+        cat: str,
+        start_ns: int,
+        dur_ns: int,
+        track: int,
+        args: dict | None = None,
+    ) -> None:
+        """记录一个 complete 事件（时间为 perf_counter_ns）"""
+        self._events.append({
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": (start_ns - self._origin_ns) / 1000.0,
+            "dur": dur_ns / 1000.0,
+            "pid": self._pid,
+            "tid": track,
+            "args": args or {},
+        })
+
+    def export_chrome(self) -> dict:
+        """导出 Chrome trace-event JSON 对象"""
+        return {"traceEvents": list(self._events), "displayTimeUnit": "ms"}
+
+    def write(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.export_chrome(), f, ensure_ascii=False)
+
+
+def traced(cat: str):
+    """
+    async 方法装饰器：追踪开启时以 "<类名>.<方法名>" 为名包一层 span。
+    关闭时直接调用原函数。
+    """
+    def decorator(fn):
+        span_name = fn.__qualname__
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return await fn(*args, **kwargs)
+            with tracer.span(span_name, cat):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# 全局单例
+tracer = Tracer()
@@ -0,0 +1,246 @@
+"""
+Transport 池（preview_event 使用）
+ak.wwise.core.transport.create 创建的 transport 在 WAAPI 会话内一直存在，每次 play 都新建会泄漏。
+TransportPool 按 Event 复用 transport（按 GUID 索引，路径先解析为 GUID，路径 → GUID 缓存随项目变更失效）：
+
+  - 同一 Event 再次试听直接 executeAction，只需一次调用
+  - stop / pause / resume 定位到该 Event 的 transport，不再广播到 -1
+  - 订阅 ak.wwise.core.transport.stateChanged，跟踪 playing / paused / stopped 状态
+  - 空闲超过 settings.transport_idle_ttl 或池满（settings.transport_pool_size）时
+    对已停止的 transport 调用 transport.destroy
+  - 连接重建后旧 transport 全部失效，池自动清空并重新订阅
+"""
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Optional
+
+from ..config import settings
+from .exceptions import WwiseMCPError
+from .metrics import metrics
+from .snapshot import snapshots
+
+if TYPE_CHECKING:
+    from .adapter import WwiseAdapter
+
+logger = logging.getLogger("wwise_mcp.transport")
+
+STATE_TOPIC = "ak.wwise.core.transport.stateChanged"
+
+
+class _Transport:
+    __slots__ = ("transport_id", "event", "state", "last_used")
+
+    def __init__(self, transport_id: int, event: str):
+        self.transport_id = transport_id
+        self.event = event
+        self.state = "stopped"
+        self.last_used = time.monotonic()
+
+
+class TransportPool:
+    """
+    用法：
+        info = await transport_pool.execute(adapter, event_path, "play")
+        await transport_pool.execute(adapter, event_path, "stop")
+        await transport_pool.execute(adapter, None, "stop")   # 停止池中全部 transport
+    """
+
+    def __init__(self, idle_ttl: float | None = None, max_size: int | None = None):
+        self.idle_ttl = idle_ttl or settings.transport_idle_ttl
+        self.max_size = max_size or settings.transport_pool_size
+        self._by_event: dict[str, _Transport] = {}      # Event GUID → transport
+        self._event_ids: dict[str, str] = {}            # Event 路径 → GUID
+        self._by_id: dict[int, _Transport] = {}
+        self._generation = -1
+        self._subscription = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._created = 0
+        self._destroyed = 0
+        self._reused = 0
+
+    # ------------------------------------------------------------------
+    # 会话 / 订阅
+    # ------------------------------------------------------------------
+
+    async def _sync_session(self, adapter: "WwiseAdapter") -> None:
+        """连接重建后旧 transport id 失效：清空池并重新订阅状态通知"""
+        conn = adapter.connection
+        if conn.generation == self._generation:
+            return
+        self._by_event.clear()
+        self._by_id.clear()
+        self._event_ids.clear()
+        self._subscription = None
+        self._generation = conn.generation
+        self._loop = asyncio.get_running_loop()
+        try:
+            self._subscription = await conn.subscribe(STATE_TOPIC, self._on_state_changed)
+        except WwiseMCPError as e:
+            # 订阅失败不影响试听，只是状态以本地 executeAction 记录为准
+            logger.warning("订阅 %s 失败：%s", STATE_TOPIC, e)
+
+    def _on_state_changed(self, *args, **kwargs) -> None:
+        # waapi-client 事件线程 → 切回事件循环更新状态
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._apply_state, kwargs.get("transport"), kwargs.get("state"))
+
+    def _apply_state(self, transport_id, state) -> None:
+        entry = self._by_id.get(transport_id)
+        if entry is not None and state:
+            entry.state = state
+
+    async def _event_id(self, adapter: "WwiseAdapter", event: str) -> Optional[str]:
+        """Event 路径或 GUID → GUID（同一 Event 无论以哪种形式传入都对应同一个 transport）"""
+        if event.startswith("{"):
+            return event
+        cached = self._event_ids.get(event)
+        if cached:
+            return cached
+        await snapshots.watch(adapter.connection)   # 项目变更时清空路径缓存（重命名 / 删除后重建）
+        try:
+            rows = await adapter.get_objects(from_spec={"path": [event]}, return_fields=["id"])
+        except WwiseMCPError:
+            return None
+        obj_id = rows[0].get("id") if rows else None
+        if obj_id:
+            self._event_ids[event] = obj_id
+        return obj_id
+
+    # ------------------------------------------------------------------
+    # 池操作
+    # ------------------------------------------------------------------
+
+    async def execute(self, adapter: "WwiseAdapter", event: Optional[str], action: str) -> dict:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            await self._sync_session(adapter)
+            await self._reap(adapter)
+
+            if event is None:
+                # 未指定 Event：对池中全部 transport 执行（单次广播调用）
+                await adapter.call("ak.wwise.core.transport.executeAction", {"transport": -1, "action": action})
+                for entry in self._by_event.values():
+                    entry.state = _next_state(entry.state, action)
+                return {"transports": len(self._by_event)}
+
+            event_id = await self._event_id(adapter, event)
+            entry = self._by_event.get(event_id) if event_id else None
+            if entry is None:
+                if action != "play":
+                    return {"transport_id": None, "state": "stopped", "reused": False}
+                if event_id is None:
+                    raise _create_failed()
+                entry = await self._create(adapter, event_id)
+                reused = False
+            else:
+                reused = True
+                self._reused += 1
+
+            try:
+                await self._execute(adapter, entry, action)
+            except WwiseMCPError:
+                if not reused or action != "play":
+                    raise
+                # transport 可能已被 Wwise 侧销毁：丢弃并重建一次
+                self._forget(entry)
+                entry = await self._create(adapter, event_id)
+                reused = False
+                await self._execute(adapter, entry, action)
+
+            return {"transport_id": entry.transport_id, "state": entry.state, "reused": reused}
+
+    async def _create(self, adapter: "WwiseAdapter", event: str) -> _Transport:
+        if len(self._by_event) >= self.max_size:
+            await self._evict(adapter)
+        result = await adapter.call("ak.wwise.core.transport.create", {"object": event})
+        transport_id = (result or {}).get("transport")
+        if transport_id is None:
+            raise _create_failed()
+        entry = _Transport(transport_id, event)
+        self._by_event[event] = entry
+        self._by_id[transport_id] = entry
+        self._created += 1
+        return entry
+
+    async def _execute(self, adapter: "WwiseAdapter", entry: _Transport, action: str) -> None:
+        await adapter.call(
+            "ak.wwise.core.transport.executeAction",
+            {"transport": entry.transport_id, "action": action},
+        )
+        entry.state = _next_state(entry.state, action)
+        entry.last_used = time.monotonic()
+
+    def _forget(self, entry: _Transport) -> None:
+        self._by_event.pop(entry.event, None)
+        self._by_id.pop(entry.transport_id, None)
+
+    async def _destroy(self, adapter: "WwiseAdapter", entry: _Transport) -> None:
+        self._forget(entry)
+        self._destroyed += 1
+        try:
+            await adapter.call("ak.wwise.core.transport.destroy", {"transport": entry.transport_id})
+        except WwiseMCPError as e:
+            logger.debug("transport.destroy(%s) 失败：%s", entry.transport_id, e)
+
+    async def _reap(self, adapter: "WwiseAdapter") -> None:
+        """销毁空闲超时且未在播放的 transport"""
+        now = time.monotonic()
+        for entry in list(self._by_event.values()):
+            if entry.state != "playing" and now - entry.last_used > self.idle_ttl:
+                await self._destroy(adapter, entry)
+
+    async def _evict(self, adapter: "WwiseAdapter") -> None:
+        """池满：优先销毁最久未用的非播放 transport，全部在播放时销毁最久未用的一个"""
+        candidates = sorted(self._by_event.values(), key=lambda e: (e.state == "playing", e.last_used))
+        if candidates:
+            await self._destroy(adapter, candidates[0])
+
+    async def clear(self, adapter: "WwiseAdapter") -> int:
+        """销毁池中全部 transport"""
+        entries = list(self._by_event.values())
+        for entry in entries:
+            await self._destroy(adapter, entry)
+        return len(entries)
+
+    def stats(self) -> dict:
+        states: dict[str, int] = {}
+        for entry in self._by_event.values():
+            states[entry.state] = states.get(entry.state, 0) + 1
+        return {
+            "size": len(self._by_event),
+            "max_size": self.max_size,
+            "states": states,
+            "created": self._created,
+            "reused": self._reused,
+            "destroyed": self._destroyed,
+            "subscribed": self._subscription is not None,
+        }
+
+
+def _create_failed() -> WwiseMCPError:
+    return WwiseMCPError(
+        "Transport 创建失败，请确认 Event 路径正确且 Wwise 项目已加载",
+        code="waapi_error",
+        suggestion="可先调用 search_objects 或 get_selected_objects 确认路径",
+    )
+
+
+def _next_state(state: str, action: str) -> str:
+    # 本地先行推断，stateChanged 通知到达后以 Wwise 为准（例如非循环声音播放结束后回到 stopped）
+    if action in ("play", "resume"):
+        return "playing"
+    if action == "pause":
+        return "paused" if state == "playing" else state
+    if action == "stop":
+        return "stopped"
+    return state
+
+
+# 全局单例
+transport_pool = TransportPool()
+snapshots.add_listener(transport_pool._event_ids.clear)
+metrics.register_gauge("transport_pool", transport_pool.stats)
@@ -0,0 +1,41 @@
+from .hashing import HashCache, content_hash, find_duplicates
+from .riff import (
+    WavFormatError,
+    WavInfo,
+    collect_wav_files,
+    probe_files,
+    read_wav_info,
+    scan_wavs,
+    validate_wav,
+)
+
+__all__ = [
+    "HashCache",
+    "content_hash",
+    "find_duplicates",
+    "NUMPY_AVAILABLE",
+    "LoudnessCache",
+    "analyze_files",
+    "analyze_wav",
+    "suggest_offset",
+    "WavFormatError",
+    "WavInfo",
+    "collect_wav_files",
+    "probe_files",
+    "read_wav_info",
+    "scan_wavs",
+    "validate_wav",
+]
+
+
+_LOUDNESS_EXPORTS = {"NUMPY_AVAILABLE", "LoudnessCache", "analyze_files", "analyze_wav", "suggest_offset"}
+
+
+def __getattr__(name: str):
+    # loudness 依赖 numpy，按需导入，其他媒体工具不为此付出导入开销
+    if name in _LOUDNESS_EXPORTS:
+        from . import loudness
+        value = getattr(loudness, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,170 @@
+"""
+媒体内容哈希 + 重复文件检测
+不同名字的相同音频（逐字节相同，或只有元数据 chunk 不同的同一段采样）会重复占用磁盘与 Bank 内存。
+
+  - 候选过滤：先按文件头分组（WAV：编码 / 声道 / 采样率 / 位深 / data 长度；其他文件：大小），
+    只有组内超过一个文件时才需要哈希
+  - 哈希：WAV 只哈希格式字段 + data chunk（采样相同即视为重复，与 LIST / bext 等元数据无关），
+    其他文件哈希全部内容；mmap 分块读取，线程池并行（hashlib 在大块数据上释放 GIL）
+  - 增量：(path, size, mtime) → 哈希 持久化到 settings.media_hash_cache_path，未变化的文件不再读取
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from ..config import settings
+from .riff import WavInfo, probe_files
+
+logger = logging.getLogger("wwise_mcp.media.hashing")
+
+_BLOCK = 1 << 20
+
+
+class HashCache:
+    """(path, size, mtime) → 内容哈希，JSON 持久化"""
+
+    def __init__(self, path: str | None = None):
+        self.path = os.path.expanduser(path if path is not None else settings.media_hash_cache_path)
+        self._entries: dict[str, list] = {}     # path → [size, mtime, hash]
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("读取媒体哈希缓存失败（%s），将重新计算", e)
+            self._entries = {}
+
+    def get(self, path: str, size: int, mtime: float) -> Optional[str]:
+        entry = self._entries.get(path)
+        if entry and entry[0] == size and entry[1] == mtime:
+            return entry[2]
+        return None
+
+    def put(self, path: str, size: int, mtime: float, digest: str) -> None:
+        with self._lock:
+            self._entries[path] = [size, mtime, digest]
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty or not self.path:
+            return
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp = f"{self.path}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f, separators=(",", ":"))
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning("保存媒体哈希缓存失败：%s", e)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def content_hash(path: str, info: Optional[WavInfo] = None) -> str:
+    """WAV：格式字段 + data chunk 的哈希；其他文件（info 为 None）：全部内容的哈希"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if info is None:
+                start, end = 0, size
+            else:
+                digest.update(struct.pack(
+                    "<HHIH", info.format_tag, info.channels, info.sample_rate, info.bits_per_sample,
+                ))
+                start, end = info.data_offset, min(size, info.data_offset + info.data_size)
+            for pos in range(start, end, _BLOCK):
+                digest.update(mm[pos:min(pos + _BLOCK, end)])
+    return digest.hexdigest()
+
+
+def _candidate_key(size: int, info: Optional[WavInfo]) -> tuple:
+    if info is None:
+        return ("file", size)
+    return ("wav", info.format_tag, info.channels, info.sample_rate, info.bits_per_sample, info.data_size)
+
+
+def find_duplicates(
+    paths: Iterable[str],
+    cache: Optional[HashCache] = None,
+    workers: int | None = None,
+) -> tuple[list[tuple[int, list[str]]], dict]:
+    """
+    找出内容相同的文件组。
+
+    Returns:
+        (重复组列表，每组为 (单个文件字节数, 按路径排序的文件列表)；
+         统计 {"files", "candidates", "hashed", "cached", "missing"})
+    """
+    probes = probe_files(paths, workers)
+    missing = [p for p, (size, _) in probes.items() if size < 0]
+
+    buckets: dict[tuple, list[str]] = {}
+    for path, (size, info) in probes.items():
+        if size >= 0:
+            buckets.setdefault(_candidate_key(size, info), []).append(path)
+    candidates = [p for group in buckets.values() if len(group) > 1 for p in group]
+
+    digests: dict[str, str] = {}
+    todo: list[tuple[str, int, float, Optional[WavInfo]]] = []
+    for path in candidates:
+        size, info = probes[path]
+        mtime = info.mtime if info is not None else os.stat(path).st_mtime
+        cached = cache.get(path, size, mtime) if cache is not None else None
+        if cached:
+            digests[path] = cached
+        else:
+            todo.append((path, size, mtime, info))
+
+    def work(item):
+        path, size, mtime, info = item
+        try:
+            return path, size, mtime, content_hash(path, info)
+        except OSError as e:
+            logger.warning("读取 %s 失败：%s", path, e)
+            return path, size, mtime, None
+
+    cached_count = len(digests)
+    with ThreadPoolExecutor(max_workers=workers or settings.media_workers) as pool:
+        for path, size, mtime, digest in pool.map(work, todo):
+            if digest is None:
+                continue
+            digests[path] = digest
+            if cache is not None:
+                cache.put(path, size, mtime, digest)
+    if cache is not None:
+        cache.save()
+
+    groups: dict[tuple, list[str]] = {}
+    for path, digest in digests.items():
+        size, info = probes[path]
+        groups.setdefault((_candidate_key(size, info), digest), []).append(path)
+    duplicates = sorted(
+        ((probes[g[0]][0], sorted(g)) for g in groups.values() if len(g) > 1),
+        key=lambda group: group[1][0],
+    )
+    return duplicates, {
+        "files": len(probes),
+        "candidates": len(candidates),
+        "hashed": len(todo),
+        "cached": cached_count,
+        "missing": len(missing),
+    }
@@ -0,0 +1,245 @@
+"""
+源媒体响度分析（需要 numpy，可选依赖：pip install "wwise-mcp[analysis]"）
+按块解码 PCM / float WAV（mmap，每块 settings.loudness_block_frames 帧，内存占用与文件长度无关），计算：
+
+  - peak_db：采样峰值（dBFS）
+  - rms_db：全文件 RMS（dBFS，各声道能量平均）
+  - loudness：近似积分响度（LUFS）。按 BS.1770 的 400 ms 块 / 75% 重叠、-70 LUFS 绝对门限与
+    -10 LU 相对门限计算，但不做 K 计权滤波（IIR 无法向量化），对宽频素材误差通常在 1~2 LU 内
+
+多个文件在进程池中并行分析；结果按内容哈希（hashing.content_hash）持久化缓存，
+文件未变化时（(path, size, mtime) 命中哈希缓存）不再读取。
+"""
+
+import json
+import logging
+import math
+import mmap
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from ..config import settings
+from .hashing import HashCache, content_hash
+from .riff import WAVE_FORMAT_IEEE_FLOAT, WAVE_FORMAT_PCM, read_wav_info
+
+logger = logging.getLogger("wwise_mcp.media.loudness")
+
+_SEGMENT_S = 0.1                # 100 ms 段，4 段组成一个 400 ms 门限块
+_ABSOLUTE_GATE = -70.0
+_RELATIVE_GATE = -10.0
+_SILENCE_DB = -150.0
+
+
+def _require_numpy() -> None:
+    if not NUMPY_AVAILABLE:
+        raise ImportError('响度分析需要 numpy，请安装：pip install "wwise-mcp[analysis]"')
+
+
+def _db(power: float) -> float:
+    return 10 * math.log10(power) if power > 0 else _SILENCE_DB
+
+
+def _decode(raw, format_tag: int, bits: int, channels: int) -> "np.ndarray":
+    """原始字节 → float64 采样矩阵 (frames, channels)，满幅为 ±1"""
+    if format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        samples = np.frombuffer(raw, dtype="<f4" if bits == 32 else "<f8").astype(np.float64)
+    elif bits == 8:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float64) - 128.0) / 128.0
+    elif bits == 16:
+        samples = np.frombuffer(raw, dtype="<i2") / 32768.0
+    elif bits == 24:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = ((b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)) << 8 >> 8) / 8388608.0
+    elif bits == 32:
+        samples = np.frombuffer(raw, dtype="<i4") / 2147483648.0
+    else:
+        raise ValueError(f"不支持的位深：{bits}")
+    return samples.reshape(-1, channels)
+
+
+def analyze_wav(path: str, block_frames: int | None = None) -> dict:
+    """分块计算单个 WAV 的 peak / RMS / 近似积分响度"""
+    _require_numpy()
+    info = read_wav_info(path)
+    if info.format_tag not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT):
+        raise ValueError(f"不支持的编码格式 {info.codec}")
+    segment = max(1, int(info.sample_rate * _SEGMENT_S))
+    block_frames = max(segment, (block_frames or settings.loudness_block_frames) // segment * segment)
+
+    peak = 0.0
+    energy = 0.0
+    segments: list["np.ndarray"] = []         # 每 100 ms 段的声道能量和（均方）
+    carry = np.empty((0, info.channels))
+    end = min(info.size, info.data_offset + info.data_size)
+    frames_total = (end - info.data_offset) // info.block_align
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for start in range(0, frames_total, block_frames):
+            stop = min(frames_total, start + block_frames)
+            raw = mm[info.data_offset + start * info.block_align:info.data_offset + stop * info.block_align]
+            block = _decode(raw, info.format_tag, info.bits_per_sample, info.channels)
+            if not len(block):
+                continue
+            peak = max(peak, float(np.abs(block).max()))
+            squares = block * block
+            energy += float(squares.sum())
+
+            squares = np.concatenate([carry, squares]) if len(carry) else squares
+            whole = len(squares) // segment * segment
+            if whole:
+                segments.append(squares[:whole].reshape(-1, segment, info.channels).mean(axis=1).sum(axis=1))
+            carry = squares[whole:]
+
+    frames = max(1, frames_total)
+    result = {
+        "duration_s": round(frames_total / info.sample_rate, 3) if info.sample_rate else 0.0,
+        "channels": info.channels,
+        "sample_rate": info.sample_rate,
+        "peak_db": round(_db(peak * peak), 2),
+        "rms_db": round(_db(energy / (frames * info.channels)), 2),
+        "loudness": None,
+    }
+
+    power = np.concatenate(segments) if segments else np.empty(0)
+    if len(power) >= 4:
+        # 400 ms 块 = 连续 4 个 100 ms 段的均值（步长 100 ms，即 75% 重叠）
+        blocks = np.convolve(power, np.full(4, 0.25), mode="valid")
+        with np.errstate(divide="ignore"):
+            block_lufs = -0.691 + 10 * np.log10(blocks)
+        gated = blocks[block_lufs > _ABSOLUTE_GATE]
+        if len(gated):
+            relative = -0.691 + 10 * math.log10(float(gated.mean())) + _RELATIVE_GATE
+            gated = blocks[block_lufs > max(relative, _ABSOLUTE_GATE)]
+            result["loudness"] = round(-0.691 + 10 * math.log10(float(gated.mean())), 2)
+    elif frames_total:
+        # 不足 400 ms 的短音效：以整体能量近似
+        mean_power = float(power.mean()) if len(power) else energy / frames
+        result["loudness"] = round(-0.691 + _db(mean_power), 2)
+    return result
+
+
+def _analyze(path: str) -> tuple[str, int, float, Optional[str], dict]:
+    """进程池工作函数：(path, size, mtime, 内容哈希, 结果或 {"error"})"""
+    try:
+        info = read_wav_info(path)
+        digest = content_hash(path, info)
+        return path, info.size, info.mtime, digest, analyze_wav(path)
+    except Exception as e:
+        return path, -1, 0.0, None, {"error": str(e)}
+
+
+class LoudnessCache:
+    """内容哈希 → 分析结果，JSON 持久化"""
+
+    def __init__(self, path: str | None = None):
+        self.path = os.path.expanduser(path if path is not None else settings.loudness_cache_path)
+        self._entries: dict[str, dict] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("读取响度缓存失败（%s），将重新分析", e)
+
+    def get(self, digest: str) -> Optional[dict]:
+        return self._entries.get(digest)
+
+    def put(self, digest: str, result: dict) -> None:
+        with self._lock:
+            self._entries[digest] = result
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty or not self.path:
+            return
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp = f"{self.path}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f, separators=(",", ":"))
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError as e:
+                logger.warning("保存响度缓存失败：%s", e)
+
+
+def analyze_files(
+    paths: Iterable[str],
+    hashes: Optional[HashCache] = None,
+    cache: Optional[LoudnessCache] = None,
+    workers: int | None = None,
+) -> tuple[dict[str, dict], dict]:
+    """
+    批量分析（进程池）。已缓存的文件直接返回缓存结果。
+
+    Returns:
+        (path → 结果（失败时为 {"error"}），统计 {"files", "analyzed", "cached", "failed"})
+    """
+    _require_numpy()
+    results: dict[str, dict] = {}
+    todo: list[str] = []
+    for path in dict.fromkeys(paths):
+        cached = None
+        if hashes is not None and cache is not None:
+            try:
+                st = os.stat(path)
+                digest = hashes.get(path, st.st_size, st.st_mtime)
+                cached = cache.get(digest) if digest else None
+            except OSError:
+                pass
+        if cached is not None:
+            results[path] = cached
+        else:
+            todo.append(path)
+
+    cached_count = len(results)
+    failed = 0
+    if todo:
+        workers = min(workers or settings.loudness_workers or os.cpu_count() or 1, len(todo))
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        outputs = (
+            pool.map(_analyze, todo, chunksize=max(1, len(todo) // (workers * 4)))
+            if pool is not None else map(_analyze, todo)
+        )
+        try:
+            for path, size, mtime, digest, result in outputs:
+                results[path] = result
+                if digest is None:
+                    failed += 1
+                    continue
+                if hashes is not None:
+                    hashes.put(path, size, mtime, digest)
+                if cache is not None:
+                    cache.put(digest, result)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    if hashes is not None:
+        hashes.save()
+    if cache is not None:
+        cache.save()
+    return results, {"files": len(results), "analyzed": len(todo), "cached": cached_count, "failed": failed}
+
+
+def suggest_offset(result: dict, target: float, peak_ceiling: float) -> Optional[float]:
+    """达到目标响度所需的 Volume 偏移（dB），并保证 peak + 偏移 不超过 peak_ceiling"""
+    loudness = result.get("loudness")
+    if loudness is None:
+        return None
+    offset = target - loudness
+    peak = result.get("peak_db")
+    if peak is not None and peak > _SILENCE_DB:
+        offset = min(offset, peak_ceiling - peak)
+    return round(offset, 2)
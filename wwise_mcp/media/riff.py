@@ -0,0 +1,202 @@
+"""
+WAV（RIFF/RF64）文件头解析
+通过 mmap 只访问 chunk 头与 fmt 块，不读取采样数据：解析一个文件只触及前几个内存页，
+大批量文件的校验/统计由文件系统元数据 I/O 主导。
+"""
+
+import mmap
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable
+
+from ..config import settings
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+_CODECS = {WAVE_FORMAT_PCM: "pcm", WAVE_FORMAT_IEEE_FLOAT: "float"}
+
+
+class WavFormatError(ValueError):
+    """文件不是可解析的 WAV（或 chunk 结构损坏）"""
+
+
+@dataclass(slots=True)
+class WavInfo:
+    path: str
+    size: int                 # 文件字节数
+    mtime: float
+    format_tag: int           # WAVE_FORMAT_EXTENSIBLE 时为 SubFormat 的实际格式
+    channels: int
+    sample_rate: int
+    bits_per_sample: int
+    block_align: int
+    data_offset: int          # 采样数据起始偏移
+    data_size: int            # data chunk 声明的字节数
+
+    @property
+    def codec(self) -> str:
+        return _CODECS.get(self.format_tag, f"0x{self.format_tag:04x}")
+
+    @property
+    def frames(self) -> int:
+        return self.data_size // self.block_align if self.block_align else 0
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.sample_rate if self.sample_rate else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["codec"] = self.codec
+        data["frames"] = self.frames
+        data["duration"] = round(self.duration, 6)
+        return data
+
+
+def read_wav_info(path: str | os.PathLike) -> WavInfo:
+    """解析 WAV 文件头；结构无法解析时抛出 WavFormatError（文件不存在等抛出 OSError）"""
+    path = os.fspath(path)
+    st = os.stat(path)
+    if st.st_size < 12:
+        raise WavFormatError("文件过短，不是 RIFF/WAVE")
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic = mm[0:4]
+        if magic not in (b"RIFF", b"RF64") or mm[8:12] != b"WAVE":
+            raise WavFormatError("缺少 RIFF/WAVE 文件头")
+
+        size = len(mm)
+        pos = 12
+        fmt = None
+        data_offset = data_size = None
+        ds64_data_size = None
+
+        while pos + 8 <= size:
+            chunk_id = mm[pos:pos + 4]
+            (chunk_size,) = struct.unpack_from("<I", mm, pos + 4)
+            body = pos + 8
+            if chunk_id == b"ds64" and body + 16 <= size:
+                _, ds64_data_size = struct.unpack_from("<QQ", mm, body)
+            elif chunk_id == b"fmt ":
+                if chunk_size < 16 or body + 16 > size:
+                    raise WavFormatError("fmt chunk 过短")
+                tag, channels, rate, _, block_align, bits = struct.unpack_from("<HHIIHH", mm, body)
+                if tag == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 40 and body + 26 <= size:
+                    # SubFormat GUID 的前两个字节即实际格式
+                    (tag,) = struct.unpack_from("<H", mm, body + 24)
+                fmt = (tag, channels, rate, block_align, bits)
+            elif chunk_id == b"data":
+                data_offset = body
+                data_size = chunk_size
+                if magic == b"RF64" and chunk_size == 0xFFFFFFFF and ds64_data_size is not None:
+                    data_size = ds64_data_size
+                if fmt is not None:
+                    break  # 不需要再遍历 data 之后的 chunk
+                chunk_size = data_size
+            pos = body + chunk_size + (chunk_size & 1)
+
+    if fmt is None:
+        raise WavFormatError("缺少 fmt chunk")
+    if data_offset is None:
+        raise WavFormatError("缺少 data chunk")
+
+    tag, channels, rate, block_align, bits = fmt
+    return WavInfo(
+        path=path,
+        size=st.st_size,
+        mtime=st.st_mtime,
+        format_tag=tag,
+        channels=channels,
+        sample_rate=rate,
+        bits_per_sample=bits,
+        block_align=block_align,
+        data_offset=data_offset,
+        data_size=data_size,
+    )
+
+
+def validate_wav(info: WavInfo) -> list[str]:
+    """Wwise 导入前的本地校验，返回问题列表（空列表表示通过）"""
+    problems = []
+    if info.format_tag not in _CODECS:
+        problems.append(f"不支持的编码格式 {info.codec}（仅支持 PCM / IEEE float）")
+    if not 1 <= info.channels <= 255:
+        problems.append(f"声道数异常：{info.channels}")
+    if not 1 <= info.sample_rate <= 768_000:
+        problems.append(f"采样率异常：{info.sample_rate}")
+    if info.format_tag == WAVE_FORMAT_PCM and info.bits_per_sample not in (8, 16, 24, 32):
+        problems.append(f"PCM 位深异常：{info.bits_per_sample}")
+    if info.format_tag == WAVE_FORMAT_IEEE_FLOAT and info.bits_per_sample not in (32, 64):
+        problems.append(f"float 位深异常：{info.bits_per_sample}")
+    if info.block_align != info.channels * ((info.bits_per_sample + 7) // 8):
+        problems.append(f"block_align 与声道/位深不一致：{info.block_align}")
+    if info.data_size == 0:
+        problems.append("data chunk 为空")
+    elif info.data_offset + info.data_size > info.size:
+        problems.append(
+            f"data chunk 被截断：声明 {info.data_size} 字节，实际仅 {info.size - info.data_offset} 字节"
+        )
+    return problems
+
+
+def _inspect(path: str) -> tuple[WavInfo | None, str | None]:
+    try:
+        info = read_wav_info(path)
+    except (OSError, WavFormatError, ValueError, struct.error) as e:
+        return None, str(e)
+    problems = validate_wav(info)
+    return info, "；".join(problems) if problems else None
+
+
+def scan_wavs(paths: Iterable[str], workers: int | None = None) -> tuple[list[WavInfo], list[dict]]:
+    """
+    在线程池中并行解析并校验文件头（结果顺序与输入一致）。
+
+    Returns:
+        (通过校验的 WavInfo 列表, [{"path", "error"}] 被拒绝的文件)
+    """
+    paths = list(paths)
+    valid: list[WavInfo] = []
+    rejected: list[dict] = []
+    with ThreadPoolExecutor(max_workers=workers or settings.media_workers) as pool:
+        for path, (info, error) in zip(paths, pool.map(_inspect, paths)):
+            if error is None:
+                valid.append(info)
+            else:
+                rejected.append({"path": path, "error": error})
+    return valid, rejected
+
+
+def _probe(path: str) -> tuple[int, WavInfo | None]:
+    try:
+        size = os.stat(path).st_size
+    except OSError:
+        return -1, None
+    try:
+        return size, read_wav_info(path)
+    except (OSError, WavFormatError, ValueError, struct.error):
+        return size, None
+
+
+def probe_files(paths: Iterable[str], workers: int | None = None) -> dict[str, tuple[int, WavInfo | None]]:
+    """
+    在线程池中并行获取文件大小并解析 WAV 头（不做导入校验），用于统计媒体占用。
+
+    Returns:
+        path → (文件字节数，不存在为 -1；WavInfo，非 WAV 或无法解析为 None)
+    """
+    paths = list(dict.fromkeys(paths))
+    with ThreadPoolExecutor(max_workers=workers or settings.media_workers) as pool:
+        return dict(zip(paths, pool.map(_probe, paths)))
+
+
+def collect_wav_files(directory: str, recursive: bool = True) -> list[str]:
+    """列出目录下的 .wav 文件（按路径排序）"""
+    root = Path(directory)
+    pattern = "**/*" if recursive else "*"
+    return sorted(str(p) for p in root.glob(pattern) if p.is_file() and p.suffix.lower() == ".wav")
@@ -1,4 +1,12 @@
 from .system_prompt import get_full_system_prompt, STATIC_SYSTEM_PROMPT
-from .dynamic_context import build_dynamic_context
 
 __all__ = ["get_full_system_prompt", "STATIC_SYSTEM_PROMPT", "build_dynamic_context"]
+
+
+def __getattr__(name: str):
+    # dynamic_context 依赖 WAAPI 收集器，按需导入以免拖慢 server 启动
+    if name == "build_dynamic_context":
+        from .dynamic_context import build_dynamic_context
+        globals()[name] = build_dynamic_context
+        return build_dynamic_context
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,4 +1,19 @@
-from .context_collector import WwiseRAG
-from .doc_index import WwiseDocIndex, doc_index
+import importlib
+
+# 按需导入：只使用 doc_index 时不加载 context_collector（及其 WAAPI 依赖）
+_LAZY = {
+    "WwiseRAG": "context_collector",
+    "WwiseDocIndex": "doc_index",
+    "doc_index": "doc_index",
+}
 
 __all__ = ["WwiseRAG", "WwiseDocIndex", "doc_index"]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
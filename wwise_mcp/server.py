@@ -1,6 +1,6 @@
 """
 WwiseMCP Server
-FastMCP instance + 22 tools + lifecycle management
+FastMCP instance + 39 tools + lifecycle management
 
 Start:
   python -m wwise_mcp.server          # stdio mode (Cursor / Claude Desktop)
@@ -8,46 +8,29 @@ Start:
 """
 
 import asyncio
+import atexit
+import functools
+import json
 import logging
 import os
 import sys
+import threading
+import time
 from contextlib import asynccontextmanager
 from typing import Any
 
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
 
 from .config import settings
 from .core import init_connection
+from .core.budget import shape_response
+from .core.jobs import job_manager
+from .core.metrics import current_tool, metrics
+from .core.profiling import profiler
+from .core.scheduler import BULK, INTERACTIVE, NORMAL, current_priority
+from .core.tracing import tracer
 from .prompts.system_prompt import STATIC_SYSTEM_PROMPT
-from .rag.context_collector import build_dynamic_context
-from .tools import (
-    # Query
-    get_project_hierarchy,
-    get_object_properties,
-    search_objects,
-    get_bus_topology,
-    get_event_actions,
-    get_soundbank_info,
-    get_rtpc_list,
-    get_selected_objects,
-    get_effect_chain,
-    # Action
-    create_object,
-    set_property,
-    create_event,
-    assign_bus,
-    delete_object,
-    move_object,
-    preview_event,
-    set_rtpc_binding,
-    add_effect,
-    remove_effect,
-    # Verify
-    verify_structure,
-    verify_event_completeness,
-    # Fallback
-    execute_waapi,
-)
+from . import tools  # tool modules are imported lazily on first call (tools.__getattr__)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -82,44 +65,111 @@ async def _ensure_connection():
             logger.info("WAAPI connected: %s", settings.waapi_url)
         except Exception as e:
             logger.warning("WAAPI initial connection failed (will retry on tool call): %s", e)
+        metrics.start_periodic_log()
         _connection_initialized = True
 
 
+def _instrumented(priority: str = NORMAL):
+    """
+    Per-tool instrumentation wrapper (sits between @mcp.tool() and the handler).
+
+    Declares the tool's WAAPI scheduling class (interactive / normal / bulk),
+    sets the current tool name so WAAPI calls made underneath are attributed
+    to it, and records end-to-end latency plus failures in the metrics registry.
+    A tool counts as failed when it raises or returns {"success": False}.
+    When tracing is enabled the handler also runs inside a root "tool" span.
+    The handler's code object is registered with the sampling profiler so
+    --profile samples can be attributed to the tool.
+    """
+    def decorator(fn):
+        name = fn.__name__.removeprefix("tool_")
+        span_name = f"tool {name}"
+        profiler.register(fn.__code__, name)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            tool_token = current_tool.set(name)
+            priority_token = current_priority.set(priority)
+            started = time.perf_counter()
+            error = True
+            try:
+                with tracer.span(span_name, "tool", priority=priority):
+                    result = await fn(*args, **kwargs)
+                error = isinstance(result, dict) and result.get("success") is False
+                return result
+            finally:
+                metrics.record_tool(name, time.perf_counter() - started, error=error)
+                current_priority.reset(priority_token)
+                current_tool.reset(tool_token)
+
+        return wrapper
+
+    return decorator
+
+
 # ------------------------------------------------------------------
-# Query tools (9)
+# Query tools (15)
 # ------------------------------------------------------------------
 
 @mcp.tool()
-async def tool_get_project_hierarchy() -> dict:
+@_instrumented(INTERACTIVE)
+async def tool_get_project_hierarchy(
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+) -> dict:
     """
     Get a top-level overview of the Wwise project structure.
     Returns object counts and types for each major hierarchy
     (Actor-Mixer, Master-Mixer, Events, etc.).
     Note: In Wwise 2024.1 Auto-Defined SoundBank mode the SoundBanks node
     may be empty — this is expected behaviour.
+
+    Args:
+        fields:      Only return these fields for each result row (projection)
+        max_tokens:  Response budget in approx. tokens (default 8000); over budget, rows are
+                     replaced by aggregates (counts by type / parent) plus a get_page cursor
+        max_bytes:   Response budget in bytes (overrides max_tokens)
     """
     await _ensure_connection()
-    return await get_project_hierarchy()
+    result = await tools.get_project_hierarchy()
+    return shape_response(result, "get_project_hierarchy", fields, max_tokens, max_bytes)
 
 
 @mcp.tool()
-async def tool_get_selected_objects() -> dict:
+@_instrumented(INTERACTIVE)
+async def tool_get_selected_objects(
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+) -> dict:
     """
     Get the list of objects currently selected in the Wwise UI.
 
     Allows Claude to know what the user has selected without requiring
     them to copy-paste paths. Call this first before any operation so
     the selected objects can serve as the starting point.
+
+    Args:
+        fields:      Only return these fields for each result row (projection)
+        max_tokens:  Response budget in approx. tokens (default 8000); over budget, rows are
+                     replaced by aggregates (counts by type / parent) plus a get_page cursor
+        max_bytes:   Response budget in bytes (overrides max_tokens)
     """
     await _ensure_connection()
-    return await get_selected_objects()
+    result = await tools.get_selected_objects()
+    return shape_response(result, "get_selected_objects", fields, max_tokens, max_bytes)
 
 
 @mcp.tool()
+@_instrumented(INTERACTIVE)
 async def tool_get_object_properties(
     object_path: str,
     page: int = 1,
     page_size: int = 30,
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
 ) -> dict:
     """
     Get property details for a specific Wwise object.
@@ -128,16 +178,27 @@ async def tool_get_object_properties(
         object_path: WAAPI path, e.g. '\\\\Actor-Mixer Hierarchy\\\\Default Work Unit\\\\MySFX'
         page:        Page number (starts at 1)
         page_size:   Properties per page, default 30
+        fields:      Only return these fields for each result row (projection)
+        max_tokens:  Response budget in approx. tokens (default 8000); over budget, rows are
+                     replaced by aggregates (counts by type / parent) plus a get_page cursor
+        max_bytes:   Response budget in bytes (overrides max_tokens)
     """
     await _ensure_connection()
-    return await get_object_properties(object_path, page, page_size)
+    result = await tools.get_object_properties(object_path, page, page_size)
+    return shape_response(result, "get_object_properties", fields, max_tokens, max_bytes)
 
 
 @mcp.tool()
+@_instrumented(NORMAL)
 async def tool_search_objects(
     query: str,
     type_filter: str | None = None,
     max_results: int = 20,
+    cursor: str | None = None,
+    scope_path: str | None = None,
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
 ) -> dict:
     """
     Fuzzy-search Wwise objects by name.
@@ -145,80 +206,323 @@ async def tool_search_objects(
     Args:
         query:       Search keyword (case-insensitive substring match)
         type_filter: Optional type filter, e.g. 'Sound SFX', 'Event', 'Bus', 'GameParameter'
-        max_results: Maximum results to return, default 20
+        max_results: Page size, default 20
+        cursor:      next_cursor from the previous page (pages are served from a cached snapshot)
+        scope_path:  Optional path; only search its descendants
+        fields:      Only return these fields for each result row (projection)
+        max_tokens:  Response budget in approx. tokens (default 8000); over budget, rows are
+                     replaced by aggregates (counts by type / parent) plus a get_page cursor
+        max_bytes:   Response budget in bytes (overrides max_tokens)
     """
     await _ensure_connection()
-    return await search_objects(query, type_filter, max_results)
+    result = await tools.search_objects(query, type_filter, max_results, cursor, scope_path)
+    return shape_response(result, "search_objects", fields, max_tokens, max_bytes)
 
 
 @mcp.tool()
-async def tool_get_bus_topology() -> dict:
+@_instrumented(NORMAL)
+async def tool_get_bus_topology(
+    max_results: int = 100,
+    cursor: str | None = None,
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+) -> dict:
     """
     Get the full Bus topology from the Master-Mixer Hierarchy (mixing routing architecture).
+
+    Args:
+        max_results: Page size, default 100
+        cursor:      next_cursor from the previous page
+        fields:      Only return these fields for each result row (projection)
+        max_tokens:  Response budget in approx. tokens (default 8000); over budget, rows are
+                     replaced by aggregates (counts by type / parent) plus a get_page cursor
+        max_bytes:   Response budget in bytes (overrides max_tokens)
+    """
+    await _ensure_connection()
+    result = await tools.get_bus_topology(max_results, cursor)
+    return shape_response(result, "get_bus_topology", fields, max_tokens, max_bytes)
+
+
+@mcp.tool()
+@_instrumented(NORMAL)
+async def tool_get_property_matrix(
+    properties: list[str],
+    objects: list[str] | None = None,
+    scope_path: str | None = None,
+    object_type: str | None = None,
+    max_objects: int = 5000,
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+) -> dict:
+    """
+    Read property/reference values for many objects at once, returned as a columnar table
+    (columns: id, name, path, type, then one array per requested property).
+    Prefer this over calling get_object_properties per object.
+    Over budget, only the first rows are returned; read the rest with get_page(columns_cursor).
+
+    Args:
+        properties:  Property or reference names, e.g. ["Volume", "Pitch", "OutputBus"]
+        objects:     Object paths or ids (or use scope_path / object_type)
+        scope_path:  Read all descendants of this path
+        object_type: Type filter for scope_path, e.g. 'Sound'; without scope_path, project-wide
+        max_objects: Maximum rows, default 5000
+        fields:      Only return these columns (projection), e.g. ["path", "Volume"]
+        max_tokens:  Response budget in approx. tokens (default 8000)
+        max_bytes:   Response budget in bytes (overrides max_tokens)
+    """
+    await _ensure_connection()
+    result = await tools.get_property_matrix(properties, objects, scope_path, object_type, max_objects)
+    return shape_response(result, "get_property_matrix", fields, max_tokens, max_bytes)
+
+
+@mcp.tool()
+@_instrumented(NORMAL)
+async def tool_query_properties(
+    where: list[dict] | None = None,
+    scope_path: str | None = None,
+    object_type: str | None = None,
+    group_by: str | None = None,
+    aggregate: list[str] | None = None,
+    max_results: int = 100,
+) -> dict:
+    """
+    Filter and aggregate objects by property values, evaluated in memory over a cached
+    columnar table (requires numpy). Only matching objects are returned. Use it for questions
+    like "all Sounds louder than -3 dB routed to SFX" or "Volume range per parent".
+
+    Args:
+        where:       AND-ed conditions, e.g. [{"prop": "Volume", "op": ">", "value": -3},
+                     {"prop": "OutputBus", "op": "==", "value": "SFX"}].
+                     ops: == != < <= > >= between in exists missing; {"any": [...]} for OR.
+                     'type' and 'parent' (path or id) are always available
+        scope_path:  Limit to descendants of this path (scope_path and/or object_type required)
+        object_type: Type filter, e.g. 'Sound'
+        group_by:    Group matches by 'type', 'parent' or a reference/string property (e.g. 'OutputBus')
+        aggregate:   Numeric properties to summarize per group (min / max / mean)
+        max_results: Maximum matching objects to return, default 100
+    """
+    await _ensure_connection()
+    return await tools.query_properties(where, scope_path, object_type, group_by, aggregate, max_results)
+
+
+@mcp.tool()
+@_instrumented(NORMAL)
+async def tool_get_effective_values(
+    properties: list[str],
+    objects: list[str] | None = None,
+    scope_path: str | None = None,
+    object_type: str | None = None,
+    max_objects: int = 10000,
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+) -> dict:
+    """
+    Compute effective (inherited) property values, e.g. the bus a Sound actually routes to.
+    OutputBus, positioning, voice limits etc. come from the nearest ancestor with the matching
+    Override flag enabled (returned as '<prop>@source'); Volume / Pitch / filters are summed
+    along the hierarchy. Returns a columnar table (path + one array per property).
+    Over budget, only the first rows are returned; read the rest with get_page(columns_cursor).
+
+    Args:
+        properties:  Property names, e.g. ["OutputBus", "Volume"]
+        objects:     Object paths or ids (or use scope_path / object_type)
+        scope_path:  Resolve all descendants of this path
+        object_type: Type filter, e.g. 'Sound'
+        max_objects: Maximum objects, default 10000
+        fields:      Only return these columns (projection); '<prop>@source' follows '<prop>'
+        max_tokens:  Response budget in approx. tokens (default 8000)
+        max_bytes:   Response budget in bytes (overrides max_tokens)
+    """
+    await _ensure_connection()
+    result = await tools.get_effective_values(properties, objects, scope_path, object_type, max_objects)
+    return shape_response(result, "get_effective_values", fields, max_tokens, max_bytes)
+
+
+@mcp.tool()
+@_instrumented(NORMAL)
+async def tool_get_event_media(
+    event_path: str,
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+) -> dict:
+    """
+    List every AudioFileSource (and its original audio file) an Event can play,
+    following Play Actions through containers. Served from an in-memory index that is
+    built once and then updated incrementally from project change notifications.
+
+    Args:
+        event_path: Full path or GUID of the Event
+        fields:      Only return these fields for each result row (projection)
+        max_tokens:  Response budget in approx. tokens (default 8000); over budget, rows are
+                     replaced by aggregates plus a get_page cursor
+        max_bytes:   Response budget in bytes (overrides max_tokens)
     """
     await _ensure_connection()
-    return await get_bus_topology()
+    result = await tools.get_event_media(event_path)
+    return shape_response(result, "get_event_media", fields, max_tokens, max_bytes)
 
 
 @mcp.tool()
-async def tool_get_event_actions(event_path: str) -> dict:
+@_instrumented(NORMAL)
+async def tool_find_media_users(
+    audio_file: str,
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+) -> dict:
+    """
+    Find which AudioFileSources reference an audio file and which Events can play it.
+
+    Args:
+        audio_file: Full path of the original file, or just the file name (e.g. 'Footstep_01.wav')
+        fields:      Only return these fields for each result row (projection)
+        max_tokens:  Response budget in approx. tokens (default 8000)
+        max_bytes:   Response budget in bytes (overrides max_tokens)
+    """
+    await _ensure_connection()
+    result = await tools.find_media_users(audio_file)
+    return shape_response(result, "find_media_users", fields, max_tokens, max_bytes)
+
+
+@mcp.tool()
+@_instrumented(INTERACTIVE)
+async def tool_get_page(
+    cursor: str,
+    max_results: int = 50,
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+) -> dict:
+    """
+    Read the next page of a cached result snapshot.
+    Use it with cursors returned by any read tool (next_cursor, or the '<list>_cursor'
+    returned when a response exceeded its budget). No WAAPI call is made.
+
+    Args:
+        cursor:      Cursor from a previous response
+        max_results: Page size, default 50 (see budget.suggested_page_size)
+        fields:      Only return these fields for each result row (projection)
+        max_tokens:  Response budget in approx. tokens (default 8000)
+        max_bytes:   Response budget in bytes (overrides max_tokens)
+    """
+    result = await tools.get_page(cursor, max_results)
+    return shape_response(result, "get_page", fields, max_tokens, max_bytes)
+
+
+@mcp.tool()
+@_instrumented(INTERACTIVE)
+async def tool_get_event_actions(
+    event_path: str,
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+) -> dict:
     """
     Get all Actions under a specific Event (type, Target reference, etc.).
 
     Args:
         event_path: Full WAAPI path of the Event object
+        fields:      Only return these fields for each result row (projection)
+        max_tokens:  Response budget in approx. tokens (default 8000); over budget, rows are
+                     replaced by aggregates (counts by type / parent) plus a get_page cursor
+        max_bytes:   Response budget in bytes (overrides max_tokens)
     """
     await _ensure_connection()
-    return await get_event_actions(event_path)
+    result = await tools.get_event_actions(event_path)
+    return shape_response(result, "get_event_actions", fields, max_tokens, max_bytes)
 
 
 @mcp.tool()
-async def tool_get_soundbank_info(soundbank_name: str | None = None) -> dict:
+@_instrumented(NORMAL)
+async def tool_get_soundbank_info(
+    soundbank_name: str | None = None,
+    max_results: int = 50,
+    cursor: str | None = None,
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+) -> dict:
     """
     Get SoundBank information.
 
     Args:
         soundbank_name: Specific bank name; None returns an overview of all banks.
+        max_results:    Page size, default 50
+        cursor:         next_cursor from the previous page
+        fields:      Only return these fields for each result row (projection)
+        max_tokens:  Response budget in approx. tokens (default 8000); over budget, rows are
+                     replaced by aggregates (counts by type / parent) plus a get_page cursor
+        max_bytes:   Response budget in bytes (overrides max_tokens)
 
     Note: Wwise 2024.1 uses Auto-Defined SoundBank by default — manual management
     is usually unnecessary.
     """
     await _ensure_connection()
-    return await get_soundbank_info(soundbank_name)
+    result = await tools.get_soundbank_info(soundbank_name, max_results, cursor)
+    return shape_response(result, "get_soundbank_info", fields, max_tokens, max_bytes)
 
 
 @mcp.tool()
-async def tool_get_rtpc_list(max_results: int = 50) -> dict:
+@_instrumented(NORMAL)
+async def tool_get_rtpc_list(
+    max_results: int = 50,
+    cursor: str | None = None,
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+) -> dict:
     """
     Get all Game Parameters (RTPCs) in the project, with name, range, and default value.
 
     Args:
-        max_results: Maximum number to return, default 50
+        max_results: Page size, default 50 ("total" is the full project count)
+        cursor:      next_cursor from the previous page
+        fields:      Only return these fields for each result row (projection)
+        max_tokens:  Response budget in approx. tokens (default 8000); over budget, rows are
+                     replaced by aggregates (counts by type / parent) plus a get_page cursor
+        max_bytes:   Response budget in bytes (overrides max_tokens)
     """
     await _ensure_connection()
-    return await get_rtpc_list(max_results)
+    result = await tools.get_rtpc_list(max_results, cursor)
+    return shape_response(result, "get_rtpc_list", fields, max_tokens, max_bytes)
 
 
 @mcp.tool()
-async def tool_get_effect_chain(object_path: str) -> dict:
+@_instrumented(INTERACTIVE)
+async def tool_get_effect_chain(
+    object_path: str,
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
+) -> dict:
     """
     Get the Effect chain (all Effect slots) of an object or Bus.
 
     Args:
         object_path: Target object/Bus path
+        fields:      Only return these fields for each result row (projection)
+        max_tokens:  Response budget in approx. tokens (default 8000); over budget, rows are
+                     replaced by aggregates (counts by type / parent) plus a get_page cursor
+        max_bytes:   Response budget in bytes (overrides max_tokens)
 
     Returns the list of effects in slots 0-3, including name, type,
     and plugin info for each occupied slot.
     """
     await _ensure_connection()
-    return await get_effect_chain(object_path)
+    result = await tools.get_effect_chain(object_path)
+    return shape_response(result, "get_effect_chain", fields, max_tokens, max_bytes)
 
 
 # ------------------------------------------------------------------
-# Action tools (10)
+# Action tools (11)
 # ------------------------------------------------------------------
 
 @mcp.tool()
+@_instrumented(NORMAL)
 async def tool_create_object(
     name: str,
     obj_type: str,
@@ -237,10 +541,11 @@ async def tool_create_object(
         notes:       Optional notes
     """
     await _ensure_connection()
-    return await create_object(name, obj_type, parent_path, on_conflict, notes)
+    return await tools.create_object(name, obj_type, parent_path, on_conflict, notes)
 
 
 @mcp.tool()
+@_instrumented(NORMAL)
 async def tool_set_property(
     object_path: str,
     property: str | None = None,
@@ -259,26 +564,30 @@ async def tool_set_property(
         platform:    Target platform (None = all platforms)
     """
     await _ensure_connection()
-    return await set_property(object_path, property, value, properties, platform)
+    return await tools.set_property(object_path, property, value, properties, platform)
 
 
 @mcp.tool()
-async def tool_preview_event(event_path: str, action: str = "play") -> dict:
+@_instrumented(INTERACTIVE)
+async def tool_preview_event(event_path: str | None = None, action: str = "play") -> dict:
     """
     Preview an Event in Wwise Authoring via the Transport API (no game connection needed).
 
     Args:
-        event_path: Full WAAPI path of the Event
+        event_path: Full WAAPI path of the Event; for stop/pause/resume omit it
+                    to apply the action to every Event being previewed
         action:     'play' (default) | 'stop' | 'pause' | 'resume'
 
     Equivalent to pressing F5 in Wwise. Use this to verify audio changes immediately
     after editing parameters — no SoundBank rebuild required.
+    Transports are reused per Event, so repeated previews of the same Event are cheap.
     """
     await _ensure_connection()
-    return await preview_event(event_path, action)
+    return await tools.preview_event(event_path, action)
 
 
 @mcp.tool()
+@_instrumented(NORMAL)
 async def tool_create_event(
     event_name: str,
     action_type: str,
@@ -297,10 +606,11 @@ async def tool_create_event(
     Wwise 2024.1: No SoundBank rebuild needed — verify immediately via Live Editing.
     """
     await _ensure_connection()
-    return await create_event(event_name, action_type, target_path, parent_path)
+    return await tools.create_event(event_name, action_type, target_path, parent_path)
 
 
 @mcp.tool()
+@_instrumented(NORMAL)
 async def tool_assign_bus(object_path: str, bus_path: str) -> dict:
     """
     Route an object to a specific Bus (set OutputBus).
@@ -310,10 +620,34 @@ async def tool_assign_bus(object_path: str, bus_path: str) -> dict:
         bus_path:    Full Bus path, e.g. '\\\\Master-Mixer Hierarchy\\\\Master Audio Bus\\\\SFX'
     """
     await _ensure_connection()
-    return await assign_bus(object_path, bus_path)
+    return await tools.assign_bus(object_path, bus_path)
 
 
 @mcp.tool()
+@_instrumented(NORMAL)
+async def tool_apply_mutations(operations: list[dict]) -> dict:
+    """
+    Apply a batch of declarative edits in as few WAAPI round trips as possible.
+    Creates, property/reference writes and list appends are merged into nested
+    ak.wwise.core.object.set payloads; prefer this over many single-step tool calls.
+
+    Args:
+        operations: List of operations, each one of:
+            {"op": "create", "ref": "ev", "parent": "<path or $ref>", "type": "Event",
+             "name": "Play_X", "properties": {...}, "notes": "", "on_conflict": "rename"}
+            {"op": "set_property", "target": "<path or $ref>", "property": "Volume", "value": -3}
+            {"op": "set_reference", "target": "<path or $ref>", "reference": "OutputBus", "value": "<path or $ref>"}
+            {"op": "append_list", "target": "<path>", "list": "RTPC", "entries": [...], "list_mode": "append"}
+          "$name" refers to the object created by the "create" op whose ref is "name".
+          Creates nested under a "$ref" parent inherit the root's on_conflict; a different
+          explicit value is rejected. Creates run before edits to existing objects.
+    """
+    await _ensure_connection()
+    return await tools.apply_mutations(operations)
+
+
+@mcp.tool()
+@_instrumented(NORMAL)
 async def tool_delete_object(object_path: str, force: bool = False) -> dict:
     """
     Delete a Wwise object.
@@ -325,10 +659,11 @@ async def tool_delete_object(object_path: str, force: bool = False) -> dict:
     Tip: run verify_structure before deleting to avoid dangling references.
     """
     await _ensure_connection()
-    return await delete_object(object_path, force)
+    return await tools.delete_object(object_path, force)
 
 
 @mcp.tool()
+@_instrumented(NORMAL)
 async def tool_move_object(object_path: str, new_parent_path: str) -> dict:
     """
     Move an object to a new parent node (for reorganising project structure).
@@ -338,10 +673,11 @@ async def tool_move_object(object_path: str, new_parent_path: str) -> dict:
         new_parent_path: Target parent node path
     """
     await _ensure_connection()
-    return await move_object(object_path, new_parent_path)
+    return await tools.move_object(object_path, new_parent_path)
 
 
 @mcp.tool()
+@_instrumented(NORMAL)
 async def tool_set_rtpc_binding(
     object_path: str,
     game_parameter_path: str,
@@ -371,10 +707,11 @@ async def tool_set_rtpc_binding(
         curve_points=[{"x":0,"y":0,"shape":"Linear"},{"x":100,"y":-96,"shape":"Log3"}]
     """
     await _ensure_connection()
-    return await set_rtpc_binding(object_path, game_parameter_path, property_name, curve_points, notes)
+    return await tools.set_rtpc_binding(object_path, game_parameter_path, property_name, curve_points, notes)
 
 
 @mcp.tool()
+@_instrumented(NORMAL)
 async def tool_add_effect(
     object_path: str,
     effect_name: str,
@@ -404,10 +741,11 @@ async def tool_add_effect(
         effect_plugin='RoomVerb'
     """
     await _ensure_connection()
-    return await add_effect(object_path, effect_name, effect_plugin, effect_slot, effect_params)
+    return await tools.add_effect(object_path, effect_name, effect_plugin, effect_slot, effect_params)
 
 
 @mcp.tool()
+@_instrumented(NORMAL)
 async def tool_remove_effect(object_path: str) -> dict:
     """
     Remove all Effects from an object or Bus (clears all Effect slots).
@@ -421,14 +759,131 @@ async def tool_remove_effect(object_path: str) -> dict:
         object_path: Target object/Bus path
     """
     await _ensure_connection()
-    return await remove_effect(object_path)
+    return await tools.remove_effect(object_path)
 
 
 # ------------------------------------------------------------------
-# Verify tools (2)
+# Media tools (4)
 # ------------------------------------------------------------------
 
 @mcp.tool()
+@_instrumented(NORMAL)
+async def tool_import_audio(
+    files: list[str] | None = None,
+    directory: str | None = None,
+    target_pattern: str = "\\Actor-Mixer Hierarchy\\Default Work Unit\\{stem}",
+    object_type: str = "Sound SFX",
+    import_operation: str = "useExisting",
+    language: str = "SFX",
+    recursive: bool = True,
+    originals_subfolder: str = "",
+) -> dict:
+    """
+    Bulk-import WAV files (ak.wwise.core.audio.import) and create the Sound objects for them.
+    WAV headers are validated locally first (format, channels, sample rate, data length);
+    bad files are rejected before any WAAPI call. Large imports: run via start_job.
+
+    Args:
+        files:               List of WAV file paths (or use directory)
+        directory:           Directory to collect .wav files from
+        target_pattern:      Target object path template; placeholders {stem} (file name),
+                             {parent} (folder name), {subdir} (relative folder, '\\'-separated),
+                             e.g. '\\Actor-Mixer Hierarchy\\Default Work Unit\\{subdir}\\{stem}'
+        object_type:         Type of the leaf object when the pattern has no '<Type>' prefix
+        import_operation:    'useExisting' (default) | 'createNew' | 'replaceExisting'
+        language:            Import language ('SFX' for sound effects)
+        recursive:           Include sub-directories when using directory
+        originals_subfolder: Originals sub-folder template (same placeholders)
+    """
+    await _ensure_connection()
+    return await tools.import_audio(
+        files, directory, target_pattern, object_type,
+        import_operation, language, recursive, originals_subfolder,
+    )
+
+
+@mcp.tool()
+@_instrumented(BULK)
+async def tool_get_media_footprint(
+    group_by: str = "event",
+    name_contains: str | None = None,
+    max_results: int = 50,
+    cursor: str | None = None,
+) -> dict:
+    """
+    Estimate original media disk / memory cost (file bytes, uncompressed PCM bytes, duration)
+    per Event, Bus or SoundBank, largest first. Audio file headers are read locally in parallel.
+    Each file counts once per group. Run via start_job on large projects.
+
+    Args:
+        group_by:      'event' (default) | 'bus' (effective OutputBus, child buses roll up) | 'soundbank'
+        name_contains: Only groups whose path contains this substring
+        max_results:   Page size, default 50
+        cursor:        next_cursor from the previous page
+    """
+    await _ensure_connection()
+    return await tools.get_media_footprint(group_by, name_contains, max_results, cursor)
+
+
+@mcp.tool()
+@_instrumented(BULK)
+async def tool_find_duplicate_media(
+    directory: str | None = None,
+    originals: bool = False,
+    max_results: int = 50,
+    cursor: str | None = None,
+) -> dict:
+    """
+    Find byte-identical or sample-identical audio files (same PCM data, different names or
+    metadata) and the AudioFileSources referencing each copy, largest waste first.
+    Hashes are cached by (path, size, mtime), so re-scans only read changed files.
+
+    Args:
+        directory:   Scan .wav files in this directory
+        originals:   Scan the project's Originals directory
+        max_results: Duplicate groups per page, default 50
+        cursor:      next_cursor from the previous page
+        (With neither directory nor originals, scans all files referenced by AudioFileSources.)
+    """
+    await _ensure_connection()
+    return await tools.find_duplicate_media(directory, originals, max_results, cursor)
+
+
+@mcp.tool()
+@_instrumented(BULK)
+async def tool_analyze_loudness(
+    scope_path: str | None = None,
+    files: list[str] | None = None,
+    target_lufs: float = -23.0,
+    peak_ceiling: float = -1.0,
+    max_results: int = 50,
+    cursor: str | None = None,
+) -> dict:
+    """
+    Measure peak, RMS and approximate integrated loudness of source WAVs (requires numpy)
+    and suggest per-Sound Volume offsets toward a target, largest offset first.
+    Files are analyzed in a process pool; results are cached by content hash.
+    Loudness uses BS.1770 gating without K-weighting: use it for relative leveling.
+    The returned mutations can be passed straight to apply_mutations.
+
+    Args:
+        scope_path:   Analyze media of Sounds under this path (whole project if neither is given)
+        files:        Analyze these WAV files directly (no mutations)
+        target_lufs:  Target loudness, default -23
+        peak_ceiling: Maximum peak in dBFS after the offset, default -1
+        max_results:  Page size, default 50
+        cursor:       next_cursor from the previous page
+    """
+    await _ensure_connection()
+    return await tools.analyze_loudness(scope_path, files, target_lufs, peak_ceiling, max_results, cursor)
+
+
+# ------------------------------------------------------------------
+# Verify tools (3)
+# ------------------------------------------------------------------
+
+@mcp.tool()
+@_instrumented(BULK)
 async def tool_verify_structure(scope_path: str | None = None) -> dict:
     """
     Structural integrity check. Call this after completing each independent goal.
@@ -440,10 +895,11 @@ async def tool_verify_structure(scope_path: str | None = None) -> dict:
         scope_path: Path to limit the check scope (None = full project)
     """
     await _ensure_connection()
-    return await verify_structure(scope_path)
+    return await tools.verify_structure(scope_path)
 
 
 @mcp.tool()
+@_instrumented(NORMAL)
 async def tool_verify_event_completeness(event_path: str) -> dict:
     """
     Verify that an Event can fire correctly in Wwise 2024.1 Auto-Defined SoundBank mode.
@@ -455,7 +911,29 @@ async def tool_verify_event_completeness(event_path: str) -> dict:
         event_path: Full path of the Event to verify
     """
     await _ensure_connection()
-    return await verify_event_completeness(event_path)
+    return await tools.verify_event_completeness(event_path)
+
+
+@mcp.tool()
+@_instrumented(BULK)
+async def tool_find_unused_content(
+    categories: list[str] | None = None,
+    max_results: int = 100,
+    cursor: str | None = None,
+) -> dict:
+    """
+    Project-wide dead-content report for trimming memory and bank size: Sounds/containers
+    no Event can reach, Game Parameters not bound by any RTPC, buses with no routed inputs,
+    and unused Effect / Attenuation ShareSets. Returns per-category counts plus a paginated list.
+
+    Args:
+        categories:  Subset of: unreachable, unused_game_parameter, unused_bus,
+                     unused_effect, unused_attenuation (default: all)
+        max_results: Page size, default 100
+        cursor:      next_cursor from the previous page
+    """
+    await _ensure_connection()
+    return await tools.find_unused_content(categories, max_results, cursor)
 
 
 # ------------------------------------------------------------------
@@ -463,10 +941,14 @@ async def tool_verify_event_completeness(event_path: str) -> dict:
 # ------------------------------------------------------------------
 
 @mcp.tool()
+@_instrumented(NORMAL)
 async def tool_execute_waapi(
     uri: str,
     args: dict = {},
     opts: dict = {},
+    fields: list[str] | None = None,
+    max_tokens: int | None = None,
+    max_bytes: int | None = None,
 ) -> dict:
     """
     Execute a raw WAAPI call directly (fallback tool for cases not covered by other tools).
@@ -475,12 +957,165 @@ async def tool_execute_waapi(
         uri:  WAAPI function URI, e.g. 'ak.wwise.core.object.get'
         args: WAAPI arguments dict
         opts: WAAPI options dict
+        fields:      Only return these fields for each result row (projection)
+        max_tokens:  Response budget in approx. tokens (default 8000); over budget, rows are
+                     replaced by aggregates (counts by type / parent) plus a get_page cursor
+        max_bytes:   Response budget in bytes (overrides max_tokens)
 
     Security: the following URIs are blacklisted:
     project.open / project.close / project.save / remote.connect / remote.disconnect
     """
     await _ensure_connection()
-    return await execute_waapi(uri, args, opts)
+    result = await tools.execute_waapi(uri, args, opts)
+    return shape_response(result, "execute_waapi", fields, max_tokens, max_bytes)
+
+
+# ------------------------------------------------------------------
+# Job tools (5) — run long tools in the background
+# ------------------------------------------------------------------
+
+# Tools that may be started as background jobs
+_JOB_TOOLS = (
+    "verify_structure",
+    "verify_event_completeness",
+    "search_objects",
+    "set_property",
+    "get_bus_topology",
+    "import_audio",
+    "get_property_matrix",
+    "query_properties",
+    "get_effective_values",
+    "find_unused_content",
+    "get_media_footprint",
+    "find_duplicate_media",
+    "analyze_loudness",
+)
+
+
+def _job_not_found(job_id: str) -> dict:
+    return {
+        "success": False,
+        "data": None,
+        "error": {
+            "code": "not_found",
+            "message": f"Job not found: {job_id}",
+            "suggestion": "Call list_jobs to see known jobs (finished jobs are kept for a limited time)",
+        },
+    }
+
+
+@mcp.tool()
+@_instrumented(INTERACTIVE)
+async def tool_start_job(tool: str, arguments: dict = {}) -> dict:
+    """
+    Start a long-running tool as a background job and return its job id immediately.
+
+    Use this for whole-project verify_structure, large searches or bulk property edits.
+    Then poll get_job (incremental partial results) or wait_job (progress notifications),
+    and cancel_job to stop it.
+
+    Args:
+        tool:      One of: verify_structure, verify_event_completeness, search_objects,
+                   set_property, get_bus_topology, import_audio, get_property_matrix,
+                   query_properties, get_effective_values, find_unused_content,
+                   get_media_footprint, find_duplicate_media, analyze_loudness
+        arguments: Keyword arguments for that tool, e.g. {"scope_path": "\\Actor-Mixer Hierarchy"}
+    """
+    if tool not in _JOB_TOOLS:
+        return {
+            "success": False,
+            "data": None,
+            "error": {
+                "code": "invalid_param",
+                "message": f"Tool '{tool}' cannot run as a job",
+                "suggestion": f"Supported: {list(_JOB_TOOLS)}",
+            },
+        }
+    await _ensure_connection()
+    fn = getattr(tools, tool)
+
+    async def run():
+        # Jobs always run as bulk traffic so they cannot starve interactive tools
+        current_tool.set(f"job:{tool}")
+        current_priority.set(BULK)
+        with tracer.span(f"job {tool}", "job"):
+            return await fn(**arguments)
+
+    job = job_manager.start(tool, run, params=arguments)
+    return {"success": True, "data": job.to_dict(limit=0), "error": None}
+
+
+@mcp.tool()
+@_instrumented(INTERACTIVE)
+async def tool_get_job(job_id: str, offset: int = 0, limit: int = 100) -> dict:
+    """
+    Get a job's status, progress and partial results (read incrementally with offset).
+
+    Args:
+        job_id: Id returned by start_job
+        offset: Index of the first partial result to return (use next_offset from the previous call)
+        limit:  Maximum partial results to return
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return _job_not_found(job_id)
+    return {"success": True, "data": job.to_dict(offset, limit), "error": None}
+
+
+@mcp.tool()
+@_instrumented(INTERACTIVE)
+async def tool_wait_job(job_id: str, ctx: Context, timeout: float = 30.0) -> dict:
+    """
+    Wait for a job to finish, streaming MCP progress notifications while it runs.
+    Returns when the job finishes or the timeout elapses (the job keeps running).
+
+    Args:
+        job_id:  Id returned by start_job
+        timeout: Maximum seconds to wait, default 30
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return _job_not_found(job_id)
+    deadline = time.monotonic() + timeout
+    seen = -1
+    while True:
+        if job.version != seen:
+            seen = job.version
+            try:
+                await ctx.report_progress(job.progress, job.total)
+            except Exception:
+                pass  # client did not request progress notifications
+        remaining = deadline - time.monotonic()
+        if job.done or remaining <= 0:
+            break
+        await job.wait_changed(min(remaining, 1.0))
+    return {"success": True, "data": job.to_dict(limit=0), "error": None}
+
+
+@mcp.tool()
+@_instrumented(INTERACTIVE)
+async def tool_cancel_job(job_id: str) -> dict:
+    """
+    Cancel a queued or running job. In-flight WAAPI loops stop at their next checkpoint.
+
+    Args:
+        job_id: Id returned by start_job
+    """
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return _job_not_found(job_id)
+    return {"success": True, "data": job.to_dict(limit=0), "error": None}
+
+
+@mcp.tool()
+@_instrumented(INTERACTIVE)
+async def tool_list_jobs() -> dict:
+    """List recent background jobs with their status and progress."""
+    jobs = [job.to_dict(limit=0) for job in job_manager.list()]
+    for job in jobs:
+        job.pop("partial", None)
+        job.pop("result", None)
+    return {"success": True, "data": {"count": len(jobs), "jobs": jobs}, "error": None}
 
 
 # ------------------------------------------------------------------
@@ -490,11 +1125,82 @@ async def tool_execute_waapi(
 @mcp.resource("wwise://system_prompt")
 async def get_system_prompt() -> str:
     """Wwise 2024.1 domain system prompt (for MCP clients to inject into LLM context)"""
+    from .rag.context_collector import build_dynamic_context
     await _ensure_connection()
+    current_priority.set(BULK)
     dynamic = await build_dynamic_context()
     return STATIC_SYSTEM_PROMPT + dynamic
 
 
+# ------------------------------------------------------------------
+# Admin tool (hidden: registered only when the server runs with --profile)
+# ------------------------------------------------------------------
+
+def _profile_target(output_dir: str | None) -> str | None:
+    """Resolve output_dir inside the configured profile directory; None if it escapes."""
+    base = os.path.realpath(os.path.expanduser(settings.profile_dir))
+    target = os.path.realpath(os.path.join(base, output_dir)) if output_dir else base
+    return target if os.path.commonpath([base, target]) == base else None
+
+
+async def admin_profiling(
+    enabled: bool,
+    output_dir: str | None = None,
+    interval_ms: float | None = None,
+) -> dict:
+    """
+    Internal admin tool — toggle the per-tool sampling profiler at runtime.
+    Not intended for normal agent use.
+
+    Args:
+        enabled:     True starts sampling, False stops and writes <tool>.folded files
+        output_dir:  Subdirectory of the --profile dir for collapsed stacks (defaults to the --profile dir)
+        interval_ms: Sampling interval in milliseconds
+    """
+    if enabled:
+        target = _profile_target(output_dir)
+        if target is None:
+            return {
+                "success": False,
+                "data": None,
+                "error": {
+                    "code": "invalid_param",
+                    "message": f"output_dir must stay inside the profile directory: {output_dir}",
+                    "suggestion": "Pass a relative subdirectory, or omit output_dir",
+                },
+            }
+        profiler.start(
+            target,
+            interval=interval_ms / 1000.0 if interval_ms else None,
+            target_thread=threading.get_ident(),
+        )
+    else:
+        profiler.stop()
+    return {"success": True, "data": profiler.summary(), "error": None}
+
+
+# ------------------------------------------------------------------
+# Metrics resource
+# ------------------------------------------------------------------
+
+@mcp.resource("wwise://metrics")
+async def get_metrics() -> str:
+    """
+    WAAPI round-trip metrics per URI and per tool: call counts, latency
+    p50/p95/p99, request/response bytes, retries and errors (JSON).
+    """
+    return json.dumps(metrics.snapshot(), ensure_ascii=False, indent=2)
+
+
+@mcp.resource("wwise://trace")
+async def get_trace() -> str:
+    """
+    Recorded spans as Chrome trace-event JSON (load in chrome://tracing or Perfetto).
+    Empty unless the server was started with --trace.
+    """
+    return json.dumps(tracer.export_chrome(), ensure_ascii=False)
+
+
 # ------------------------------------------------------------------
 # Entry point
 # ------------------------------------------------------------------
@@ -506,10 +1212,29 @@ def main():
     parser.add_argument("--port", type=int, default=settings.port)
     parser.add_argument("--transport", choices=["stdio", "sse"], default="stdio")
     parser.add_argument("--sse-port", type=int, default=8765)
+    parser.add_argument("--metrics-log-interval", type=float, default=settings.metrics_log_interval,
+                        help="Log a one-line WAAPI metrics summary every N seconds (0 = off)")
+    parser.add_argument("--trace", metavar="FILE", default=settings.trace_output or None,
+                        help="Enable span tracing and write Chrome trace-event JSON to FILE on exit")
+    parser.add_argument("--profile", metavar="DIR", default=None,
+                        help="Sample each tool invocation and write per-tool collapsed stacks "
+                             "(<tool>.folded, flamegraph input) to DIR")
     args = parser.parse_args()
 
     settings.host = args.host
     settings.port = args.port
+    settings.metrics_log_interval = args.metrics_log_interval
+    if args.trace or settings.trace_enabled:
+        tracer.enable()
+        if args.trace:
+            atexit.register(tracer.write, args.trace)
+            logger.info("Tracing enabled, trace will be written to %s", args.trace)
+    profile_dir = args.profile or settings.profile_dir
+    if profile_dir:
+        settings.profile_dir = profile_dir
+        profiler.start(profile_dir)
+        atexit.register(profiler.stop)
+        mcp.tool(name="_admin_profiling", tags={"admin"})(admin_profiling)
 
     logger.info("WwiseMCP starting, WAAPI target: %s, transport: %s",
                 settings.waapi_url, args.transport)
@@ -0,0 +1,12 @@
+from .columns import NUMPY_AVAILABLE, ColumnStore, PredicateError, out_of_range
+from .objects import ObjectRecord, ObjectStore, StringTable
+
+__all__ = [
+    "NUMPY_AVAILABLE",
+    "ColumnStore",
+    "PredicateError",
+    "out_of_range",
+    "ObjectRecord",
+    "ObjectStore",
+    "StringTable",
+]
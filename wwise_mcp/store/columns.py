@@ -0,0 +1,282 @@
+"""
+列式数值属性存储 + 向量化谓词查询（需要 numpy，可选依赖：pip install "wwise-mcp[analysis]"）
+以 ObjectStore 的 handle 为行号，每个属性一列：
+
+  - 数值 / 布尔属性：float64，缺失为 NaN（布尔存为 0 / 1）
+  - 引用 / 字符串属性（OutputBus 等）：int32 编码（StringTable 驻留），缺失为 -1
+  - type / parent 取自 ObjectStore 的列
+
+谓词为 JSON 条件列表（AND），单个条件 {"prop", "op", "value"}，或 {"any": [条件, ...]}（OR）：
+    [{"prop": "type", "op": "==", "value": "Sound"},
+     {"prop": "Volume", "op": ">", "value": -3},
+     {"prop": "OutputBus", "op": "==", "value": "SFX"}]
+
+op：== != < <= > >= between in exists missing
+聚合按 type / parent / 任一字符串列分组，计算 count / min / max / mean，全部在 numpy 中完成。
+"""
+
+from typing import Any, Iterable, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from .objects import ObjectStore, StringTable, _guid_to_bytes
+
+_NUMERIC_OPS = {"<", "<=", ">", ">=", "between"}
+
+
+class PredicateError(ValueError):
+    """谓词 / 聚合参数不合法"""
+
+
+def _require_numpy() -> None:
+    if not NUMPY_AVAILABLE:
+        raise ImportError('列式属性查询需要 numpy，请安装：pip install "wwise-mcp[analysis]"')
+
+
+def out_of_range(values: Iterable[Any], low: float, high: float) -> list[int]:
+    """返回超出 [low, high] 的下标（None / 非数值跳过）；有 numpy 时向量化"""
+    if NUMPY_AVAILABLE:
+        arr = np.array([v if isinstance(v, (int, float)) else np.nan for v in values], dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            return np.flatnonzero((arr < low) | (arr > high)).tolist()
+    return [
+        i for i, v in enumerate(values)
+        if isinstance(v, (int, float)) and not (low <= v <= high)
+    ]
+
+
+class ColumnStore:
+    """
+    用法：
+        columns = ColumnStore(objects)
+        columns.load_rows(rows, ["Volume", "OutputBus"])     # rows 含 id 与属性值（object.get 结果）
+        mask = columns.evaluate([{"prop": "Volume", "op": ">", "value": -3}])
+        columns.aggregate(mask, "parent", ["Volume"])
+    """
+
+    def __init__(self, objects: ObjectStore):
+        _require_numpy()
+        self.objects = objects
+        self._numeric: dict[str, "np.ndarray"] = {}
+        self._categorical: dict[str, "np.ndarray"] = {}
+        self._strings = StringTable()
+        self._guid_index: Optional[tuple] = None
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def _grow(self, column: "np.ndarray", fill: Any) -> "np.ndarray":
+        n = len(self.objects)
+        if len(column) >= n:
+            return column
+        return np.concatenate([column, np.full(n - len(column), fill, dtype=column.dtype)])
+
+    def load_rows(self, rows: Iterable[dict], properties: Iterable[str]) -> int:
+        """
+        按行写入属性值（行需含 id；对象不在 ObjectStore 中时跳过）。
+        列类型按首个非空值决定：数值 / 布尔 → float64，其余（引用 {id, name}、字符串）→ 编码列。
+        返回写入的行数。
+        """
+        properties = list(properties)
+        rows = [row for row in rows if row.get("id")]
+        handles = self._lookup([row["id"] for row in rows])
+        found = handles >= 0
+        if not found.any():
+            return 0
+
+        index = handles[found]
+        kept = [row for row, ok in zip(rows, found.tolist()) if ok]
+        for prop in properties:
+            self.set_column(prop, index, [row.get(prop) for row in kept])
+        return len(kept)
+
+    def _lookup(self, guids: list[str]) -> "np.ndarray":
+        """批量 GUID → handle（向量化二分查找），不存在为 -1"""
+        n = len(self.objects)
+        if self._guid_index is None or len(self._guid_index[0]) != n:
+            keys = np.frombuffer(bytes(self.objects._guids), dtype="S16")
+            order = np.argsort(keys, kind="stable")
+            self._guid_index = (keys[order], order)
+        sorted_keys, order = self._guid_index
+        if not n:
+            return np.full(len(guids), -1, dtype=np.int64)
+        query = np.array([_guid_to_bytes(g) for g in guids], dtype="S16")
+        pos = np.minimum(np.searchsorted(sorted_keys, query), n - 1)
+        return np.where(sorted_keys[pos] == query, order[pos], -1)
+
+    def set_column(self, prop: str, handles: "np.ndarray", values: list) -> None:
+        sample = next((v for v in values if v is not None), None)
+        # 全部缺失且尚无该列时按数值列（全 NaN）处理，谓词结果为"缺失"
+        if (sample is None or isinstance(sample, (bool, int, float))) and prop not in self._categorical:
+            column = self._grow(self._numeric.get(prop, np.empty(0)), np.nan)
+            column[handles] = np.array(
+                [float(v) if isinstance(v, (bool, int, float)) else np.nan for v in values],
+                dtype=np.float64,
+            )
+            self._numeric[prop] = column
+        else:
+            column = self._grow(self._categorical.get(prop, np.empty(0, dtype=np.int32)), -1)
+            column[handles] = np.array([self._code(v) for v in values], dtype=np.int32)
+            self._categorical[prop] = column
+
+    def _code(self, value: Any) -> int:
+        if value is None:
+            return -1
+        if isinstance(value, dict):
+            value = value.get("name") or value.get("id") or ""
+        return self._strings.intern(str(value))
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+
+    @property
+    def properties(self) -> list[str]:
+        return sorted(set(self._numeric) | set(self._categorical))
+
+    # ObjectStore 的 array 在导出缓冲区期间不能扩容，这里一律复制
+    def _type_codes(self) -> "np.ndarray":
+        return np.frombuffer(self.objects._type, dtype=np.uint16).astype(np.int32)
+
+    def _parents(self) -> "np.ndarray":
+        return np.frombuffer(self.objects._parent, dtype=np.int32).copy()
+
+    def numeric(self, prop: str) -> "np.ndarray":
+        column = self._numeric.get(prop)
+        if column is None:
+            raise PredicateError(f"没有数值列：{prop}")
+        return self._grow(column, np.nan)
+
+    def _labels(self, prop: str) -> tuple["np.ndarray", Any]:
+        """字符串类列：(编码数组, 编码 → 字符串 的函数)"""
+        if prop == "type":
+            return self._type_codes(), self.objects._types.__getitem__
+        if prop == "parent":
+            return self._parents(), lambda h: self.objects.path(h) if h >= 0 else ""
+        column = self._categorical.get(prop)
+        if column is None:
+            raise PredicateError(f"没有字符串 / 引用列：{prop}")
+        return self._grow(column, -1), self._strings.__getitem__
+
+    def _label_code(self, prop: str, value: Any) -> int:
+        if prop == "type":
+            code = self.objects._types.get(str(value))
+        elif prop == "parent":
+            value = str(value)
+            code = self.objects.handle(value) if value.startswith("{") else self.objects.find_path(value)
+        else:
+            code = self._strings.get(str(value))
+        return -2 if code is None else code
+
+    # ------------------------------------------------------------------
+    # 谓词
+    # ------------------------------------------------------------------
+
+    def evaluate(self, where: Optional[list[dict]]) -> "np.ndarray":
+        """条件列表（AND）→ 布尔掩码；占位节点始终排除"""
+        mask = np.frombuffer(bytes(self.objects._guids), dtype=np.uint8).reshape(-1, 16).any(axis=1)
+        for cond in where or []:
+            mask &= self._condition(cond)
+        return mask
+
+    def _condition(self, cond: dict) -> "np.ndarray":
+        if "any" in cond:
+            result = np.zeros(len(self), dtype=bool)
+            for sub in cond["any"]:
+                result |= self._condition(sub)
+            return result
+
+        prop, op, value = cond.get("prop"), cond.get("op", "=="), cond.get("value")
+        if not prop:
+            raise PredicateError(f"条件缺少 prop：{cond}")
+
+        if prop in self._numeric:
+            column = self.numeric(prop)
+            with np.errstate(invalid="ignore"):
+                if op == "exists":
+                    return ~np.isnan(column)
+                if op == "missing":
+                    return np.isnan(column)
+                if op == "between":
+                    low, high = value
+                    return (column >= low) & (column <= high)
+                if op == "in":
+                    return np.isin(column, [float(v) for v in value])
+                compare = {"==": np.equal, "!=": np.not_equal, "<": np.less, "<=": np.less_equal,
+                           ">": np.greater, ">=": np.greater_equal}.get(op)
+                if compare is None:
+                    raise PredicateError(f"数值列不支持运算符：{op}")
+                return compare(column, float(value))
+
+        codes, _ = self._labels(prop)
+        if op in _NUMERIC_OPS:
+            raise PredicateError(f"{prop} 不是数值列，不支持 {op}")
+        if op == "exists":
+            return codes >= 0
+        if op == "missing":
+            return codes < 0
+        if op == "in":
+            return np.isin(codes, [self._label_code(prop, v) for v in value])
+        if op == "==":
+            return codes == self._label_code(prop, value)
+        if op == "!=":
+            return codes != self._label_code(prop, value)
+        raise PredicateError(f"不支持的运算符：{op}")
+
+    # ------------------------------------------------------------------
+    # 聚合
+    # ------------------------------------------------------------------
+
+    def aggregate(self, mask: "np.ndarray", group_by: str, properties: list[str], top: int = 50) -> list[dict]:
+        """按 group_by 分组（仅 mask 命中的行），对每个数值列计算 count / min / max / mean"""
+        codes, label = self._labels(group_by)
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return []
+        groups, inverse, counts = np.unique(codes[rows], return_inverse=True, return_counts=True)
+        order = np.argsort(-counts, kind="stable")[:top]
+
+        stats: dict[str, dict[str, "np.ndarray"]] = {}
+        for prop in properties:
+            values = self.numeric(prop)[rows]
+            valid = ~np.isnan(values)
+            n = np.bincount(inverse[valid], minlength=len(groups))
+            total = np.bincount(inverse[valid], weights=values[valid], minlength=len(groups))
+            low = np.full(len(groups), np.inf)
+            high = np.full(len(groups), -np.inf)
+            np.minimum.at(low, inverse[valid], values[valid])
+            np.maximum.at(high, inverse[valid], values[valid])
+            with np.errstate(invalid="ignore", divide="ignore"):
+                stats[prop] = {"n": n, "min": low, "max": high, "mean": total / n}
+
+        result = []
+        for g in order:
+            entry: dict[str, Any] = {group_by: label(int(groups[g])) if groups[g] >= 0 else None,
+                                     "count": int(counts[g])}
+            for prop, s in stats.items():
+                if s["n"][g]:
+                    entry[prop] = {
+                        "min": round(float(s["min"][g]), 4),
+                        "max": round(float(s["max"][g]), 4),
+                        "mean": round(float(s["mean"][g]), 4),
+                    }
+            result.append(entry)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "rows": len(self),
+            "numeric": sorted(self._numeric),
+            "categorical": sorted(self._categorical),
+            "bytes": sum(c.nbytes for c in self._numeric.values())
+            + sum(c.nbytes for c in self._categorical.values()),
+        }
@@ -0,0 +1,281 @@
+"""
+紧凑对象存储：在内存中保存大项目的对象层级（缓存 / 索引用）
+WAAPI 返回的 [{"id", "name", "type", "path"}, ...] 每个对象是一个 dict + 4 个独立字符串，
+完整 path 在每个对象上重复存储祖先路径，10 万对象即占用数十 MB。ObjectStore 改为列式：
+
+  - 对象以整数 handle 表示，GUID 以 16 字节存入连续 bytearray，按 GUID 排序的 handle 数组做二分查找
+  - 类型名驻留（StringTable），每个对象只存 2 字节类型编号
+  - 名称以 UTF-8 连续存放（偏移数组索引），path 不存储，由 parent 链按需拼出
+  - 路径中出现但未加载的祖先自动补为占位节点（GUID 全零、类型为空），保证 path 可还原；
+    之后加载到该对象时原地填入 GUID / 类型
+  - (父 handle, 名称) → handle 的字典随写入增量维护，按 path 解析父节点 / find_path 不必扫描
+
+ObjectRecord 是按需创建的 __slots__ 视图，不持有数据。
+"""
+
+import bisect
+from array import array
+from typing import Iterable, Iterator, Optional
+
+_NO_PARENT = -1
+_ZERO_GUID = bytes(16)
+
+
+def _guid_to_bytes(guid: str) -> bytes:
+    return bytes.fromhex(guid.strip("{}").replace("-", ""))
+
+
+def _bytes_to_guid(raw: bytes) -> str:
+    h = raw.hex().upper()
+    return f"{{{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}}}"
+
+
+class StringTable:
+    """字符串驻留表：str ↔ 连续整数编号"""
+
+    __slots__ = ("_ids", "_strings")
+
+    def __init__(self):
+        self._ids: dict[str, int] = {}
+        self._strings: list[str] = []
+
+    def intern(self, value: str) -> int:
+        index = self._ids.get(value)
+        if index is None:
+            index = self._ids[value] = len(self._strings)
+            self._strings.append(value)
+        return index
+
+    def get(self, value: str) -> Optional[int]:
+        return self._ids.get(value)
+
+    def __getitem__(self, index: int) -> str:
+        return self._strings[index]
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+
+class ObjectRecord:
+    """单个对象的只读视图（按需从 ObjectStore 读取字段）"""
+
+    __slots__ = ("store", "handle")
+
+    def __init__(self, store: "ObjectStore", handle: int):
+        self.store = store
+        self.handle = handle
+
+    @property
+    def id(self) -> str:
+        return self.store.guid(self.handle)
+
+    @property
+    def name(self) -> str:
+        return self.store.name(self.handle)
+
+    @property
+    def type(self) -> str:
+        return self.store.type(self.handle)
+
+    @property
+    def path(self) -> str:
+        return self.store.path(self.handle)
+
+    @property
+    def parent(self) -> Optional["ObjectRecord"]:
+        parent = self.store.parent(self.handle)
+        return None if parent == _NO_PARENT else ObjectRecord(self.store, parent)
+
+    def to_dict(self) -> dict:
+        return self.store.row(self.handle)
+
+    def __repr__(self) -> str:
+        return f"ObjectRecord({self.handle}, {self.path!r})"
+
+
+class ObjectStore:
+    """
+    用法：
+        store = ObjectStore()
+        store.load(rows)                    # rows: WAAPI object.get 结果（需含 id / name / type / path）
+        h = store.handle("{GUID}")
+        store.path(h), store.type(h)
+        store.row(h)                        # → {"id", "name", "type", "path"}
+    """
+
+    def __init__(self):
+        self._guids = bytearray()
+        self._parent = array("i")
+        self._type = array("H")
+        self._name_end = array("I")             # 第 h 个名称在 _names 中的结束偏移
+        self._names = bytearray()
+        self._types = StringTable()
+        self._index: Optional[array] = None     # 按 GUID 排序的 handle
+        self._by_name: dict[tuple[int, str], int] = {}  # (父 handle, 名称) → handle，即增量维护的路径索引
+        self._placeholders = 0
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def add(self, guid: Optional[str], name: str, obj_type: str, parent: int = _NO_PARENT) -> int:
+        """追加一个对象，返回 handle（guid 为 None 时作为占位节点）"""
+        handle = len(self._parent)
+        self._guids += _guid_to_bytes(guid) if guid else _ZERO_GUID
+        self._parent.append(parent)
+        self._type.append(self._types.intern(obj_type))
+        self._names += name.encode()
+        self._name_end.append(len(self._names))
+        self._by_name[(parent, name)] = handle
+        self._index = None
+        if not guid:
+            self._placeholders += 1
+        return handle
+
+    def load(self, rows: Iterable[dict]) -> int:
+        """
+        批量加载 WAAPI 结果（需含 id / name / type / path），返回新增对象数。
+        已存在（含同一批内重复）的 GUID 跳过；父节点按 path 解析，未加载的祖先补为占位节点，
+        之后加载到该 path 的真实对象直接填入占位节点（保留 handle，子节点链接不变）。
+        """
+        index = self._index if self._index is not None else (self._sorted_handles() if len(self) else None)
+        seen: set[bytes] = set()                # 本批新增的 GUID（index 不含这些）
+        added = 0
+        for row in rows:
+            guid = row.get("id")
+            path = row.get("path", "")
+            if guid:
+                key = _guid_to_bytes(guid)
+                if key in seen or (index is not None and self._search(index, guid) is not None):
+                    continue
+                seen.add(key)
+            parent_path, _, leaf = path.rpartition("\\")
+            parent = self._ensure_path(parent_path) if parent_path else _NO_PARENT
+            name = row.get("name") or leaf
+            existing = self._by_name.get((parent, name))
+            if existing is not None and self.is_placeholder(existing):
+                self._fill(existing, guid, row.get("type", ""))
+            else:
+                self.add(guid, name, row.get("type", ""), parent)
+            added += 1
+        return added
+
+    def _fill(self, handle: int, guid: Optional[str], obj_type: str) -> None:
+        """把占位节点升级为真实对象（原地写入 GUID 与类型）"""
+        if guid:
+            self._guids[handle * 16:handle * 16 + 16] = _guid_to_bytes(guid)
+            self._placeholders -= 1
+            self._index = None
+        self._type[handle] = self._types.intern(obj_type)
+
+    def _ensure_path(self, path: str) -> int:
+        """返回 path 对应的 handle，不存在时逐级补占位节点"""
+        handle = _NO_PARENT
+        for name in path.strip("\\").split("\\"):
+            child = self._by_name.get((handle, name))
+            if child is None:
+                child = self.add(None, name, "", handle)
+            handle = child
+        return handle
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+
+    def _guid_key(self, handle: int) -> bytes:
+        return bytes(self._guids[handle * 16:handle * 16 + 16])
+
+    def _sorted_handles(self) -> array:
+        return array("i", sorted(range(len(self)), key=self._guid_key))
+
+    def _search(self, index: array, guid: str) -> Optional[int]:
+        key = _guid_to_bytes(guid)
+        pos = bisect.bisect_left(index, key, key=self._guid_key)
+        if pos < len(index) and self._guid_key(index[pos]) == key:
+            return index[pos]
+        return None
+
+    def handle(self, guid: str) -> Optional[int]:
+        """GUID → handle（二分查找，索引在写入后首次查询时重建）"""
+        if not len(self):
+            return None
+        if self._index is None:
+            self._index = self._sorted_handles()
+        return self._search(self._index, guid)
+
+    def guid(self, handle: int) -> Optional[str]:
+        raw = self._guid_key(handle)
+        return None if raw == _ZERO_GUID else _bytes_to_guid(raw)
+
+    def name(self, handle: int) -> str:
+        start = self._name_end[handle - 1] if handle else 0
+        return self._names[start:self._name_end[handle]].decode()
+
+    def type(self, handle: int) -> str:
+        return self._types[self._type[handle]]
+
+    def parent(self, handle: int) -> int:
+        return self._parent[handle]
+
+    def ancestors(self, handle: int) -> Iterator[int]:
+        """从父节点到根依次产出 handle"""
+        handle = self._parent[handle]
+        while handle != _NO_PARENT:
+            yield handle
+            handle = self._parent[handle]
+
+    def path(self, handle: int) -> str:
+        names = [self.name(handle)]
+        names.extend(self.name(h) for h in self.ancestors(handle))
+        return "\\" + "\\".join(reversed(names))
+
+    def find_path(self, path: str) -> Optional[int]:
+        """path → handle（沿路径索引逐级查找）"""
+        handle = _NO_PARENT
+        for name in path.strip("\\").split("\\"):
+            handle = self._by_name.get((handle, name))
+            if handle is None:
+                return None
+        return handle
+
+    def is_placeholder(self, handle: int) -> bool:
+        return self._guid_key(handle) == _ZERO_GUID
+
+    def record(self, handle: int) -> ObjectRecord:
+        return ObjectRecord(self, handle)
+
+    def row(self, handle: int, fields: Iterable[str] = ("id", "name", "type", "path")) -> dict:
+        getters = {"id": self.guid, "name": self.name, "type": self.type, "path": self.path}
+        return {f: getters[f](handle) for f in fields if f in getters}
+
+    def __iter__(self) -> Iterator[ObjectRecord]:
+        for handle in range(len(self)):
+            if not self.is_placeholder(handle):
+                yield ObjectRecord(self, handle)
+
+    def of_type(self, obj_type: str) -> list[int]:
+        code = self._types.get(obj_type)
+        if code is None:
+            return []
+        return [h for h, t in enumerate(self._type) if t == code]
+
+    def nbytes(self) -> int:
+        """列数据占用的字节数（不含驻留类型名）"""
+        return (
+            len(self._guids) + len(self._names)
+            + self._parent.itemsize * len(self._parent)
+            + self._type.itemsize * len(self._type)
+            + self._name_end.itemsize * len(self._name_end)
+            + (self._index.itemsize * len(self._index) if self._index is not None else 0)
+        )
+
+    def stats(self) -> dict:
+        return {
+            "objects": len(self) - self._placeholders,
+            "placeholders": self._placeholders,
+            "types": len(self._types),
+            "bytes": self.nbytes(),
+        }
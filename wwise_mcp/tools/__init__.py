@@ -1,57 +1,67 @@
-from .query import (
-    get_project_hierarchy,
-    get_object_properties,
-    search_objects,
-    get_bus_topology,
-    get_event_actions,
-    get_soundbank_info,
-    get_rtpc_list,
-    get_selected_objects,
-    get_effect_chain,
-)
-from .action import (
-    create_object,
-    set_property,
-    create_event,
-    assign_bus,
-    delete_object,
-    move_object,
-    preview_event,
-    set_rtpc_binding,
-    add_effect,
-    remove_effect,
-)
-from .verify import (
-    verify_structure,
-    verify_event_completeness,
-)
-from .fallback import execute_waapi
-
-__all__ = [
+"""
+工具函数包。
+
+各工具模块在首次访问对应函数时才导入（PEP 562 模块级 __getattr__），
+server.py 启动时无需加载全部工具模块及其依赖，缩短 MCP initialize 响应时间。
+"""
+
+import importlib
+
+# 工具函数名 → 所在子模块
+_TOOL_MODULES = {
     # Query
-    "get_project_hierarchy",
-    "get_object_properties",
-    "search_objects",
-    "get_bus_topology",
-    "get_event_actions",
-    "get_soundbank_info",
-    "get_rtpc_list",
-    "get_selected_objects",
-    "get_effect_chain",
+    "get_project_hierarchy": "query",
+    "get_object_properties": "query",
+    "search_objects": "query",
+    "get_bus_topology": "query",
+    "get_event_actions": "query",
+    "get_soundbank_info": "query",
+    "get_rtpc_list": "query",
+    "get_selected_objects": "query",
+    "get_effect_chain": "query",
+    "get_page": "query",
+    "get_property_matrix": "query",
+    "query_properties": "query",
+    "get_effective_values": "query",
+    "get_event_media": "query",
+    "find_media_users": "query",
     # Action
-    "create_object",
-    "set_property",
-    "create_event",
-    "assign_bus",
-    "delete_object",
-    "move_object",
-    "preview_event",
-    "set_rtpc_binding",
-    "add_effect",
-    "remove_effect",
+    "create_object": "action",
+    "set_property": "action",
+    "create_event": "action",
+    "assign_bus": "action",
+    "apply_mutations": "action",
+    "delete_object": "action",
+    "move_object": "action",
+    "preview_event": "action",
+    "set_rtpc_binding": "action",
+    "add_effect": "action",
+    "remove_effect": "action",
+    # Media
+    "import_audio": "media",
+    "get_media_footprint": "media",
+    "find_duplicate_media": "media",
+    "analyze_loudness": "media",
     # Verify
-    "verify_structure",
-    "verify_event_completeness",
+    "verify_structure": "verify",
+    "verify_event_completeness": "verify",
+    "find_unused_content": "verify",
     # Fallback
-    "execute_waapi",
-]
+    "execute_waapi": "fallback",
+}
+
+__all__ = list(_TOOL_MODULES)
+
+
+def __getattr__(name: str):
+    module_name = _TOOL_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value  # 缓存，后续访问不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
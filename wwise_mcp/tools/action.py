@@ -1,12 +1,16 @@
 """
-Layer 4 — 操作类工具（6 + 3 个）
+Layer 4 — 操作类工具（6 + 4 个）
 """
 
+import asyncio
 import logging
 from typing import Any, Union
 
 from ..core.adapter import WwiseAdapter
 from ..core.exceptions import WwiseMCPError
+from ..core.jobs import checkpoint, report
+from ..core.plan import MutationPlan
+from ..core.transport import transport_pool
 from ..rag.doc_index import doc_index
 
 logger = logging.getLogger("wwise_mcp.tools.action")
@@ -26,6 +30,25 @@ def _err_raw(code: str, message: str, suggestion: str | None = None) -> dict:
     }
 
 
+async def _child_exists(adapter: WwiseAdapter, parent_path: str, name: str) -> bool:
+    """父节点下是否已有同名子对象（父节点为路径时按完整路径精确查询，否则扫描子对象）"""
+    try:
+        if parent_path.startswith("\\"):
+            found = await adapter.get_objects(
+                from_spec={"path": [parent_path.rstrip("\\") + "\\" + name]},
+                return_fields=["id"],
+            )
+            return bool(found)
+        children = await adapter.get_objects(
+            from_spec={"id": [parent_path]},
+            return_fields=["name"],
+            transform=[{"select": ["children"]}],
+        )
+        return any(obj.get("name") == name for obj in children)
+    except WwiseMCPError:
+        return False
+
+
 async def create_object(
     name: str,
     obj_type: str,
@@ -49,27 +72,24 @@ async def create_object(
     try:
         adapter = WwiseAdapter()
 
-        # 安全检查：查询父节点的直接子对象，确认同名对象是否已存在
-        existing = await adapter.get_objects(
-            from_spec={"path": [parent_path]},
-            return_fields=["name", "path"],
-            transform=[{"select": ["children"]}],
-        )
-        existing_names = {obj.get("name") for obj in existing}
-        if name in existing_names and on_conflict == "fail":
-            return _err_raw(
-                "conflict",
-                f"父节点 '{parent_path}' 下已存在同名对象 '{name}'",
-                "可将 on_conflict 设为 'rename' 自动重命名，或先删除已有对象",
+        # 名称冲突交给 Wwise 的 onNameConflict 处理，不再预先扫描父节点的全部子对象；
+        # 仅在 on_conflict='fail' 且创建失败时，按目标路径查一次确认是否为同名冲突
+        try:
+            result = await adapter.create_object(
+                name=name,
+                obj_type=obj_type,
+                parent_path=parent_path,
+                on_conflict=on_conflict,
+                notes=notes,
             )
-
-        result = await adapter.create_object(
-            name=name,
-            obj_type=obj_type,
-            parent_path=parent_path,
-            on_conflict=on_conflict,
-            notes=notes,
-        )
+        except WwiseMCPError:
+            if on_conflict == "fail" and await _child_exists(adapter, parent_path, name):
+                return _err_raw(
+                    "conflict",
+                    f"父节点 '{parent_path}' 下已存在同名对象 '{name}'",
+                    "可将 on_conflict 设为 'rename' 自动重命名，或先删除已有对象",
+                )
+            raise
         return _ok({
             "id": result.get("id"),
             "name": result.get("name"),
@@ -126,11 +146,26 @@ async def set_property(
                     "suggestion": f"相近的合法属性名：{suggestions}" if suggestions else "请调用 get_object_properties 获取合法属性列表",
                 })
                 continue
+            results.append({"property": prop_name, "value": prop_value, "success": None})
+
+        pending = [r for r in results if r["success"] is None]
+        written = 0
+
+        async def _write(entry: dict) -> None:
+            nonlocal written
             try:
-                await adapter.set_property(object_path, prop_name, prop_value, platform)
-                results.append({"property": prop_name, "value": prop_value, "success": True})
+                await adapter.set_property(object_path, entry["property"], entry["value"], platform)
+                entry["success"] = True
             except Exception as e:
-                results.append({"property": prop_name, "value": prop_value, "success": False, "error": str(e)})
+                entry["success"] = False
+                entry["error"] = str(e)
+            written += 1
+            report(written, len(pending), partial=[entry])
+
+        # 写入前检查取消；校验失败的条目先作为部分结果上报
+        await checkpoint(0, len(pending), partial=[r for r in results if r["success"] is False])
+        # 并发发出写请求，由连接层的 WritePacer 按 Wwise 响应延迟控制在途数量
+        await asyncio.gather(*(_write(r) for r in pending))
 
         all_success = all(r["success"] for r in results)
         return _ok({
@@ -153,10 +188,8 @@ async def create_event(
     """
     创建 Wwise Event 及其 Action。
 
-    操作顺序（必须严格遵守）：
-      1. 创建 Event 对象
-      2. 在 Event 下创建 Action
-      3. 设置 Action 的 Target 引用
+    Event、Action、ActionType 与 Target 引用编译为一个 MutationPlan：
+    一次 object.set 完成全部写入，再用一次 object.get 解析新对象的最终名称与路径。
 
     Args:
         event_name:  Event 名称，建议以动词开头，如 'Play_Explosion'
@@ -168,51 +201,36 @@ async def create_event(
     """
     try:
         adapter = WwiseAdapter()
-
-        # Step 1: 创建 Event 对象
-        event_result = await adapter.create_object(
-            name=event_name,
-            obj_type="Event",
-            parent_path=parent_path,
-            on_conflict="rename",
-        )
-        event_path = event_result.get("path")
-        if not event_path:
-            return _err_raw("waapi_error", f"创建 Event '{event_name}' 失败：未返回对象路径")
-
-        # Step 2: 在 Event 下创建 Action
-        action_name = f"{action_type}_{event_name}"
-        action_result = await adapter.create_object(
-            name=action_name,
-            obj_type="Action",
-            parent_path=event_path,
-            on_conflict="rename",
-        )
-        action_path = action_result.get("path")
-        if not action_path:
-            return _err_raw("waapi_error", f"在 Event 下创建 Action 失败")
-
-        # Step 3: 设置 Action 类型
         action_type_map = {
             "Play": 1, "Stop": 2, "Pause": 3, "Resume": 4,
             "Break": 28, "Mute": 6, "UnMute": 7,
         }
         action_type_id = action_type_map.get(action_type, 1)
-        await adapter.set_property(action_path, "ActionType", action_type_id)
+        action_name = f"{action_type}_{event_name}"
+
+        plan = MutationPlan()
+        event_ref = plan.create(parent_path, "Event", event_name, on_conflict="rename")
+        action_ref = plan.create(event_ref, "Action", action_name, ActionType=action_type_id)
+        plan.set_reference(action_ref, "Target", target_path)
+        result = await plan.execute(adapter)
 
-        # Step 4: 设置 Action 的 Target 引用
-        await adapter.set_reference(action_path, "Target", target_path)
+        event_obj = result.get(event_ref)
+        action_obj = result.get(action_ref)
+        if not event_obj.get("path"):
+            return _err_raw("waapi_error", f"创建 Event '{event_name}' 失败：未返回对象路径")
+        if not action_obj.get("path"):
+            return _err_raw("waapi_error", f"在 Event 下创建 Action 失败")
 
         return _ok({
             "event": {
-                "id": event_result.get("id"),
-                "name": event_name,
-                "path": event_path,
+                "id": event_obj.get("id"),
+                "name": event_obj.get("name", event_name),
+                "path": event_obj.get("path"),
             },
             "action": {
-                "id": action_result.get("id"),
-                "name": action_name,
-                "path": action_path,
+                "id": action_obj.get("id"),
+                "name": action_obj.get("name", action_name),
+                "path": action_obj.get("path"),
                 "type": action_type,
                 "target": target_path,
             },
@@ -234,9 +252,12 @@ async def assign_bus(object_path: str, bus_path: str) -> dict:
     """
     try:
         adapter = WwiseAdapter()
-        # Wwise 要求先启用 OverrideOutput，才能对 Sound/Container 设置 OutputBus
-        await adapter.set_property(object_path, "OverrideOutput", True)
-        await adapter.set_reference(object_path, "OutputBus", bus_path)
+        # Wwise 要求先启用 OverrideOutput，才能对 Sound/Container 设置 OutputBus；
+        # 同一个 object.set 条目内属性先于引用生效，一次调用即可完成
+        plan = MutationPlan()
+        plan.set_property(object_path, "OverrideOutput", True)
+        plan.set_reference(object_path, "OutputBus", bus_path)
+        await plan.execute(adapter)
         return _ok({
             "object_path": object_path,
             "output_bus": bus_path,
@@ -247,6 +268,53 @@ async def assign_bus(object_path: str, bus_path: str) -> dict:
         return _err_raw("unexpected_error", str(e))
 
 
+async def apply_mutations(operations: list[dict]) -> dict:
+    """
+    批量执行声明式编辑操作（create / set_property / set_reference / append_list）。
+
+    所有操作编译为一个 MutationPlan：按依赖排序、合并为嵌套的 object.set 条目并分块执行，
+    批量规模增大时 WAAPI 往返次数基本不变。操作格式见 MutationPlan.from_operations。
+
+    Args:
+        operations: 操作列表；"$ref" 形式的 parent/target/value 引用同批次中新建的节点
+
+    Returns:
+        新建节点 {ref: {id, name, path, type}} 与实际调用次数
+    """
+    try:
+        plan = MutationPlan.from_operations(operations)
+
+        # 防御性校验：属性名必须在已知白名单中
+        for op in operations:
+            names = []
+            if op.get("op") == "set_property":
+                names.append(op["property"])
+            elif op.get("op") == "create":
+                names.extend((op.get("properties") or {}).keys())
+            for prop_name in names:
+                if not doc_index.is_valid_property(prop_name):
+                    suggestions = doc_index.get_similar_properties(prop_name)
+                    return _err_raw(
+                        "invalid_property",
+                        f"未知属性名 '{prop_name}'，请检查拼写",
+                        f"相近的合法属性名：{suggestions}" if suggestions else "请调用 get_object_properties 获取合法属性列表",
+                    )
+
+        result = await plan.execute(WwiseAdapter())
+        return _ok({
+            "created": result.created,
+            "operations": len(operations),
+            "waapi_set_calls": result.calls,
+            "objects_submitted": result.objects,
+        })
+    except ValueError as e:
+        return _err_raw("invalid_param", str(e))
+    except WwiseMCPError as e:
+        return _err(e)
+    except Exception as e:
+        return _err_raw("unexpected_error", str(e))
+
+
 
 async def delete_object(object_path: str, force: bool = False) -> dict:
     """
@@ -321,16 +389,18 @@ async def move_object(object_path: str, new_parent_path: str) -> dict:
         return _err_raw("unexpected_error", str(e))
 
 
-async def preview_event(event_path: str, action: str = "play") -> dict:
+async def preview_event(event_path: str | None = None, action: str = "play") -> dict:
     """
     通过 Wwise Transport API 试听 Event（无需连接游戏实例）。
 
     Args:
-        event_path: Event 的完整 WAAPI 路径，或对象 ID（{XXXXXXXX-...} 格式）
+        event_path: Event 的完整 WAAPI 路径，或对象 ID（{XXXXXXXX-...} 格式）；
+                    stop/pause/resume 时省略表示作用于所有正在试听的 Event
         action:     'play'（默认）| 'stop' | 'pause' | 'resume'
 
     工作原理：Wwise 内置 Transport 可直接在 Authoring 中预览 Event，
     等同于在 Wwise 里按 F5 试听，无需部署到游戏或生成 SoundBank。
+    transport 按 Event 复用（TransportPool），重复试听同一 Event 只需一次调用。
     """
     try:
         adapter = WwiseAdapter()
@@ -342,38 +412,25 @@ async def preview_event(event_path: str, action: str = "play") -> dict:
                 f"不支持的 action：'{action}'",
                 f"可用值：{sorted(valid_actions)}",
             )
+        if action == "play" and not event_path:
+            return _err_raw("invalid_param", "play 需要提供 event_path")
 
+        info = await transport_pool.execute(adapter, event_path or None, action)
+
+        if not event_path:
+            return _ok({"action": action, "note": f"已对 {info['transports']} 个试听中的 Transport 执行操作"})
+        data = {
+            "event_path": event_path,
+            "action": action,
+            "transport_id": info["transport_id"],
+            "state": info["state"],
+            "reused_transport": info["reused"],
+        }
         if action == "play":
-            # 每次 play 创建新 transport 对象
-            transport_result = await adapter.call(
-                "ak.wwise.core.transport.create",
-                {"object": event_path},
-            )
-            if not transport_result:
-                return _err_raw(
-                    "waapi_error",
-                    "Transport 创建失败，请确认 Event 路径正确且 Wwise 项目已加载",
-                    "可先调用 search_objects 或 get_selected_objects 确认路径",
-                )
-            transport_id = transport_result.get("transport")
-            await adapter.call(
-                "ak.wwise.core.transport.executeAction",
-                {"transport": transport_id, "action": "play"},
-            )
-            return _ok({
-                "event_path": event_path,
-                "action": "play",
-                "transport_id": transport_id,
-                "note": "正在 Wwise Authoring 中预览，调用 preview_event(action='stop') 可停止",
-            })
-        else:
-            # stop/pause/resume 需要有效的 transport_id
-            # 兜底：广播 stop-all
-            await adapter.call(
-                "ak.wwise.core.transport.executeAction",
-                {"transport": -1, "action": action},
-            )
-            return _ok({"action": action, "note": "已对所有 Transport 执行操作"})
+            data["note"] = "正在 Wwise Authoring 中预览，调用 preview_event(event_path, action='stop') 可停止"
+        elif info["transport_id"] is None:
+            data["note"] = "该 Event 当前没有试听中的 Transport"
+        return _ok(data)
 
     except WwiseMCPError as e:
         return _err(e)
@@ -0,0 +1,593 @@
+"""
+Layer 4 — 媒体文件工具（4 个）
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from typing import TYPE_CHECKING, Any
+
+from ..config import settings
+from ..core.adapter import WwiseAdapter
+from ..core.exceptions import WwiseMCPError
+from ..core.inheritance import resolve_effective
+from ..core.jobs import checkpoint
+from ..core.media_index import media_index
+from ..core.snapshot import snapshots
+from ..media import HashCache, collect_wav_files, find_duplicates, probe_files, scan_wavs
+
+if TYPE_CHECKING:
+    from ..media import LoudnessCache
+
+logger = logging.getLogger("wwise_mcp.tools.media")
+
+
+def _ok(data: Any) -> dict:
+    return {"success": True, "data": data, "error": None}
+
+def _err(e: WwiseMCPError) -> dict:
+    return e.to_dict()
+
+def _err_raw(code: str, message: str, suggestion: str | None = None) -> dict:
+    return {
+        "success": False,
+        "data": None,
+        "error": {"code": code, "message": message, "suggestion": suggestion},
+    }
+
+
+def _placeholders(path: str, root: str | None) -> dict:
+    """
+    路径模板占位符：
+      {stem}   文件名（不含扩展名）
+      {parent} 文件所在目录名
+      {subdir} 相对于导入根目录的子目录（以 \\ 分隔，文件列表模式下为空）
+    """
+    subdir = ""
+    if root:
+        rel = os.path.relpath(os.path.dirname(path), root)
+        subdir = "" if rel == "." else rel.replace(os.sep, "\\").replace("/", "\\")
+    return {
+        "stem": os.path.splitext(os.path.basename(path))[0],
+        "parent": os.path.basename(os.path.dirname(path)),
+        "subdir": subdir,
+    }
+
+
+def _expand_target(pattern: str, fields: dict, obj_type: str) -> str:
+    """展开目标对象路径模板；末级未指定 <Type> 时自动加上 obj_type"""
+    parts = [p for p in pattern.format(**fields).split("\\") if p]
+    if parts and not parts[-1].startswith("<"):
+        parts[-1] = f"<{obj_type}>{parts[-1]}"
+    return "\\" + "\\".join(parts)
+
+
+async def import_audio(
+    files: list[str] | None = None,
+    directory: str | None = None,
+    target_pattern: str = "\\Actor-Mixer Hierarchy\\Default Work Unit\\{stem}",
+    object_type: str = "Sound SFX",
+    import_operation: str = "useExisting",
+    language: str = "SFX",
+    recursive: bool = True,
+    originals_subfolder: str = "",
+) -> dict:
+    """
+    批量导入 WAV 文件（ak.wwise.core.audio.import）。
+
+    先在本地线程池中并行解析 RIFF 文件头（mmap，不读取采样数据）并校验编码、声道、采样率与
+    data 长度，不合格的文件在任何 WAAPI 调用之前被拒绝；合格文件按 settings.import_batch_size
+    分批提交，每批完成后上报进度。
+
+    Args:
+        files:               WAV 文件路径列表（与 directory 二选一）
+        directory:           导入目录，收集其中的 .wav 文件
+        target_pattern:      目标对象路径模板，支持 {stem} / {parent} / {subdir}
+        object_type:         末级未写 <Type> 时使用的对象类型
+        import_operation:    'useExisting'（默认）| 'createNew' | 'replaceExisting'
+        language:            导入语言，音效为 'SFX'
+        recursive:           directory 模式下是否递归子目录
+        originals_subfolder: Originals 下的子目录模板，同样支持 {subdir} 等占位符
+    """
+    try:
+        if bool(files) == bool(directory):
+            return _err_raw("invalid_param", "必须且只能提供 files 或 directory 之一")
+        if directory and not os.path.isdir(directory):
+            return _err_raw("invalid_param", f"目录不存在：{directory}")
+        if directory:
+            directory = os.path.abspath(directory)
+
+        paths = (
+            await asyncio.to_thread(collect_wav_files, directory, recursive)
+            if directory else [os.path.abspath(p) for p in files]
+        )
+        if not paths:
+            return _err_raw("invalid_param", "未找到任何 .wav 文件")
+
+        await checkpoint(0, len(paths), f"校验 {len(paths)} 个文件头")
+        valid, rejected = await asyncio.to_thread(scan_wavs, paths)
+
+        # 展开目标路径；多个文件映射到同一对象时只保留第一个
+        imports = []
+        seen: dict[str, str] = {}
+        total_duration = 0.0
+        for info in valid:
+            fields = _placeholders(info.path, directory)
+            target = _expand_target(target_pattern, fields, object_type)
+            if target in seen:
+                rejected.append({"path": info.path, "error": f"目标对象与 {seen[target]} 重复：{target}"})
+                continue
+            seen[target] = info.path
+            entry = {"audioFile": info.path, "objectPath": target}
+            if originals_subfolder:
+                entry["originalsSubFolder"] = originals_subfolder.format(**fields).strip("\\")
+            imports.append(entry)
+            total_duration += info.duration
+
+        adapter = WwiseAdapter()
+        imported: list[dict] = []
+        batch = max(1, settings.import_batch_size)
+        calls = 0
+        for start in range(0, len(imports), batch):
+            chunk = imports[start:start + batch]
+            objects = await adapter.import_audio(chunk, import_operation, language)
+            calls += 1
+            imported.extend(objects)
+            await checkpoint(
+                start + len(chunk), len(imports),
+                f"已导入 {start + len(chunk)}/{len(imports)}",
+                partial=[{"file": e["audioFile"], "object_path": e["objectPath"]} for e in chunk],
+            )
+
+        return _ok({
+            "requested": len(paths),
+            "imported": len(imports),
+            "rejected": rejected,
+            "waapi_calls": calls,
+            "objects": imported[:100],
+            "objects_truncated": len(imported) > 100,
+            "total_duration_s": round(total_duration, 3),
+        })
+    except WwiseMCPError as e:
+        return _err(e)
+    except Exception as e:
+        return _err_raw("unexpected_error", str(e))
+
+
+# ------------------------------------------------------------------
+# 媒体占用统计
+# ------------------------------------------------------------------
+
+_FOOTPRINT_GROUPS = ("event", "bus", "soundbank")
+
+# 最近一次统计的全项目汇总（与结果快照同时失效）
+_footprint_totals: dict[str, dict] = {}
+snapshots.add_listener(_footprint_totals.clear)
+
+
+class _Footprint:
+    """source → 文件 → (大小, WavInfo) 的查表，按 source 集合汇总（同一文件只计一次）"""
+
+    def __init__(self, probes: dict):
+        self.probes = probes
+
+    def summarize(self, sources) -> dict:
+        files = {media_index.file(s) for s in sources} - {None}
+        size = pcm = 0
+        duration = 0.0
+        missing = 0
+        for path in files:
+            file_size, info = self.probes.get(path, (-1, None))
+            if file_size < 0:
+                missing += 1
+                continue
+            size += file_size
+            if info is not None:
+                pcm += info.data_size
+                duration += info.duration
+        return {
+            "sources": len(sources),
+            "files": len(files),
+            "bytes": size,
+            "pcm_bytes": pcm,
+            "duration_s": round(duration, 3),
+            "missing_files": missing,
+        }
+
+
+async def _bus_sources(adapter: WwiseAdapter) -> list[tuple[dict, frozenset]]:
+    """每个 Bus 经有效 OutputBus 路由到的 source（含子 Bus 汇入的部分）"""
+    (sounds, _), (buses, _) = await asyncio.gather(
+        adapter.query(types=["Sound"], fields=["id", "type", "path"]),
+        adapter.query(types=["Bus", "AuxBus"], fields=["id", "name", "type", "path", "parent"]),
+    )
+    direct: dict[str, set] = {}
+    if sounds:
+        _, resolver, handles = await resolve_effective(adapter, sounds, ["OutputBus"])
+        for sound, handle in zip(sounds, handles):
+            bus, _source = resolver.effective(handle, "OutputBus") if handle is not None else (None, None)
+            bus_id = bus.get("id") if isinstance(bus, dict) else None
+            if bus_id:
+                direct.setdefault(bus_id, set()).update(media_index.node_media(sound["id"]))
+
+    by_id = {b["id"]: b for b in buses}
+    totals: dict[str, set] = {}
+    for bus_id, sources in direct.items():
+        # 沿父 Bus 链向上累加
+        while bus_id in by_id:
+            totals.setdefault(bus_id, set()).update(sources)
+            parent = by_id[bus_id].get("parent")
+            bus_id = parent.get("id") if isinstance(parent, dict) else None
+    return [(by_id[b], frozenset(s)) for b, s in totals.items()]
+
+
+async def _soundbank_sources(adapter: WwiseAdapter) -> list[tuple[dict, frozenset]]:
+    """每个 SoundBank 按 inclusion（含 media 过滤）包含的 source"""
+    banks, _ = await adapter.query(types=["SoundBank"], fields=["id", "name", "type", "path"])
+    results = await asyncio.gather(*(
+        adapter.call("ak.wwise.core.soundbank.getInclusions", {"soundbank": bank["id"]})
+        for bank in banks
+    ), return_exceptions=True)
+
+    all_events = media_index.events()
+    all_sources = media_index.sources()
+    rows = []
+    for bank, result in zip(banks, results):
+        if isinstance(result, Exception):
+            logger.warning("读取 SoundBank %s 的 inclusion 失败：%s", bank.get("path"), result)
+            continue
+        sources: set = set()
+        for inclusion in result.get("inclusions", []):
+            if "media" not in inclusion.get("filter", ["media"]):
+                continue
+            obj_id = inclusion.get("object")
+            obj_type = media_index.type(obj_id)
+            if obj_type == "Event":
+                sources |= media_index.event_media(obj_id)
+            elif obj_type is not None:
+                sources |= media_index.node_media(obj_id)
+            else:
+                # Work Unit / 文件夹：其下全部 Event 与 source
+                found = await adapter.get_objects(from_spec={"id": [obj_id]}, return_fields=["path"])
+                if not found:
+                    continue
+                prefix = found[0]["path"].rstrip("\\") + "\\"
+                for event_id in all_events:
+                    if (media_index.path(event_id) or "").startswith(prefix):
+                        sources |= media_index.event_media(event_id)
+                sources.update(s for s in all_sources if (media_index.path(s) or "").startswith(prefix))
+        rows.append((bank, frozenset(sources)))
+    return rows
+
+
+async def get_media_footprint(
+    group_by: str = "event",
+    name_contains: str | None = None,
+    max_results: int = 50,
+    cursor: str | None = None,
+) -> dict:
+    """
+    统计原始媒体文件的磁盘 / 内存占用，按 Event、Bus 或 SoundBank 汇总（按字节数降序分页）。
+
+    AudioFileSource 的原始文件由媒体闭包索引解析；文件大小与 WAV 头（时长、声道、采样率）
+    在本地线程池中并行读取（mmap，只解析文件头）。同一分组内同一文件只计一次：
+      - event：Event 经 Play Action 可达的全部 source（Auto-Defined SoundBank 下即每个 Event 的 Bank）
+      - bus：经有效 OutputBus 路由到该 Bus 的 Sound，子 Bus 计入父 Bus
+      - soundbank：按 SoundBank inclusion（含 media）包含的对象
+    pcm_bytes 为未压缩采样数据量，是转码前内存占用的上限估计。
+
+    Args:
+        group_by:      'event'（默认）| 'bus' | 'soundbank'
+        name_contains: 只返回名称（路径）包含该子串的分组
+        max_results:   每页数量，默认 50
+        cursor:        上一页返回的 next_cursor
+    """
+    try:
+        if group_by not in _FOOTPRINT_GROUPS:
+            return _err_raw("invalid_param", f"group_by 必须为 {list(_FOOTPRINT_GROUPS)} 之一")
+        adapter = WwiseAdapter()
+
+        async def fetch() -> list[dict]:
+            await checkpoint(0, 3, "解析媒体引用")
+            await media_index.ensure(adapter)
+            sources = media_index.sources()
+            files = {media_index.file(s) for s in sources} - {None}
+
+            await checkpoint(1, 3, f"读取 {len(files)} 个文件头")
+            footprint = _Footprint(await asyncio.to_thread(probe_files, files))
+            _footprint_totals[group_by] = footprint.summarize(sources)
+
+            await checkpoint(2, 3, f"按 {group_by} 汇总")
+            if group_by == "event":
+                groups = [
+                    ({"id": e, "name": (media_index.path(e) or "").rpartition("\\")[2],
+                      "path": media_index.path(e)}, media_index.event_media(e))
+                    for e in media_index.events()
+                ]
+            elif group_by == "bus":
+                groups = await _bus_sources(adapter)
+            else:
+                groups = await _soundbank_sources(adapter)
+
+            needle = name_contains.lower() if name_contains else ""
+            rows = [
+                {"name": obj.get("name"), "path": obj.get("path"), "id": obj.get("id"),
+                 **footprint.summarize(sources)}
+                for obj, sources in groups
+                if needle in (obj.get("path") or "").lower()
+            ]
+            await checkpoint(3, 3, "完成")
+            return rows
+
+        page = await snapshots.paginate(
+            adapter, "get_media_footprint", {"group_by": group_by, "name_contains": name_contains},
+            fetch, cursor, max_results,
+            sort_key=lambda row: (-row["bytes"], row["path"] or ""),
+        )
+        return _ok({
+            "group_by": group_by,
+            "project_total": _footprint_totals.get(group_by),
+            "total": page["total"],
+            "count": len(page["items"]),
+            "groups": page["items"],
+            "next_cursor": page["next_cursor"],
+        })
+    except WwiseMCPError as e:
+        return _err(e)
+    except Exception as e:
+        return _err_raw("unexpected_error", str(e))
+
+
+# ------------------------------------------------------------------
+# 重复媒体检测
+# ------------------------------------------------------------------
+
+_hash_cache: HashCache | None = None
+
+# 最近一次扫描的统计（与结果快照同时失效）
+_duplicate_stats: dict[str, dict] = {}
+snapshots.add_listener(_duplicate_stats.clear)
+
+
+def _get_hash_cache() -> HashCache:
+    global _hash_cache
+    if _hash_cache is None:
+        _hash_cache = HashCache()
+    return _hash_cache
+
+
+async def find_duplicate_media(
+    directory: str | None = None,
+    originals: bool = False,
+    max_results: int = 50,
+    cursor: str | None = None,
+) -> dict:
+    """
+    检测内容相同的媒体文件（逐字节相同，或 WAV 采样数据相同、仅元数据不同），
+    并列出引用每个副本的 AudioFileSource。
+
+    先按文件头（编码 / 声道 / 采样率 / 位深 / data 长度）分组过滤，只对可能重复的文件在线程池中
+    并行哈希采样数据；哈希按 (path, size, mtime) 持久化缓存，重复扫描只读取变化的文件。
+    directory 与 originals 均未指定时，扫描项目中 AudioFileSource 引用的全部原始文件。
+
+    Args:
+        directory:   扫描该目录下的 .wav 文件
+        originals:   扫描项目的 Originals 目录（getProjectInfo）
+        max_results: 每页重复组数量，默认 50（按浪费字节数降序）
+        cursor:      上一页返回的 next_cursor
+    """
+    try:
+        adapter = WwiseAdapter()
+        if directory and not os.path.isdir(directory):
+            return _err_raw("invalid_param", f"目录不存在：{directory}")
+
+        async def fetch() -> list[dict]:
+            await media_index.ensure(adapter)
+            if directory or originals:
+                root = directory
+                if root is None:
+                    info = await adapter.call("ak.wwise.core.getProjectInfo")
+                    root = ((info or {}).get("directories") or {}).get("originals")
+                    if not root or not os.path.isdir(root):
+                        raise ValueError(f"无法定位 Originals 目录：{root}")
+                paths = await asyncio.to_thread(collect_wav_files, root)
+            else:
+                paths = sorted({media_index.file(s) for s in media_index.sources()} - {None})
+
+            await checkpoint(0, 1, f"在 {len(paths)} 个文件中哈希候选重复文件")
+            groups, stats = await asyncio.to_thread(find_duplicates, paths, _get_hash_cache())
+            _duplicate_stats[key] = stats
+
+            rows = []
+            for size, group in groups:
+                rows.append({
+                    "copies": len(group),
+                    "bytes_each": size,
+                    "wasted_bytes": size * (len(group) - 1),
+                    "files": [
+                        {"path": path,
+                         "objects": sorted(media_index.path(s) or s for s in media_index.sources_for_file(path, exact=True))}
+                        for path in group
+                    ],
+                })
+            await checkpoint(1, 1, f"{len(rows)} 组重复文件")
+            return rows
+
+        key = directory or ("originals" if originals else "project")
+        page = await snapshots.paginate(
+            adapter, "find_duplicate_media", {"source": key}, fetch, cursor, max_results,
+            sort_key=lambda row: (-row["wasted_bytes"], row["files"][0]["path"]),
+        )
+        return _ok({
+            "scan": _duplicate_stats.get(key),
+            "duplicate_groups": page["total"],
+            "count": len(page["items"]),
+            "groups": page["items"],
+            "next_cursor": page["next_cursor"],
+        })
+    except WwiseMCPError as e:
+        return _err(e)
+    except Exception as e:
+        return _err_raw("unexpected_error", str(e))
+
+
+# ------------------------------------------------------------------
+# 响度分析
+# ------------------------------------------------------------------
+
+_loudness_cache: "LoudnessCache | None" = None
+
+# 最近一次分析的统计（与结果快照同时失效）
+_loudness_stats: dict[str, dict] = {}
+snapshots.add_listener(_loudness_stats.clear)
+
+_MIN_OFFSET_DB = 0.1          # 小于该值的偏移不生成修改操作
+
+
+def _get_loudness_cache() -> "LoudnessCache":
+    from ..media import LoudnessCache
+
+    global _loudness_cache
+    if _loudness_cache is None:
+        _loudness_cache = LoudnessCache()
+    return _loudness_cache
+
+
+async def _own_volumes(adapter: WwiseAdapter, ids: list[str]) -> dict[str, float]:
+    """分块读取对象自身的 Volume"""
+    size = max(1, settings.read_chunk_size)
+    batches = await asyncio.gather(*(
+        adapter.get_objects(from_spec={"id": ids[i:i + size]}, return_fields=["id", "Volume"], obj_type="Sound")
+        for i in range(0, len(ids), size)
+    ))
+    return {row["id"]: row.get("Volume") or 0.0 for batch in batches for row in batch if row.get("id")}
+
+
+async def analyze_loudness(
+    scope_path: str | None = None,
+    files: list[str] | None = None,
+    target_lufs: float = -23.0,
+    peak_ceiling: float = -1.0,
+    max_results: int = 50,
+    cursor: str | None = None,
+) -> dict:
+    """
+    分析源媒体的峰值 / RMS / 近似积分响度，并给出使各 Sound 达到目标响度的 Volume 偏移。
+
+    WAV 采样按块解码后用 numpy 向量化计算（需要 numpy），多个文件在进程池中并行分析；
+    结果按内容哈希持久化缓存，重复分析只读取变化的文件。响度按 BS.1770 门限计算但不做
+    K 计权，只适合素材之间的相对对齐。
+
+    scope 模式下按 Sound 汇总（多个 source 取最响的一个），建议值 = 当前 Volume + 偏移，
+    偏移同时受 peak_ceiling 限制（峰值不超过该 dBFS）。返回的 mutations 可直接传给 apply_mutations。
+
+    Args:
+        scope_path:   分析该路径下 Sound 引用的原始文件（与 files 均未指定时为整个项目）
+        files:        直接分析这些 WAV 文件（不生成修改操作）
+        target_lufs:  目标响度，默认 -23
+        peak_ceiling: 峰值上限（dBFS），默认 -1
+        max_results:  每页数量，默认 50（按偏移绝对值降序）
+        cursor:       上一页返回的 next_cursor
+    """
+    # 响度模块会加载 numpy，只在本工具首次调用时导入
+    from ..media import NUMPY_AVAILABLE, analyze_files, suggest_offset
+
+    try:
+        if not NUMPY_AVAILABLE:
+            return _err_raw(
+                "missing_dependency", "响度分析需要 numpy",
+                '安装可选依赖：pip install "wwise-mcp[analysis]"',
+            )
+        if files and scope_path:
+            return _err_raw("invalid_param", "scope_path 与 files 只能提供其一")
+        adapter = WwiseAdapter()
+        if files:
+            # 文件列表模式：快照键包含文件列表摘要，不同的文件列表不会复用彼此的结果
+            listing = "\n".join(sorted({os.path.abspath(p) for p in files}))
+            key = "files:" + hashlib.blake2b(listing.encode("utf-8"), digest_size=8).hexdigest()
+        else:
+            key = scope_path or "project"
+
+        async def fetch() -> list[dict]:
+            owners: dict[str, set[str]] = {}        # 文件 → 引用它的 Sound
+            sound_paths: dict[str, str] = {}
+            if files:
+                paths = [os.path.abspath(p) for p in files]
+            else:
+                await media_index.ensure(adapter)
+                prefix = scope_path.rstrip("\\") + "\\" if scope_path else ""
+                for source in media_index.sources():
+                    path, sound = media_index.file(source), media_index.parent(source)
+                    source_path = media_index.path(source) or ""
+                    if path and sound and source_path.startswith(prefix):
+                        owners.setdefault(path, set()).add(sound)
+                        sound_paths[sound] = source_path.rpartition("\\")[0]
+                paths = sorted(owners)
+
+            await checkpoint(0, 2, f"分析 {len(paths)} 个文件")
+            results, stats = await asyncio.to_thread(
+                analyze_files, paths, _get_hash_cache(), _get_loudness_cache(),
+            )
+            _loudness_stats[key] = {**stats, "errors": [
+                {"file": path, "error": r["error"]} for path, r in results.items() if "error" in r
+            ][:20]}
+
+            await checkpoint(1, 2, "计算 Volume 偏移")
+            if files:
+                rows = [
+                    {"file": path, **result, "offset_db": suggest_offset(result, target_lufs, peak_ceiling)}
+                    for path, result in results.items() if "error" not in result
+                ]
+            else:
+                # 每个 Sound 取最响的 source（Volume 作用于整个对象，以它为准才不会削波）
+                loudest: dict[str, tuple[str, dict]] = {}
+                for path, result in results.items():
+                    if "error" in result or result.get("loudness") is None:
+                        continue
+                    for sound in owners.get(path, ()):
+                        best = loudest.get(sound)
+                        if best is None or result["loudness"] > best[1]["loudness"]:
+                            loudest[sound] = (path, result)
+                volumes = await _own_volumes(adapter, sorted(loudest))
+                rows = []
+                for sound, (path, result) in loudest.items():
+                    offset = suggest_offset(result, target_lufs, peak_ceiling)
+                    volume = volumes.get(sound, 0.0)
+                    rows.append({
+                        "object": sound_paths.get(sound) or sound,
+                        "id": sound,
+                        "file": path,
+                        **result,
+                        "offset_db": offset,
+                        "volume": volume,
+                        "suggested_volume": round(volume + offset, 2),
+                    })
+            await checkpoint(2, 2, f"{len(rows)} 行")
+            return rows
+
+        page = await snapshots.paginate(
+            adapter, "analyze_loudness",
+            {"source": key, "target_lufs": target_lufs, "peak_ceiling": peak_ceiling},
+            fetch, cursor, max_results,
+            sort_key=lambda row: (-abs(row["offset_db"] or 0), row.get("object") or row["file"]),
+        )
+        mutations = [
+            {"op": "set_property", "target": row["object"], "property": "Volume", "value": row["suggested_volume"]}
+            for row in page["items"]
+            if "suggested_volume" in row and abs(row["offset_db"]) >= _MIN_OFFSET_DB
+        ]
+        return _ok({
+            "target_lufs": target_lufs,
+            "peak_ceiling": peak_ceiling,
+            "scan": _loudness_stats.get(key),
+            "total": page["total"],
+            "count": len(page["items"]),
+            "rows": page["items"],
+            "mutations": mutations,
+            "next_cursor": page["next_cursor"],
+        })
+    except WwiseMCPError as e:
+        return _err(e)
+    except Exception as e:
+        return _err_raw("unexpected_error", str(e))
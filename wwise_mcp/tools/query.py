@@ -1,12 +1,23 @@
 """
-Layer 4 — 查询类工具（7 + 1 个）
+Layer 4 — 查询类工具（7 + 7 个）
 """
 
+import asyncio
 import logging
-from typing import Any, Optional
+import time
+from typing import TYPE_CHECKING, Any, Optional
 
+from ..config import settings
 from ..core.adapter import WwiseAdapter
+from ..core.budget import COLUMNAR_SUFFIX, rows_to_columns
 from ..core.exceptions import WwiseMCPError
+from ..core.inheritance import ADDITIVE, OVERRIDE_FLAG, resolve_effective
+from ..core.jobs import checkpoint
+from ..core.media_index import media_index
+from ..core.snapshot import snapshots
+
+if TYPE_CHECKING:
+    from ..store import ColumnStore, ObjectStore
 
 logger = logging.getLogger("wwise_mcp.tools.query")
 
@@ -141,10 +152,19 @@ async def get_object_properties(object_path: str, page: int = 1, page_size: int
         return _err_raw("unexpected_error", str(e))
 
 
+_SEARCH_TYPES = [
+    "Sound", "Event", "Bus", "AuxBus",
+    "GameParameter", "ActorMixer", "BlendContainer",
+    "RandomSequenceContainer", "SwitchContainer",
+]
+
+
 async def search_objects(
     query: str,
     type_filter: str | None = None,
     max_results: int = 20,
+    cursor: str | None = None,
+    scope_path: str | None = None,
 ) -> dict:
     """
     按关键词模糊搜索 Wwise 对象。
@@ -152,40 +172,38 @@ async def search_objects(
     Args:
         query:       搜索关键词（对象名称模糊匹配）
         type_filter: 可选类型过滤，如 'Sound', 'Event', 'Bus', 'GameParameter' 等
-        max_results: 最多返回结果数，默认 20
+        max_results: 每页最多返回结果数，默认 20
+        cursor:      上一页返回的 next_cursor；翻页时从结果快照读取，不再重新查询 Wwise
+        scope_path:  可选范围路径，只搜索其后代
     """
     try:
         adapter = WwiseAdapter()
 
-        args: dict[str, Any] = {
-            "from": {
-                "ofType": [type_filter] if type_filter else [
-                    "Sound", "Event", "Bus", "AuxBus",
-                    "GameParameter", "ActorMixer", "BlendContainer",
-                    "RandomSequenceContainer", "SwitchContainer",
-                ]
-            },
-            # 注意：WAAPI 2024.1 不支持顶层 where 参数，改为客户端过滤
-        }
+        async def fetch() -> list[dict]:
+            # 规划器按基数在全局 ofType 与 scope descendants 之间选择；
+            # 注意：WAAPI 2024.1 不支持顶层 where 参数，名称过滤在客户端完成
+            objects, plan = await adapter.query(
+                types=[type_filter] if type_filter else _SEARCH_TYPES,
+                scope=scope_path,
+                fields=["name", "type", "path", "id"],
+                name_contains=query,
+            )
+            await checkpoint(1, 2, f"{plan.strategy}：命中 {len(objects)} 个对象")
+            return objects
 
-        result = await adapter.call(
-            "ak.wwise.core.object.get",
-            args,
-            {"return": ["name", "type", "path", "id"]},
+        page = await snapshots.paginate(
+            adapter, "search_objects",
+            {"query": query, "type_filter": type_filter, "scope_path": scope_path},
+            fetch, cursor, max_results,
         )
-        all_objects = result.get("return", []) if result else []
-
-        # 客户端按名称子串过滤（不区分大小写）
-        query_lower = query.lower()
-        objects = [o for o in all_objects if query_lower in o.get("name", "").lower()]
-        objects.sort(key=lambda x: x.get("path", ""))
-        objects = objects[:max_results]
-
         return _ok({
             "query": query,
             "type_filter": type_filter,
-            "count": len(objects),
-            "objects": objects,
+            "scope_path": scope_path,
+            "total": page["total"],
+            "count": len(page["items"]),
+            "objects": page["items"],
+            "next_cursor": page["next_cursor"],
         })
     except WwiseMCPError as e:
         return _err(e)
@@ -193,28 +211,70 @@ async def search_objects(
         return _err_raw("unexpected_error", str(e))
 
 
-async def get_bus_topology() -> dict:
+async def get_bus_topology(max_results: int = 100, cursor: str | None = None) -> dict:
     """
     获取 Master-Mixer Hierarchy 中所有 Bus 的拓扑结构。
+
+    Args:
+        max_results: 每页最多返回的 Bus 数，默认 100
+        cursor:      上一页返回的 next_cursor
     """
     try:
         adapter = WwiseAdapter()
-        args = {
-            "from": {"path": ["\\Master-Mixer Hierarchy"]},
-            "transform": [{"select": ["descendants"]}],
-            # 注意：transform where 在 WAAPI 2024.1 中不支持，改为客户端过滤
-        }
-        result = await adapter.call(
-            "ak.wwise.core.object.get",
-            args,
-            {"return": ["name", "type", "path", "id", "childrenCount"]},
-        )
-        all_descendants = result.get("return", []) if result else []
-        buses = [o for o in all_descendants if o.get("type") == "Bus"]
 
+        async def fetch() -> list[dict]:
+            args = {
+                "from": {"path": ["\\Master-Mixer Hierarchy"]},
+                "transform": [{"select": ["descendants"]}],
+                # 注意：transform where 在 WAAPI 2024.1 中不支持，改为客户端过滤
+            }
+            result = await adapter.call(
+                "ak.wwise.core.object.get",
+                args,
+                {"return": ["name", "type", "path", "id", "childrenCount"]},
+            )
+            all_descendants = result.get("return", []) if result else []
+            return [o for o in all_descendants if o.get("type") == "Bus"]
+
+        page = await snapshots.paginate(adapter, "get_bus_topology", {}, fetch, cursor, max_results)
+        return _ok({
+            "total_buses": page["total"],
+            "count": len(page["items"]),
+            "buses": page["items"],
+            "next_cursor": page["next_cursor"],
+        })
+    except WwiseMCPError as e:
+        return _err(e)
+    except Exception as e:
+        return _err_raw("unexpected_error", str(e))
+
+
+async def get_page(cursor: str, max_results: int = 50) -> dict:
+    """
+    按游标读取结果快照的下一页（不调用 WAAPI）。
+
+    Args:
+        cursor:      列表工具返回的 next_cursor，或超出响应预算时返回的 <列表名>_cursor
+        max_results: 每页数量，默认 50
+
+    列式表（columns_cursor）的剩余行同样以 columns 返回。
+    """
+    try:
+        page = snapshots.read(cursor, max_results)
+        if page["tool"].endswith(COLUMNAR_SUFFIX):
+            return _ok({
+                "total": page["total"],
+                "offset": page["offset"],
+                "count": len(page["items"]),
+                "columns": rows_to_columns(page["items"]),
+                "next_cursor": page["next_cursor"],
+            })
         return _ok({
-            "total_buses": len(buses),
-            "buses": buses,
+            "total": page["total"],
+            "offset": page["offset"],
+            "count": len(page["items"]),
+            "items": page["items"],
+            "next_cursor": page["next_cursor"],
         })
     except WwiseMCPError as e:
         return _err(e)
@@ -262,30 +322,41 @@ async def get_event_actions(event_path: str) -> dict:
         return _err_raw("unexpected_error", str(e))
 
 
-async def get_soundbank_info(soundbank_name: str | None = None) -> dict:
+async def get_soundbank_info(
+    soundbank_name: str | None = None,
+    max_results: int = 50,
+    cursor: str | None = None,
+) -> dict:
     """
     获取 SoundBank 信息。
 
     Args:
         soundbank_name: 指定 SoundBank 名称；为 None 时返回所有 SoundBank 概览。
+        max_results:    每页最多返回数量，默认 50
+        cursor:         上一页返回的 next_cursor
     """
     try:
         adapter = WwiseAdapter()
 
-        if soundbank_name:
-            args = {"from": {"path": [f"\\SoundBanks\\{soundbank_name}"]}}
-        else:
-            args = {
-                "from": {"path": ["\\SoundBanks"]},
-                "transform": [{"select": ["children"]}],
-            }
+        async def fetch() -> list[dict]:
+            if soundbank_name:
+                args = {"from": {"path": [f"\\SoundBanks\\{soundbank_name}"]}}
+            else:
+                args = {
+                    "from": {"path": ["\\SoundBanks"]},
+                    "transform": [{"select": ["children"]}],
+                }
+            result = await adapter.call(
+                "ak.wwise.core.object.get",
+                args,
+                {"return": ["name", "type", "path", "id"]},
+            )
+            return result.get("return", [])
 
-        result = await adapter.call(
-            "ak.wwise.core.object.get",
-            args,
-            {"return": ["name", "type", "path", "id"]},
+        page = await snapshots.paginate(
+            adapter, "get_soundbank_info", {"soundbank_name": soundbank_name},
+            fetch, cursor, max_results,
         )
-        banks = result.get("return", [])
 
         try:
             project_info = await adapter.get_info()
@@ -295,8 +366,10 @@ async def get_soundbank_info(soundbank_name: str | None = None) -> dict:
 
         return _ok({
             "auto_defined_soundbank_enabled": auto_soundbank,
-            "soundbank_count": len(banks),
-            "soundbanks": banks,
+            "soundbank_count": page["total"],
+            "count": len(page["items"]),
+            "soundbanks": page["items"],
+            "next_cursor": page["next_cursor"],
             "note": "Wwise 2024.1 默认开启 Auto-Defined SoundBank，无需手动管理 Bank 加载/卸载",
         })
     except WwiseMCPError as e:
@@ -305,27 +378,31 @@ async def get_soundbank_info(soundbank_name: str | None = None) -> dict:
         return _err_raw("unexpected_error", str(e))
 
 
-async def get_rtpc_list(max_results: int = 50) -> dict:
+async def get_rtpc_list(max_results: int = 50, cursor: str | None = None) -> dict:
     """
     获取项目中所有 Game Parameter（RTPC）列表。
 
     Args:
-        max_results: 最多返回数量，默认 50
+        max_results: 每页最多返回数量，默认 50
+        cursor:      上一页返回的 next_cursor
     """
     try:
         adapter = WwiseAdapter()
-        result = await adapter.call(
-            "ak.wwise.core.object.get",
-            {"from": {"ofType": ["GameParameter"]}},
-            {"return": ["name", "type", "path", "id", "Min", "Max", "InitialValue"]},
-        )
-        rtpcs = result.get("return", [])
-        rtpcs.sort(key=lambda x: x.get("path", ""))
-        rtpcs = rtpcs[:max_results]
 
+        async def fetch() -> list[dict]:
+            result = await adapter.call(
+                "ak.wwise.core.object.get",
+                {"from": {"ofType": ["GameParameter"]}},
+                {"return": ["name", "type", "path", "id", "Min", "Max", "InitialValue"]},
+            )
+            return result.get("return", [])
+
+        page = await snapshots.paginate(adapter, "get_rtpc_list", {}, fetch, cursor, max_results)
         return _ok({
-            "total": len(rtpcs),
-            "rtpcs": rtpcs,
+            "total": page["total"],
+            "count": len(page["items"]),
+            "rtpcs": page["items"],
+            "next_cursor": page["next_cursor"],
         })
     except WwiseMCPError as e:
         return _err(e)
@@ -417,3 +494,358 @@ async def get_effect_chain(object_path: str) -> dict:
         return _err(e)
     except Exception as e:
         return _err_raw("unexpected_error", str(e))
+
+
+_MATRIX_BASE_FIELDS = ["id", "name", "path", "type"]
+
+
+def _cell(value: Any) -> Any:
+    """引用类字段（{id, name}）压缩为名称，其余原样返回"""
+    if isinstance(value, dict):
+        return value.get("name") or value.get("id")
+    return value
+
+
+async def get_property_matrix(
+    properties: list[str],
+    objects: list[str] | None = None,
+    scope_path: str | None = None,
+    object_type: str | None = None,
+    max_objects: int = 5000,
+) -> dict:
+    """
+    批量读取多个对象的属性值，返回列式表格。
+
+    对象先按 type 分组，每组按 settings.read_chunk_size 分块并发执行 object.get，
+    类型专属字段（Volume、OutputBus 等）只向对应类型请求，不会因混合类型触发 "Unknown accessor"。
+
+    Args:
+        properties:  属性/引用名列表，如 ["Volume", "Pitch", "OutputBus"]
+        objects:     对象路径或 ID 列表（与 scope_path 二选一）
+        scope_path:  范围路径，取其全部后代
+        object_type: 与 scope_path 搭配的类型过滤，如 'Sound'；无 scope_path 时按类型全项目查询
+        max_objects: 最多返回的对象数，默认 5000
+    """
+    try:
+        adapter = WwiseAdapter()
+        if not properties:
+            return _err_raw("invalid_param", "properties 不能为空")
+
+        # Step 1: 解析对象集合（id + type）
+        if objects:
+            ids = [o for o in objects if o.startswith("{")]
+            paths = [o for o in objects if not o.startswith("{")]
+            found: list[dict] = []
+            for key, values in (("id", ids), ("path", paths)):
+                if values:
+                    found += await adapter.get_objects(
+                        from_spec={key: values}, return_fields=_MATRIX_BASE_FIELDS,
+                    )
+        elif scope_path or object_type:
+            found, _ = await adapter.query(
+                types=[object_type] if object_type else None,
+                scope=scope_path,
+                fields=_MATRIX_BASE_FIELDS,
+            )
+        else:
+            return _err_raw("invalid_param", "必须提供 objects、scope_path 或 object_type 之一")
+
+        found.sort(key=lambda o: o.get("path", ""))
+        truncated = len(found) > max_objects
+        found = found[:max_objects]
+
+        # Step 2: 按类型分组，分块并发读取属性值
+        by_type: dict[str, list[str]] = {}
+        for obj in found:
+            by_type.setdefault(obj.get("type", ""), []).append(obj["id"])
+
+        chunk_size = max(1, settings.read_chunk_size)
+        values: dict[str, dict] = {}
+        errors: dict[str, str] = {}
+
+        async def fetch(obj_type: str, chunk: list[str]) -> None:
+            try:
+                rows = await adapter.get_objects(
+                    from_spec={"id": chunk}, return_fields=["id"] + properties, obj_type=obj_type,
+                )
+            except WwiseMCPError as e:
+                errors[obj_type] = e.message
+                return
+            for row in rows:
+                values[row["id"]] = row
+
+        await asyncio.gather(*(
+            fetch(obj_type, ids[i:i + chunk_size])
+            for obj_type, ids in by_type.items()
+            for i in range(0, len(ids), chunk_size)
+        ))
+        await checkpoint(len(found), len(found))
+
+        # Step 3: 组装列式结果
+        columns: dict[str, list] = {f: [o.get(f) for o in found] for f in _MATRIX_BASE_FIELDS}
+        for prop in properties:
+            columns[prop] = [_cell(values.get(o["id"], {}).get(prop)) for o in found]
+
+        return _ok({
+            "rows": len(found),
+            "truncated": truncated,
+            "types": {t: len(ids) for t, ids in by_type.items()},
+            "columns": columns,
+            "errors": errors,
+        })
+    except WwiseMCPError as e:
+        return _err(e)
+    except Exception as e:
+        return _err_raw("unexpected_error", str(e))
+
+
+# 列式属性表缓存：(scope_path, object_type) → (ObjectStore, ColumnStore)
+# 项目变更 / 本服务写入 / 重连时随结果快照一起失效
+_property_tables: dict[tuple, tuple["ObjectStore", "ColumnStore"]] = {}
+snapshots.add_listener(_property_tables.clear)
+
+_STRUCTURAL_PROPS = {"type", "parent"}
+
+
+def _where_props(where: list[dict] | None) -> set[str]:
+    props: set[str] = set()
+    for cond in where or []:
+        if "any" in cond:
+            props |= _where_props(cond["any"])
+        elif cond.get("prop"):
+            props.add(cond["prop"])
+    return props
+
+
+async def query_properties(
+    where: list[dict] | None = None,
+    scope_path: str | None = None,
+    object_type: str | None = None,
+    group_by: str | None = None,
+    aggregate: list[str] | None = None,
+    max_results: int = 100,
+) -> dict:
+    """
+    在列式属性表上执行向量化谓词查询 / 分组聚合（需要 numpy）。
+
+    范围内对象及所需属性首次查询时批量读取并缓存为列（ObjectStore + ColumnStore），
+    之后的查询只在内存中计算，仅命中对象的 id / path 返回；新出现的属性按需补读一列。
+
+    Args:
+        where:       条件列表（AND），如 [{"prop": "Volume", "op": ">", "value": -3},
+                     {"prop": "OutputBus", "op": "==", "value": "SFX"}]；
+                     op：== != < <= > >= between in exists missing；{"any": [...]} 表示 OR
+        scope_path:  范围路径（与 object_type 至少提供一个）
+        object_type: 类型过滤，如 'Sound'
+        group_by:    分组列：'type' / 'parent' / 任一引用或字符串属性（如 'OutputBus'）
+        aggregate:   对每组计算 min / max / mean 的数值属性，如 ["Volume"]
+        max_results: 最多返回的命中对象数，默认 100
+    """
+    # store 包会加载 numpy，只在本工具首次调用时导入
+    from ..store import NUMPY_AVAILABLE, ColumnStore, ObjectStore, PredicateError
+
+    try:
+        if not NUMPY_AVAILABLE:
+            return _err_raw(
+                "missing_dependency", "query_properties 需要 numpy",
+                '安装可选依赖：pip install "wwise-mcp[analysis]"',
+            )
+        if not scope_path and not object_type:
+            return _err_raw("invalid_param", "必须提供 scope_path 或 object_type")
+
+        adapter = WwiseAdapter()
+        await snapshots.watch(adapter.connection)
+        props = _where_props(where) | set(aggregate or [])
+        if group_by:
+            props.add(group_by)
+        props -= _STRUCTURAL_PROPS
+        types = [object_type] if object_type else None
+
+        key = (scope_path, object_type)
+        cached = key in _property_tables
+        if not cached:
+            rows, _ = await adapter.query(
+                types=types, scope=scope_path, fields=["id", "name", "type", "path", *sorted(props)],
+            )
+            objects = ObjectStore()
+            objects.load(rows)
+            columns = ColumnStore(objects)
+            columns.load_rows(rows, props)
+            _property_tables[key] = (objects, columns)
+        else:
+            objects, columns = _property_tables[key]
+            missing = props - set(columns.properties)
+            if missing:
+                rows, _ = await adapter.query(types=types, scope=scope_path, fields=["id", *sorted(missing)])
+                columns.load_rows(rows, missing)
+        await checkpoint(1, 2, "计算条件")
+
+        start = time.perf_counter()
+        mask = columns.evaluate(where)
+        handles = mask.nonzero()[0]
+        groups = columns.aggregate(mask, group_by, sorted(aggregate or [])) if group_by else None
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        return _ok({
+            "total": int(len(handles)),
+            "rows_scanned": objects.stats()["objects"],
+            "objects": [objects.row(int(h), ("id", "name", "path")) for h in handles[:max_results]],
+            "truncated": len(handles) > max_results,
+            "groups": groups,
+            "eval_ms": round(elapsed_ms, 2),
+            "cached": cached,
+        })
+    except PredicateError as e:
+        return _err_raw("invalid_param", str(e))
+    except WwiseMCPError as e:
+        return _err(e)
+    except Exception as e:
+        return _err_raw("unexpected_error", str(e))
+
+
+async def get_effective_values(
+    properties: list[str],
+    objects: list[str] | None = None,
+    scope_path: str | None = None,
+    object_type: str | None = None,
+    max_objects: int = 10000,
+) -> dict:
+    """
+    计算对象的有效属性值（考虑继承与 Override 开关），返回列式表格。
+
+    目标对象及其全部祖先的相关属性批量读取后，沿 parent 链一次性计算，共享祖先只计算一次：
+    覆盖型属性（OutputBus 等）额外返回来源对象路径（<prop>@source），叠加型属性（Volume 等）返回总和。
+
+    Args:
+        properties:  属性名列表，如 ["OutputBus", "Volume"]
+        objects:     对象路径或 ID 列表（与 scope_path / object_type 二选一）
+        scope_path:  范围路径，取其全部后代
+        object_type: 类型过滤，如 'Sound'
+        max_objects: 最多计算的对象数，默认 10000
+    """
+    try:
+        adapter = WwiseAdapter()
+        if not properties:
+            return _err_raw("invalid_param", "properties 不能为空")
+
+        base = ["id", "name", "type", "path"]
+        if objects:
+            ids = [o for o in objects if o.startswith("{")]
+            paths = [o for o in objects if not o.startswith("{")]
+            targets: list[dict] = []
+            for key, values in (("id", ids), ("path", paths)):
+                if values:
+                    targets += await adapter.get_objects(from_spec={key: values}, return_fields=base)
+        elif scope_path or object_type:
+            targets, _ = await adapter.query(
+                types=[object_type] if object_type else None, scope=scope_path, fields=base,
+            )
+        else:
+            return _err_raw("invalid_param", "必须提供 objects、scope_path 或 object_type 之一")
+
+        targets.sort(key=lambda o: o.get("path", ""))
+        truncated = len(targets) > max_objects
+        targets = targets[:max_objects]
+        await checkpoint(0, 2, f"读取 {len(targets)} 个对象及其祖先")
+
+        store, resolver, handles = await resolve_effective(adapter, targets, properties)
+        await checkpoint(1, 2, "计算有效值")
+
+        columns: dict[str, list] = {"path": [o.get("path") for o in targets]}
+        for prop in properties:
+            values, sources = [], []
+            for handle in handles:
+                value, source = resolver.effective(handle, prop) if handle is not None else (None, None)
+                values.append(_cell(value))
+                sources.append(store.path(source) if source is not None else None)
+            columns[prop] = values
+            if prop in OVERRIDE_FLAG:
+                columns[f"{prop}@source"] = sources
+
+        return _ok({
+            "rows": len(targets),
+            "truncated": truncated,
+            "ancestors_loaded": len(store) - len(targets),
+            "inheritance": {
+                p: "override" if p in OVERRIDE_FLAG else "additive" if p in ADDITIVE else "own"
+                for p in properties
+            },
+            "columns": columns,
+        })
+    except WwiseMCPError as e:
+        return _err(e)
+    except Exception as e:
+        return _err_raw("unexpected_error", str(e))
+
+
+def _source_rows(source_ids) -> list[dict]:
+    rows = [
+        {"id": s, "path": media_index.path(s), "file": media_index.file(s)}
+        for s in source_ids
+    ]
+    rows.sort(key=lambda row: row["path"] or "")
+    return rows
+
+
+async def get_event_media(event_path: str) -> dict:
+    """
+    列出 Event 能播放的全部 AudioFileSource 及其原始文件（经 Play Action → 容器层级可达）。
+    查询媒体闭包索引，首次调用时构建索引，之后只增量应用项目变更。
+
+    Args:
+        event_path: Event 完整路径或 GUID
+    """
+    try:
+        adapter = WwiseAdapter()
+        await media_index.ensure(adapter)
+        event_id = media_index.event_id(event_path)
+        if event_id is None:
+            return _err_raw("not_found", f"Event 不存在：{event_path}",
+                            "请先调用 search_objects 搜索 Event 的正确路径")
+
+        sources = _source_rows(media_index.event_media(event_id))
+        files = {row["file"] for row in sources if row["file"]}
+        return _ok({
+            "event": {"id": event_id, "path": media_index.path(event_id)},
+            "source_count": len(sources),
+            "file_count": len(files),
+            "missing_file": sum(1 for row in sources if not row["file"]),
+            "sources": sources,
+        })
+    except WwiseMCPError as e:
+        return _err(e)
+    except Exception as e:
+        return _err_raw("unexpected_error", str(e))
+
+
+async def find_media_users(audio_file: str) -> dict:
+    """
+    反查引用某个音频文件的 AudioFileSource，以及能播放它的全部 Event。
+
+    Args:
+        audio_file: 原始文件完整路径，或仅文件名（如 'Footstep_01.wav'，匹配所有同名文件）
+    """
+    try:
+        adapter = WwiseAdapter()
+        await media_index.ensure(adapter)
+        source_ids = media_index.sources_for_file(audio_file)
+        if not source_ids:
+            return _err_raw("not_found", f"没有 AudioFileSource 引用该文件：{audio_file}",
+                            "确认文件名拼写，或文件尚未导入项目")
+
+        events: set[str] = set()
+        for source_id in source_ids:
+            events |= media_index.events_using(source_id)
+        event_rows = sorted(
+            ({"id": e, "path": media_index.path(e)} for e in events), key=lambda row: row["path"] or ""
+        )
+        return _ok({
+            "file": audio_file,
+            "sources": _source_rows(source_ids),
+            "event_count": len(event_rows),
+            "events": event_rows,
+        })
+    except WwiseMCPError as e:
+        return _err(e)
+    except Exception as e:
+        return _err_raw("unexpected_error", str(e))
@@ -1,12 +1,17 @@
 """
-Layer 4 — 验证类工具（2 个）
+Layer 4 — 验证类工具（3 个）
 """
 
 import logging
 from typing import Any
 
 from ..core.adapter import WwiseAdapter
+from ..core.dead_content import CATEGORIES, analyze, collect_references
 from ..core.exceptions import WwiseMCPError
+from ..core.inheritance import resolve_effective
+from ..core.jobs import checkpoint
+from ..core.media_index import media_index
+from ..core.snapshot import snapshots
 
 logger = logging.getLogger("wwise_mcp.tools.verify")
 
@@ -37,23 +42,20 @@ async def verify_structure(scope_path: str | None = None) -> dict:
         issues = []
         warnings = []
 
+        # 以 Job 运行时按 4 个阶段上报进度；直接调用时 checkpoint 为空操作
+        await checkpoint(0, 4, "检查 Event")
+
         # --- 1. 验证 Event → Action 关联 ---
-        # 注意：WAAPI 2024.1 不支持 transform where；scoped 模式改为获取全部后端过滤
-        if scope_path:
-            event_result = await adapter.call(
-                "ak.wwise.core.object.get",
-                {"from": {"path": [scope_path]}, "transform": [{"select": ["descendants"]}]},
-                {"return": ["name", "path", "id", "childrenCount", "type"]},
-            )
-            all_desc = event_result.get("return", []) if event_result else []
-            events = [o for o in all_desc if o.get("type") == "Event"]
-        else:
-            event_result = await adapter.call(
-                "ak.wwise.core.object.get",
-                {"from": {"ofType": ["Event"]}},
-                {"return": ["name", "path", "id", "childrenCount"]},
-            )
-            events = event_result.get("return", []) if event_result else []
+        # Event / Action / Sound 合并为一个逻辑查询，由规划器按基数选择 ofType 或 scope descendants；
+        # scope_path 对三类对象同时生效
+        objects, plan = await adapter.query(
+            types=["Event", "Action", "Sound"],
+            scope=scope_path,
+            fields=["name", "path", "id", "type", "childrenCount", "Target", "Volume", "Pitch"],
+        )
+        events = [o for o in objects if o.get("type") == "Event"]
+        actions = [o for o in objects if o.get("type") == "Action"]
+        sounds = [o for o in objects if o.get("type") == "Sound"]
 
         orphan_events = []
         for event in events:
@@ -67,14 +69,9 @@ async def verify_structure(scope_path: str | None = None) -> dict:
                     "message": f"Event '{event.get('name')}' 没有任何 Action，无法触发任何操作",
                 })
 
-        # --- 2. 验证 Action → Target 引用 ---
-        action_result = await adapter.call(
-            "ak.wwise.core.object.get",
-            {"from": {"ofType": ["Action"]}},
-            {"return": ["name", "path", "id", "Target"]},
-        )
-        actions = action_result.get("return", []) if action_result else []
+        await checkpoint(1, 4, "检查 Action", partial=issues)
 
+        # --- 2. 验证 Action → Target 引用 ---
         for action in actions:
             target = action.get("Target")
             if not target:
@@ -85,56 +82,44 @@ async def verify_structure(scope_path: str | None = None) -> dict:
                     "message": f"Action '{action.get('name')}' 的 Target 引用为空",
                 })
 
-        # --- 3. 验证 Bus 路由 ---
-        sound_result = await adapter.call(
-            "ak.wwise.core.object.get",
-            {"from": {"ofType": ["Sound"]}},
-            {"return": ["name", "path", "id", "OutputBus"]},
-        )
-        sounds = sound_result.get("return", []) if sound_result else []
+        await checkpoint(2, 4, "检查 Bus 路由", partial=issues[len(orphan_events):])
 
+        # --- 3. 验证 Bus 路由 ---
+        # OutputBus 只有在 OverrideOutput 打开（或位于层级顶层）时才生效，否则继承自父容器，
+        # 因此按有效值判断，而不是 Sound 自身的字段
         sounds_no_bus = []
-        for sound in sounds:
-            output_bus = sound.get("OutputBus")
-            if not output_bus:
-                sounds_no_bus.append(sound.get("path"))
-                warnings.append({
-                    "type": "sound_no_bus",
+        if sounds:
+            _, resolver, handles = await resolve_effective(adapter, sounds, ["OutputBus"])
+            for sound, handle in zip(sounds, handles):
+                bus, _source = resolver.effective(handle, "OutputBus") if handle is not None else (None, None)
+                if not bus or (isinstance(bus, dict) and not bus.get("name")):
+                    sounds_no_bus.append(sound.get("path"))
+                    warnings.append({
+                        "type": "sound_no_bus",
+                        "severity": "warning",
+                        "path": sound.get("path"),
+                        "message": f"Sound '{sound.get('name')}' 的有效 OutputBus 为空（自身及继承链均未指定）",
+                    })
+
+        await checkpoint(3, 4, "检查属性值范围", partial=warnings)
+
+        # --- 4. 属性值范围检查（全部 Sound，Volume / Pitch 已随步骤 1 的查询读取）---
+        from ..store import out_of_range   # 可能加载 numpy，延迟到首次使用
+        range_issues = []
+        for prop, low, high, issue_type, unit in (
+            ("Volume", -200, 200, "volume_out_of_range", "dB"),
+            ("Pitch", -2400, 2400, "pitch_out_of_range", "音分"),
+        ):
+            for idx in out_of_range([s.get(prop) for s in sounds], low, high):
+                sound = sounds[idx]
+                range_issues.append({
+                    "type": issue_type,
                     "severity": "warning",
                     "path": sound.get("path"),
-                    "message": f"Sound '{sound.get('name')}' 未指定 OutputBus，将使用默认路由",
+                    "message": f"{prop}={sound.get(prop)} 超出正常范围 [{low}, {high}] {unit}",
                 })
 
-        # --- 4. 属性值范围检查（采样前 50 个）---
-        range_issues = []
-        for sound in sounds[:50]:
-            try:
-                props = await adapter.call(
-                    "ak.wwise.core.object.get",
-                    {"from": {"path": [sound.get("path")]}},
-                    {"return": ["Volume", "Pitch"]},
-                )
-                prop_list = props.get("return", [{}])
-                if prop_list:
-                    obj_props = prop_list[0]
-                    volume = obj_props.get("Volume")
-                    pitch = obj_props.get("Pitch")
-                    if volume is not None and not (-200 <= float(volume) <= 200):
-                        range_issues.append({
-                            "type": "volume_out_of_range",
-                            "severity": "warning",
-                            "path": sound.get("path"),
-                            "message": f"Volume={volume} 超出正常范围 [-200, 200] dB",
-                        })
-                    if pitch is not None and not (-2400 <= float(pitch) <= 2400):
-                        range_issues.append({
-                            "type": "pitch_out_of_range",
-                            "severity": "warning",
-                            "path": sound.get("path"),
-                            "message": f"Pitch={pitch} 超出正常范围 [-2400, 2400] 音分",
-                        })
-            except Exception:
-                pass
+        await checkpoint(4, 4, "完成", partial=range_issues)
 
         issues.extend(range_issues)
         issues.extend(warnings)
@@ -155,6 +140,7 @@ async def verify_structure(scope_path: str | None = None) -> dict:
             "orphan_events": orphan_events,
             "sounds_without_bus": sounds_no_bus,
             "issues": issues,
+            "query_plan": plan.to_dict(),
             "message": "结构验证通过" if passed else f"发现 {error_count} 个错误，{warning_count} 个警告",
         })
     except WwiseMCPError as e:
@@ -215,28 +201,10 @@ async def verify_event_completeness(event_path: str) -> dict:
             "detail": f"{len(actions_with_target)}/{len(actions)} 个 Action 有 Target 引用",
         })
 
-        # --- 检查 4：关联的 AudioFileSource ---
-        audio_sources = []
-        for action in actions_with_target:
-            target = action.get("Target", {})
-            target_path = target.get("path") if isinstance(target, dict) else None
-            if target_path:
-                try:
-                    sources = await adapter.call(
-                        "ak.wwise.core.object.get",
-                        {
-                            "from": {"path": [target_path]},
-                            "transform": [{"select": ["descendants"]}],
-                            # 注意：transform where 不支持，客户端过滤 AudioFileSource
-                        },
-                        {"return": ["name", "path", "id", "type", "AudioFile"]},
-                    )
-                    all_src = sources.get("return", []) if sources else []
-                    audio_sources.extend(o for o in all_src if o.get("type") == "AudioFileSource")
-                except Exception:
-                    pass
-
-        sources_with_file = [s for s in audio_sources if s.get("AudioFile")]
+        # --- 检查 4：关联的 AudioFileSource（查询媒体闭包索引，不再逐个 Target 读取后代）---
+        await media_index.ensure(adapter)
+        audio_sources = list(media_index.event_media(event["id"]))
+        sources_with_file = [s for s in audio_sources if media_index.file(s)]
         if audio_sources:
             sources_ok = len(sources_with_file) == len(audio_sources)
             if not sources_ok:
@@ -284,3 +252,66 @@ async def verify_event_completeness(event_path: str) -> dict:
         return _err(e)
     except Exception as e:
         return _err_raw("unexpected_error", str(e))
+
+
+# 最近一次分析的各类别计数（与结果快照同时失效）
+_dead_counts: dict[tuple, dict] = {}
+snapshots.add_listener(_dead_counts.clear)
+
+
+async def find_unused_content(
+    categories: list[str] | None = None,
+    max_results: int = 100,
+    cursor: str | None = None,
+) -> dict:
+    """
+    全项目无用内容分析：不可达的 Sound / 容器、未绑定的 Game Parameter、无输入的 Bus、
+    未使用的 Effect / Attenuation ShareSet。一次批量读取引用图后做线性可达性分析，
+    返回各类别计数与分页列表（结果缓存为快照，翻页不重新分析）。
+
+    Args:
+        categories:  要分析的类别（默认全部）：unreachable / unused_game_parameter /
+                     unused_bus / unused_effect / unused_attenuation
+        max_results: 每页数量，默认 100
+        cursor:      上一页返回的 next_cursor
+    """
+    try:
+        adapter = WwiseAdapter()
+        categories = list(categories or CATEGORIES)
+        unknown = [c for c in categories if c not in CATEGORIES]
+        if unknown:
+            return _err_raw("invalid_param", f"未知类别：{unknown}", f"可选：{list(CATEGORIES)}")
+        key = tuple(sorted(categories))
+
+        async def fetch() -> list[dict]:
+            await checkpoint(0, 2, "读取引用图")
+            references = await collect_references(adapter, categories)
+            await checkpoint(1, 2, "分析可达性")
+            rows = analyze(references, categories)
+            counts = dict.fromkeys(categories, 0)
+            for row in rows:
+                counts[row["category"]] += row.get("subtree_objects", 1)
+            _dead_counts[key] = {
+                "counts": counts,
+                "scanned": {group: len(objs) for group, objs in references.items()},
+            }
+            return rows
+
+        page = await snapshots.paginate(
+            adapter, "find_unused_content", {"categories": list(key)}, fetch, cursor, max_results,
+            sort_key=lambda row: (row["category"], row.get("path") or ""),
+        )
+        summary = _dead_counts.get(key, {})
+        return _ok({
+            "counts": summary.get("counts"),
+            "objects_scanned": summary.get("scanned"),
+            "total": page["total"],
+            "count": len(page["items"]),
+            "items": page["items"],
+            "next_cursor": page["next_cursor"],
+            "note": "unreachable 只列出死子树的根（subtree_objects 为子树对象数），counts 按对象计",
+        })
+    except WwiseMCPError as e:
+        return _err(e)
+    except Exception as e:
+        return _err_raw("unexpected_error", str(e))